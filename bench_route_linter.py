@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from route_index import RouteIndex
+from route_linter import (
+    BACKEND_KINDS, EXTRACTION_ENGINES, FRONTEND_KINDS, ScanOptions, WIRING_KINDS, frontend_route_key,
+    kinds_for_roles, run_extraction, scan_text, source_roots, walk_sources
+)
+from route_reader import DEFAULT_READ_OPTIONS, LatencyOpener, read_sources
+from route_stats import RunStats
+from route_suggest import SuggestionIndex
+
+BASELINE_VERSION = 1
+
+STAGES = ('walk', 'read', 'extract', 'match', 'suggest')
+
+# What each stage's throughput is measured in
+STAGE_UNITS = {
+    'walk': 'files',
+    'read': 'bytes',
+    'extract': 'bytes',
+    'match': 'calls',
+    'suggest': 'queries',
+}
+
+DEFAULT_MAX_REGRESSION = 10.0
+DEFAULT_REPEAT = 3
+
+# Parameters for generate_repo; scenarios override some of them
+DEFAULT_PARAMS = {
+    'files': 200,
+    'routes_per_file': 5,
+    'file_kb': 2,
+    'param_fraction': 0.3,
+    'minified_fraction': 0.0,
+    'depth': 2,
+    'undefined_fraction': 0.05,
+    'plain_fraction': 0.0,
+    'seed': 0,
+}
+
+SCENARIOS = {
+    'baseline': {},
+    'many-files': {'files': 2000, 'file_kb': 1},
+    'large-files': {'files': 40, 'file_kb': 256},
+    'dense-routes': {'routes_per_file': 60},
+    'parametric': {'param_fraction': 0.9},
+    'minified': {'files': 60, 'file_kb': 128, 'minified_fraction': 0.5},
+    'deep-nesting': {'depth': 24},
+    # Most modules of a real app are components, helpers and models that
+    # neither define routes nor call them
+    'realistic': {'files': 1000, 'file_kb': 4, 'plain_fraction': 0.8},
+}
+
+RESOURCES = ['users', 'orders', 'products', 'invoices', 'teams', 'projects', 'comments', 'payments', 'reports', 'sessions']
+SUB_RESOURCES = ['details', 'items', 'history', 'settings', 'members', 'status', 'export', 'search']
+METHODS = ['get', 'post', 'put', 'delete', 'patch']
+
+# Inputs that make backtracking patterns scan to the end of the text at every
+# candidate offset. Each builds a text from n repetitions.
+WORST_CASES = {
+    'unclosed-fetch-options': (FRONTEND_KINDS, lambda n: "fetch('/api/a', {" * n),
+    'unterminated-route-path': (BACKEND_KINDS, lambda n: "app.get('x" * n),
+    'unterminated-comments': (FRONTEND_KINDS, lambda n: "/* fetch('/api/a') " * n),
+    'unterminated-strings': (FRONTEND_KINDS, lambda n: "'fetch(`/api/a`) " * n),
+    'stray-regex-slashes': (FRONTEND_KINDS, lambda n: "x = /[ fetch('/api/a') " * n),
+    'nested-templates': (FRONTEND_KINDS, lambda n: "fetch(`/api/${" * n + "}`)" * n),
+    'deep-braces': (FRONTEND_KINDS, lambda n: "fetch('/api/a', {" + "{" * n + "}" * n + "})"),
+    'unclosed-destructuring': (WIRING_KINDS, lambda n: "const { a, b " * n),
+    'unclosed-statements': (WIRING_KINDS, lambda n: "const { a; b " * n),
+    'unclosed-imports': (WIRING_KINDS, lambda n: "import { a, b " * n),
+}
+DEFAULT_WORST_CASE_SIZE = 1000
+
+# Time growth when the input doubles; linear is about 2, quadratic about 4
+MAX_LINEAR_GROWTH = 3.0
+
+BACKEND_FILLER = "function helper{n}(req, res, next) {{ return next(req.params.value{n}); }}\n"
+FRONTEND_FILLER = "const value{n} = items.map(item => item.value{n}).filter(Boolean);\n"
+
+def synthetic_routes(count, param_fraction, rng):
+    """
+    Build unique routes together with the path a frontend would call them with.
+    
+    Args:
+        count (int): Number of routes
+        param_fraction (float): Fraction of routes with a :param segment
+        rng (random.Random): Random source
+    
+    Returns:
+        list: (method, backend path, frontend path) tuples
+    """
+    routes = []
+    for i in range(count):
+        resource = f'{RESOURCES[i % len(RESOURCES)]}{i // len(RESOURCES)}'
+        method = METHODS[i % len(METHODS)]
+        sub = rng.choice(SUB_RESOURCES)
+        if rng.random() < param_fraction:
+            routes.append((method, f'/api/{resource}/:id/{sub}', f'/api/{resource}/${{id}}/{sub}'))
+        else:
+            routes.append((method, f'/api/{resource}/{sub}', f'/api/{resource}/{sub}'))
+    return routes
+
+def _typo(path, rng):
+    # Swap two neighbouring letters of the resource name so the call is
+    # undefined but still has a close suggestion
+    chars = list(path)
+    i = rng.randrange(5, min(len(chars) - 1, 10))
+    chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return ''.join(chars)
+
+def _nested_dir(root, index, depth):
+    # Spread files over every level from the root down to the full depth
+    return os.path.join(root, *[f'level{level}' for level in range(index % (depth + 1))])
+
+def _write_source(file_path, statements, filler, size, minified):
+    lines = [statement + '\n' for statement in statements]
+    written = sum(len(line) for line in lines)
+    n = 0
+    while written < size:
+        line = filler.format(n=n)
+        lines.append(line)
+        written += len(line)
+        n += 1
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        if minified:
+            # Bundles put everything on one very long line
+            f.write(''.join(line.rstrip('\n') for line in lines))
+        else:
+            f.write(''.join(lines))
+
+def _is_plain(index, plain_fraction):
+    # Spread plain files evenly, without drawing from the random source, so
+    # repos without them stay the same
+    return int((index + 1) * plain_fraction) > int(index * plain_fraction)
+
+def generate_repo(directory, files=200, routes_per_file=5, file_kb=2, param_fraction=0.3,
+                  minified_fraction=0.0, depth=2, undefined_fraction=0.05, plain_fraction=0.0, seed=0):
+    """
+    Write a synthetic monorepo with a backend and a frontend tree.
+    
+    Half of the files are Express backends defining routes, the other half
+    are frontend modules calling them with fetch and axios. Plain files on
+    either side hold only filler code.
+    
+    Args:
+        directory (str): Directory to create 'backend' and 'frontend' in
+        files (int): Total number of source files
+        routes_per_file (int): Routes defined (or called) per file
+        file_kb (int): Approximate size of each file in KB
+        param_fraction (float): Fraction of routes with a :param segment
+        minified_fraction (float): Fraction of frontend files written as one-line bundles
+        depth (int): Maximum directory nesting below each tree
+        undefined_fraction (float): Fraction of frontend calls with a typo
+        plain_fraction (float): Fraction of files without routes or calls
+        seed (int): Random seed, so the same parameters give the same repo
+    
+    Returns:
+        tuple: (backend directory, frontend directory)
+    """
+    rng = random.Random(seed)
+    backend_dir = os.path.join(directory, 'backend')
+    frontend_dir = os.path.join(directory, 'frontend')
+    backend_files = max(1, files // 2)
+    frontend_files = max(1, files - backend_files)
+    size = file_kb * 1024
+    
+    # Backend file index -> its position among the files that define routes
+    route_files = {i: n for n, i in enumerate(i for i in range(backend_files) if not _is_plain(i, plain_fraction))} or {0: 0}
+    routes = synthetic_routes(len(route_files) * routes_per_file, param_fraction, rng)
+    for i in range(backend_files):
+        statements = []
+        if i in route_files:
+            start = route_files[i] * routes_per_file
+            statements = [
+                f"router.{method}('{path}', handler{j});"
+                for j, (method, path, _) in enumerate(routes[start:start + routes_per_file])
+            ]
+        file_path = os.path.join(_nested_dir(backend_dir, i, depth), f'routes{i}.js')
+        _write_source(file_path, statements, BACKEND_FILLER, size, False)
+    
+    for i in range(frontend_files):
+        statements = []
+        for j in range(0 if _is_plain(i, plain_fraction) else routes_per_file):
+            method, _, path = rng.choice(routes)
+            if rng.random() < undefined_fraction:
+                path = _typo(path, rng)
+            if j % 2:
+                statements.append(f"const r{j} = await axios.{method}(`{path}`);")
+            else:
+                statements.append(f"const r{j} = await fetch(`{path}`, {{ method: '{method.upper()}' }});")
+        minified = rng.random() < minified_fraction
+        extension = '.js' if minified else rng.choice(('.js', '.jsx', '.ts', '.tsx'))
+        file_path = os.path.join(_nested_dir(frontend_dir, i, depth), f'client{i}{extension}')
+        _write_source(file_path, statements, FRONTEND_FILLER, size, minified)
+    return backend_dir, frontend_dir
+
+def _timed(stage_times, stage, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    stage_times[stage] = min(stage_times.get(stage, elapsed), elapsed)
+    return result
+
+def _read_all(targets, read_options):
+    sources = read_sources([file_path for file_path, _ in targets], read_options)
+    return [(source.text(), kinds) for (_, source, _), (_, kinds) in zip(sources, targets)]
+
+def _extract_all(contents):
+    return [scan_text(content, kinds) for content, kinds in contents]
+
+def _match_all(routes, calls):
+    route_index = RouteIndex(routes)
+    return [frontend_route_key(method, path) for method, path in calls if route_index.match(method, path) is None]
+
+def _suggest_all(routes, undefined):
+    return SuggestionIndex(routes).suggest_many(undefined)
+
+def benchmark_stages(backend_dir, frontend_dir, repeat=DEFAULT_REPEAT, read_options=DEFAULT_READ_OPTIONS):
+    """
+    Time each stage of a serial lint run.
+    
+    Every stage is run `repeat` times and the fastest run is kept, which is
+    the most stable figure on a busy machine.
+    
+    Args:
+        backend_dir (str): Path to the backend directory
+        frontend_dir (str): Path to the frontend directory
+        repeat (int): Number of runs per stage
+        read_options (ReadOptions): How the read stage reads files
+    
+    Returns:
+        dict: Maps each stage to its seconds, units processed and throughput
+    """
+    stage_times = {}
+    for _ in range(repeat):
+        walked = _timed(stage_times, 'walk', walk_sources, source_roots(backend_dir, frontend_dir))
+        targets = [(file_path, kinds_for_roles(roles)) for file_path, roles in walked]
+        contents = _timed(stage_times, 'read', _read_all, targets, read_options)
+        extracted = _timed(stage_times, 'extract', _extract_all, contents)
+        
+        routes = set()
+        calls = []
+        for (_, kinds), records in zip(contents, extracted):
+            for kind, method, path, _, _, _ in records:
+                if kind in FRONTEND_KINDS:
+                    calls.append((method, path))
+                elif kind in BACKEND_KINDS:
+                    routes.add(f'{method} {path}')
+        undefined = _timed(stage_times, 'match', _match_all, routes, calls)
+        _timed(stage_times, 'suggest', _suggest_all, routes, sorted(set(undefined)))
+    
+    total_bytes = sum(len(content) for content, _ in contents)
+    units = {
+        'walk': len(targets),
+        'read': total_bytes,
+        'extract': total_bytes,
+        'match': len(calls),
+        'suggest': len(set(undefined)),
+    }
+    return {
+        stage: {
+            'seconds': stage_times[stage],
+            'units': units[stage],
+            'throughput': units[stage] / stage_times[stage] if stage_times[stage] else 0.0,
+        }
+        for stage in STAGES
+    }
+
+def worst_case_timings(engine, size=DEFAULT_WORST_CASE_SIZE, repeat=DEFAULT_REPEAT):
+    """
+    Time an extraction engine on the worst-case corpus at 1x, 2x and 4x size.
+    
+    Args:
+        engine (str): Extraction engine, 'regex' or 'lexer'
+        size (int): Repetitions at 1x
+        repeat (int): Runs per size; the fastest is kept
+    
+    Returns:
+        dict: Maps each case to {'bytes': [...], 'seconds': [...], 'growth': ratio}
+              where growth is the time ratio of the 4x input to the 2x input
+    """
+    options = ScanOptions(engine, None)
+    timings = {}
+    for name, (kinds, build) in WORST_CASES.items():
+        sizes = []
+        seconds = []
+        for scale in (1, 2, 4):
+            text = build(size * scale)
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                scan_text(text, kinds, options)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            sizes.append(len(text))
+            seconds.append(best)
+        growth = seconds[2] / seconds[1] if seconds[1] else 0.0
+        timings[name] = {'bytes': sizes, 'seconds': seconds, 'growth': growth}
+    return timings
+
+def run_scenarios(names, repeat=DEFAULT_REPEAT, overrides=None, keep_dir=None, read_options=DEFAULT_READ_OPTIONS):
+    """
+    Generate and benchmark each named scenario.
+    
+    Args:
+        names (list): Scenario names from SCENARIOS
+        repeat (int): Number of runs per stage
+        overrides (dict): Parameters applied on top of every scenario
+        keep_dir (str): Generate repos here and keep them, instead of in a temporary directory
+        read_options (ReadOptions): How the read stage reads files
+    
+    Returns:
+        dict: A results document suitable for saving as a baseline
+    """
+    results = {
+        'version': BASELINE_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scenarios': {},
+    }
+    for name in names:
+        params = dict(DEFAULT_PARAMS, **SCENARIOS[name], **(overrides or {}))
+        with _scenario_repo(name, params, keep_dir) as (backend_dir, frontend_dir):
+            stages = benchmark_stages(backend_dir, frontend_dir, repeat, read_options)
+        results['scenarios'][name] = {'params': params, 'stages': stages}
+    return results
+
+@contextlib.contextmanager
+def _scenario_repo(name, params, keep_dir=None):
+    """
+    Generate a scenario's repo, removing it afterwards unless keep_dir is given.
+    
+    Yields:
+        tuple: (backend directory, frontend directory)
+    """
+    directory = os.path.join(keep_dir, name) if keep_dir else tempfile.mkdtemp(prefix=f'route-bench-{name}-')
+    try:
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        yield generate_repo(directory, **params)
+    finally:
+        if not keep_dir:
+            shutil.rmtree(directory, ignore_errors=True)
+
+def prefilter_timings(backend_dir, frontend_dir, repeat=DEFAULT_REPEAT):
+    """
+    Time reading and extracting every file with and without the literal prefilter.
+    
+    Args:
+        backend_dir (str): Path to the backend directory
+        frontend_dir (str): Path to the frontend directory
+        repeat (int): Runs per setting; the fastest is kept
+    
+    Returns:
+        dict: Seconds 'without' and 'with' the prefilter, their ratio as
+              'speedup', and the 'files' and 'bytes' read with how many of
+              them the prefilter skipped
+    """
+    targets = [(file_path, kinds_for_roles(roles)) for file_path, roles in walk_sources(source_roots(backend_dir, frontend_dir))]
+    timings = {}
+    for label, enabled in (('without', False), ('with', True)):
+        options = ScanOptions('regex', None, prefilter=enabled)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in run_extraction(targets, options=options):
+                pass
+            elapsed = time.perf_counter() - start
+            timings[label] = min(timings.get(label, elapsed), elapsed)
+    
+    stats = RunStats()
+    for _ in run_extraction(targets, stats=stats, options=ScanOptions('regex', None)):
+        pass
+    return dict(
+        timings,
+        speedup=timings['without'] / timings['with'] if timings['with'] else 0.0,
+        files=stats.files, skipped_files=stats.prefiltered_files, bytes=stats.bytes, skipped_bytes=stats.prefiltered_bytes,
+    )
+
+def run_prefilter(names, repeat=DEFAULT_REPEAT, overrides=None):
+    """
+    Print how much the literal prefilter speeds up extraction on each scenario.
+    
+    Returns:
+        int: Exit code
+    """
+    print("Read and extract every file with the regex engine, without and with the literal prefilter:")
+    for name in names:
+        params = dict(DEFAULT_PARAMS, **SCENARIOS[name], **(overrides or {}))
+        with _scenario_repo(name, params) as (backend_dir, frontend_dir):
+            timing = prefilter_timings(backend_dir, frontend_dir, repeat)
+        print(
+            f"  {name:<14} {timing['without'] * 1000:9.2f} ms -> {timing['with'] * 1000:9.2f} ms  x{timing['speedup']:.2f}  "
+            f"skipped {timing['skipped_files']}/{timing['files']} files, "
+            f"{timing['skipped_bytes'] / (1024 * 1024):.2f}/{timing['bytes'] / (1024 * 1024):.2f} MB"
+        )
+    return 0
+
+def compare_results(baseline, current, max_regression=DEFAULT_MAX_REGRESSION):
+    """
+    Compare stage throughput against a baseline.
+    
+    Args:
+        baseline (dict): Results document from an earlier run
+        current (dict): Results document from this run
+        max_regression (float): Largest allowed throughput drop, in percent
+    
+    Returns:
+        list: (scenario, stage, baseline throughput, current throughput,
+              change in percent, regressed) tuples for every stage both
+              documents measured
+    """
+    rows = []
+    for name, scenario in current['scenarios'].items():
+        base_scenario = baseline.get('scenarios', {}).get(name)
+        if base_scenario is None:
+            continue
+        if base_scenario.get('params') != scenario.get('params'):
+            print(f"Note: scenario '{name}' parameters differ from the baseline, comparison may not be meaningful")
+        for stage, result in scenario['stages'].items():
+            base = base_scenario['stages'].get(stage)
+            if not base or not base['throughput']:
+                continue
+            change = (result['throughput'] - base['throughput']) / base['throughput'] * 100
+            rows.append((name, stage, base['throughput'], result['throughput'], change, change < -max_regression))
+    return rows
+
+def _format_throughput(stage, value):
+    if STAGE_UNITS[stage] == 'bytes':
+        return f"{value / (1024 * 1024):.1f} MB/s"
+    return f"{value:,.0f} {STAGE_UNITS[stage]}/s"
+
+def print_results(results):
+    for name, scenario in results['scenarios'].items():
+        print(f"\n{name}:")
+        for stage in STAGES:
+            result = scenario['stages'][stage]
+            print(f"  {stage:<8} {result['seconds'] * 1000:9.2f} ms  {_format_throughput(stage, result['throughput'])}")
+
+def print_comparison(rows, max_regression):
+    print(f"\nThroughput compared to baseline (allowed regression: {max_regression}%):")
+    for name, stage, base, current, change, regressed in rows:
+        marker = 'REGRESSION' if regressed else 'ok'
+        print(f"  {name:<14} {stage:<8} {_format_throughput(stage, base):>16} -> {_format_throughput(stage, current):>16}  {change:+6.1f}%  {marker}")
+
+def load_results(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        results = json.load(f)
+    if results.get('version') != BASELINE_VERSION:
+        raise ValueError(f"{file_path} is not a version {BASELINE_VERSION} benchmark result")
+    return results
+
+def save_results(results, file_path):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def run_worst_case(engines, size, repeat):
+    """
+    Print worst-case timings and check that the lexer engine stays linear.
+    
+    Returns:
+        int: Exit code, 1 if the lexer's time grew faster than linearly
+    """
+    failed = []
+    for engine in engines:
+        print(f"\n{engine}:")
+        for name, timing in worst_case_timings(engine, size, repeat).items():
+            times = '  '.join(f"{seconds * 1000:9.2f} ms" for seconds in timing['seconds'])
+            print(f"  {name:<24} {timing['bytes'][0]:>9} B  {times}  growth x{timing['growth']:.2f}")
+            if engine == 'lexer' and timing['growth'] > MAX_LINEAR_GROWTH:
+                failed.append(name)
+    
+    print("\nTimes are for 1x, 2x and 4x the input; growth is the 4x/2x ratio (linear is about 2, quadratic about 4).")
+    if failed:
+        print(f"FAILED: lexer time grew faster than linearly on {', '.join(failed)}")
+        return 1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Route-Linter on synthetic monorepos')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = subparsers.add_parser('run', help='Generate synthetic repos and time each stage')
+    run_parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='Scenario to run (repeatable, default: all)')
+    run_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help=f'Runs per stage; the fastest is kept (default: {DEFAULT_REPEAT})')
+    run_parser.add_argument('--output', help='Save the results as JSON (use as a baseline for later runs)')
+    run_parser.add_argument('--baseline', help='Compare against a saved result and fail on regressions')
+    run_parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION, help=f'Allowed throughput drop in percent (default: {DEFAULT_MAX_REGRESSION})')
+    run_parser.add_argument('--keep', metavar='DIR', help='Generate the repos in DIR and keep them')
+    for name, default in DEFAULT_PARAMS.items():
+        option = '--' + name.replace('_', '-')
+        run_parser.add_argument(option, type=type(default), help=f'Override {name} for every scenario')
+    run_parser.add_argument('--read-ahead', type=int, default=DEFAULT_READ_OPTIONS.read_ahead, help=f'Reads kept in flight in the read stage (default: {DEFAULT_READ_OPTIONS.read_ahead})')
+    run_parser.add_argument('--read-latency', type=float, default=0.0, metavar='MS', help='Add this many milliseconds to every open and read, as on a network filesystem')
+    
+    worst_parser = subparsers.add_parser('worst-case', help='Time the extraction engines on pathological inputs')
+    worst_parser.add_argument('--engine', action='append', choices=EXTRACTION_ENGINES, help='Engine to time (repeatable, default: all)')
+    worst_parser.add_argument('--size', type=int, default=DEFAULT_WORST_CASE_SIZE, help=f'Repetitions in the smallest input (default: {DEFAULT_WORST_CASE_SIZE})')
+    worst_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help=f'Runs per input; the fastest is kept (default: {DEFAULT_REPEAT})')
+    
+    prefilter_parser = subparsers.add_parser('prefilter', help='Time extraction with and without the literal prefilter')
+    prefilter_parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='Scenario to run (repeatable, default: all)')
+    prefilter_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help=f'Runs per setting; the fastest is kept (default: {DEFAULT_REPEAT})')
+    for name, default in DEFAULT_PARAMS.items():
+        option = '--' + name.replace('_', '-')
+        prefilter_parser.add_argument(option, type=type(default), help=f'Override {name} for every scenario')
+    
+    compare_parser = subparsers.add_parser('compare', help='Compare two saved results')
+    compare_parser.add_argument('baseline', help='Baseline results file')
+    compare_parser.add_argument('current', help='Current results file')
+    compare_parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION, help=f'Allowed throughput drop in percent (default: {DEFAULT_MAX_REGRESSION})')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'worst-case':
+        return run_worst_case(args.engine or list(EXTRACTION_ENGINES), args.size, args.repeat)
+    if args.command == 'prefilter':
+        overrides = {name: getattr(args, name) for name in DEFAULT_PARAMS if getattr(args, name) is not None}
+        return run_prefilter(args.scenario or list(SCENARIOS), args.repeat, overrides)
+    
+    try:
+        if args.command == 'run':
+            overrides = {name: getattr(args, name) for name in DEFAULT_PARAMS if getattr(args, name) is not None}
+            read_options = DEFAULT_READ_OPTIONS._replace(read_ahead=max(1, args.read_ahead))
+            if args.read_latency > 0:
+                read_options = read_options._replace(opener=LatencyOpener(args.read_latency / 1000))
+            results = run_scenarios(args.scenario or list(SCENARIOS), args.repeat, overrides, args.keep, read_options)
+            print_results(results)
+            if args.output:
+                save_results(results, args.output)
+                print(f"\nResults saved to {args.output}")
+            if not args.baseline:
+                return 0
+            baseline = load_results(args.baseline)
+        else:
+            baseline = load_results(args.baseline)
+            results = load_results(args.current)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    
+    rows = compare_results(baseline, results, args.max_regression)
+    print_comparison(rows, args.max_regression)
+    regressions = [row for row in rows if row[5]]
+    if regressions:
+        print(f"\nFAILED: {len(regressions)} stage(s) regressed by more than {args.max_regression}%")
+        return 1
+    print("\nNo regressions found.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
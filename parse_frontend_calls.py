@@ -3,20 +3,20 @@
 import os
 import re
 
+from route_paths import is_api_path
+
 def parse_frontend_calls(directory):
     """
     Parse API calls from JavaScript/React files in the given directory.
     
     Args:
         directory (str): Path to the frontend directory
-        
+    
     Returns:
-        list: A list of dictionaries, each containing the HTTP method, route path, and file path
-              where the API call was found
+        list: A list of dictionaries, each containing the HTTP method, route path, file path,
+              and the 1-based line and column where the API call was found
     """
     api_calls = []
-    # Track unique calls to avoid duplicates
-    unique_calls = set()
     
     # Regex patterns to match different API call patterns
     
@@ -50,6 +50,9 @@ def parse_frontend_calls(directory):
                 try:
                     with open(file_path, 'r', encoding='utf-8') as f:
                         content = f.read()
+                        lines = LineCounter(content)
+                        # Track unique (method, path) calls to avoid duplicates within the file
+                        unique_calls = set()
                         
                         # Find all fetch API calls with explicit method
                         for match in fetch_method_pattern.finditer(content):
@@ -59,13 +62,14 @@ def parse_frontend_calls(directory):
                             # Only include API calls (typically starting with /api)
                             if is_api_path(path):
                                 # Create a unique key to avoid duplicates
-                                unique_key = f"{method}:{path}:{file_path}"
+                                unique_key = (method, path)
                                 if unique_key not in unique_calls:
                                     unique_calls.add(unique_key)
                                     api_calls.append({
                                         'method': method,
                                         'path': path,
-                                        'file': file_path
+                                        'file': file_path,
+                                        **lines.position(match.start())
                                     })
                         
                         # Find all fetch API calls (default method is GET)
@@ -75,14 +79,15 @@ def parse_frontend_calls(directory):
                             # Only include API calls (typically starting with /api)
                             if is_api_path(path):
                                 # Create a unique key to avoid duplicates
-                                unique_key = f"GET:{path}:{file_path}"
+                                unique_key = ('GET', path)
                                 # Check if this path was already found with an explicit method
                                 if unique_key not in unique_calls:
                                     unique_calls.add(unique_key)
                                     api_calls.append({
                                         'method': 'GET',  # Default method for fetch is GET
                                         'path': path,
-                                        'file': file_path
+                                        'file': file_path,
+                                        **lines.position(match.start())
                                     })
                         
                         # Find all axios method calls
@@ -93,66 +98,60 @@ def parse_frontend_calls(directory):
                             # Only include API calls (typically starting with /api)
                             if is_api_path(path):
                                 # Create a unique key to avoid duplicates
-                                unique_key = f"{method}:{path}:{file_path}"
+                                unique_key = (method, path)
                                 if unique_key not in unique_calls:
                                     unique_calls.add(unique_key)
                                     api_calls.append({
                                         'method': method,
                                         'path': path,
-                                        'file': file_path
+                                        'file': file_path,
+                                        **lines.position(match.start())
                                     })
                 except Exception as e:
                     print(f"Error reading file {file_path}: {e}")
     
     return api_calls
 
-def is_api_path(path):
+class LineCounter:
     """
-    Check if a path is likely an API endpoint.
+    Converts character offsets in one file into lines and columns.
     
-    Args:
-        path (str): The path to check
-        
-    Returns:
-        bool: True if the path is likely an API endpoint, False otherwise
+    The last (offset, line) pair is carried forward, so offsets that come in
+    source order only count the newlines between them.
     """
-    # Remove template literals (${var}) for the check
-    clean_path = re.sub(r'\${[^}]*}', '', path)
     
-    # Common API path patterns
-    api_patterns = [
-        # Standard API paths
-        r'^/api',
-        r'/api/',
-        # Auth endpoints are often API calls
-        r'^/auth',
-        r'/auth/',
-        # GraphQL endpoints
-        r'^/graphql',
-        # REST-like endpoints
-        r'^/v\d+/',  # Version prefixes like /v1/, /v2/
-        # Exclude common non-API paths
-        # r'^/static/',
-        # r'^/assets/',
-        # r'^/images/',
-        # r'^/css/',
-        # r'^/js/'
-    ]
-    
-    # Check if the path matches any of the API patterns
-    for pattern in api_patterns:
-        if re.search(pattern, clean_path):
-            return True
-    
-    # Check if the path looks like a relative API path (no leading slash)
-    if clean_path.startswith('api/') or clean_path.startswith('auth/'):
-        return True
-    
-    # Exclude absolute URLs to external services
-    if clean_path.startswith('http://') or clean_path.startswith('https://'):
-        return False
-    
-    return False
+    def __init__(self, content):
+        """
+        Args:
+            content (str): File contents
+        """
+        self.content = content
+        self.offset = 0
+        self.line = 1
+        self.line_start = 0
+    
+    def position(self, offset):
+        """
+        Convert a character offset into a line and column.
+        
+        Args:
+            offset (int): Character offset into the content
+        
+        Returns:
+            dict: The 1-based 'line' and 'column' of the offset
+        """
+        content = self.content
+        if offset >= self.offset:
+            newlines = content.count('\n', self.offset, offset)
+            if newlines:
+                self.line += newlines
+                self.line_start = content.rfind('\n', self.offset, offset) + 1
+        else:
+            # Each pattern is matched in its own pass, so offsets can go back once per pass
+            self.line -= content.count('\n', offset, self.offset)
+            self.line_start = content.rfind('\n', 0, offset) + 1
+        self.offset = offset
+        return {'line': self.line, 'column': offset - self.line_start + 1}
 
 # Example usage
 if __name__ == "__main__":
@@ -167,4 +166,4 @@ if __name__ == "__main__":
     
     print(f"Found {len(api_calls)} API calls:")
     for call in api_calls:
-        print(f"  {call['method']} {call['path']} (in {call['file']})")
\ No newline at end of file
+        print(f"  {call['method']} {call['path']} (in {call['file']}:{call['line']}:{call['column']})")
\ No newline at end of file
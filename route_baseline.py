@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import subprocess
+import tempfile
+
+# Bump when the baseline file layout changes
+BASELINE_FORMAT_VERSION = 3
+
+class BaselineError(Exception):
+    """
+    Raised when a baseline cannot be used or git cannot list changed files.
+    """
+
+def _git(args, cwd=None):
+    try:
+        result = subprocess.run(['git'] + args, cwd=cwd, capture_output=True, text=True)
+    except OSError as e:
+        raise BaselineError(f'could not run git: {e}')
+    if result.returncode != 0:
+        raise BaselineError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+def current_commit(directory='.'):
+    """
+    Args:
+        directory (str): A directory inside the repository
+    
+    Returns:
+        str: The commit HEAD points at, or None outside a git repository
+    """
+    try:
+        return _git(['rev-parse', 'HEAD'], cwd=directory).strip()
+    except BaselineError:
+        return None
+
+def repository_root(directory='.'):
+    """
+    Args:
+        directory (str): A directory inside the repository
+    
+    Returns:
+        str: The repository's top-level directory, or the current directory
+             outside a git repository
+    """
+    try:
+        return _git(['rev-parse', '--show-toplevel'], cwd=directory).strip()
+    except BaselineError:
+        return os.getcwd()
+
+def changed_files(rev, directories, merge_base=True):
+    """
+    List the files that differ between a revision and the working tree.
+    
+    By default the diff starts at the merge base of rev and HEAD, so on a pull
+    request branch only the branch's own changes count. Uncommitted and
+    untracked (but not ignored) files are included, as are deleted files.
+    
+    Args:
+        rev (str): Revision to compare against, e.g. 'origin/main'
+        directories (list): Directories to limit the diff to
+        merge_base (bool): Diff from the merge base rather than rev itself
+    
+    Returns:
+        list: Absolute paths of changed files, sorted
+    
+    Raises:
+        BaselineError: If git fails, e.g. because rev does not exist
+    """
+    directories = [os.path.abspath(directory) for directory in directories if directory is not None]
+    cwd = directories[0]
+    toplevel = _git(['rev-parse', '--show-toplevel'], cwd=cwd).strip()
+    base = rev
+    if merge_base:
+        try:
+            base = _git(['merge-base', rev, 'HEAD'], cwd=cwd).strip()
+        except BaselineError:
+            # Unrelated histories; compare against the revision itself
+            pass
+    pathspecs = ['--'] + directories
+    diff = _git(['diff', '--name-only', '-z', '--no-renames', base] + pathspecs, cwd=cwd)
+    untracked = _git(['ls-files', '--others', '--exclude-standard', '--full-name', '-z'] + pathspecs, cwd=cwd)
+    paths = {name for name in (diff + untracked).split('\0') if name}
+    return sorted(os.path.join(toplevel, name) for name in paths)
+
+def _relative(path, root):
+    if path is None:
+        return None
+    return os.path.relpath(os.path.abspath(path), root).replace(os.sep, '/')
+
+def save_baseline(file_path, records, fingerprint, backend_dir, frontend_dir, root, commit=None, shard=None):
+    """
+    Write a baseline index of per-file extraction results.
+    
+    Paths are stored relative to root, normally the repository's top level,
+    so a baseline built in one checkout can be used from another. The file is
+    written next to its destination and moved into place, so a concurrent
+    reader never sees a partial baseline.
+    
+    Args:
+        file_path (str): Destination path
+        records (dict): Maps each file to its (kind, method, path, line, column,
+                        receiver) records
+        fingerprint (str): Identifies the extractor that produced the records
+        backend_dir (str): Backend directory the records were scanned from
+        frontend_dir (str): Frontend directory the records were scanned from
+        root (str): Directory the stored paths are relative to
+        commit (str): Commit the scan corresponds to, if known
+        shard (tuple): (index, count) when the records cover one shard of a
+                       sharded scan, for merge_shards
+    """
+    payload = {
+        'version': BASELINE_FORMAT_VERSION,
+        'fingerprint': fingerprint,
+        'commit': commit,
+        'shard': list(shard) if shard is not None else None,
+        'backend': _relative(backend_dir, root),
+        'frontend': _relative(frontend_dir, root),
+        'files': {
+            _relative(path, root): [list(record) for record in file_records]
+            for path, file_records in records.items()
+        },
+    }
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.baseline-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+def read_baseline(file_path):
+    """
+    Read a baseline or shard file without checking what it was built for.
+    
+    Args:
+        file_path (str): Baseline path
+    
+    Returns:
+        dict: The stored payload, with paths still relative to its root
+    
+    Raises:
+        BaselineError: If the file is unreadable or from another format version
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BaselineError(f'could not read baseline {file_path}: {e}')
+    if not isinstance(payload, dict) or payload.get('version') != BASELINE_FORMAT_VERSION:
+        raise BaselineError(f'{file_path} is not a version {BASELINE_FORMAT_VERSION} baseline; rebuild it with --save-baseline')
+    payload.setdefault('shard', None)
+    return payload
+
+def merge_shards(file_paths):
+    """
+    Combine the files written by every shard of a sharded scan.
+    
+    Args:
+        file_paths (list): One file per shard, in any order
+    
+    Returns:
+        dict: A baseline payload covering all shards, with 'files' mapping
+              paths relative to the scan's root to (kind, method, path, line,
+              column, receiver) tuples
+    
+    Raises:
+        BaselineError: If a file is not a shard, the shards come from
+                       different scans, or a shard is missing or repeated
+    """
+    merged = None
+    seen = {}     # shard index -> file it came from
+    shards = {}   # shard index -> its files
+    for file_path in file_paths:
+        payload = read_baseline(file_path)
+        if payload['shard'] is None:
+            raise BaselineError(f'{file_path} is not a shard; write shards with --shard')
+        index, count = payload['shard']
+        scan = {key: payload.get(key) for key in ('fingerprint', 'commit', 'backend', 'frontend')}
+        if merged is None:
+            merged = dict(scan, version=BASELINE_FORMAT_VERSION, shard=None, files={}, count=count)
+        elif scan != {key: merged[key] for key in scan} or count != merged['count']:
+            raise BaselineError(f'{file_path} comes from a different scan than {file_paths[0]}')
+        if index in seen:
+            raise BaselineError(f'shard {index}/{count} is given twice: {seen[index]} and {file_path}')
+        seen[index] = file_path
+        shards[index] = payload['files']
+    
+    if merged is None:
+        raise BaselineError('no shard files given')
+    missing = sorted(set(range(1, merged['count'] + 1)) - set(seen))
+    if missing:
+        raise BaselineError(f"missing shard(s) {', '.join(map(str, missing))} of {merged['count']}")
+    del merged['count']
+    # Merge in shard order, so the result does not depend on the order the files were given in
+    for index in sorted(shards):
+        for path, records in shards[index].items():
+            merged['files'][path] = [tuple(record) for record in records]
+    return merged
+
+def load_baseline(file_path, fingerprint, backend_dir, frontend_dir, root):
+    """
+    Read a baseline written by save_baseline.
+    
+    Args:
+        file_path (str): Baseline path
+        fingerprint (str): Fingerprint of the current extractor
+        backend_dir (str): Backend directory being linted
+        frontend_dir (str): Frontend directory being linted
+        root (str): Directory the stored paths are relative to
+    
+    Returns:
+        dict: The baseline, with 'files' mapping each absolute file path to a
+              list of (kind, method, path, line, column, receiver) tuples, and the
+              'commit' it was built at
+    
+    Raises:
+        BaselineError: If the file is unreadable, from another format
+                       version, or built with a different extractor or for
+                       other directories
+    """
+    payload = read_baseline(file_path)
+    if payload['shard'] is not None:
+        index, count = payload['shard']
+        raise BaselineError(f'{file_path} only holds shard {index}/{count}; combine the shards with the merge command first')
+    if payload.get('fingerprint') != fingerprint:
+        raise BaselineError(f'{file_path} was built with different extraction patterns or engine; rebuild it with --save-baseline')
+    if (payload.get('backend'), payload.get('frontend')) != (_relative(backend_dir, root), _relative(frontend_dir, root)):
+        raise BaselineError(
+            f"{file_path} was built for --backend {payload.get('backend')} --frontend {payload.get('frontend')}; "
+            f'rebuild it with --save-baseline'
+        )
+    payload['files'] = {
+        os.path.normpath(os.path.join(root, path)): [tuple(record) for record in file_records]
+        for path, file_records in payload['files'].items()
+    }
+    return payload
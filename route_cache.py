@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+# Bump when the on-disk entry layout changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIR = '.route-linter-cache'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Directories of other pattern versions are only removed once no run has used
+# them for this long, so jobs of different versions can share a cache
+STALE_AFTER = 7 * 24 * 3600
+
+# Names of the per-version directories; anything else in the cache directory is left alone
+VERSION_DIR_PATTERN = re.compile(r'v\d+-[0-9a-f]*')
+
+def patterns_fingerprint(patterns, salt=''):
+    """
+    Build a short fingerprint from compiled regex patterns.
+    
+    Any change to a pattern's source or flags produces a new fingerprint, which
+    moves the cache to a fresh directory and invalidates every stored entry.
+    
+    Args:
+        patterns (list): Compiled regex patterns used by the extractors
+        salt (str): Extra text to mix in, e.g. an extractor version
+    
+    Returns:
+        str: A hex digest identifying the pattern set
+    """
+    digest = hashlib.sha256(f'{CACHE_FORMAT_VERSION}:{salt}'.encode('utf-8'))
+    for pattern in patterns:
+        source = pattern.pattern if isinstance(pattern.pattern, str) else pattern.pattern.decode('latin-1')
+        digest.update(f'\0{pattern.flags}:{source}'.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def hash_file(file_path):
+    """
+    Hash the contents of a file.
+    
+    Args:
+        file_path (str): Path to the file
+    
+    Returns:
+        str: The SHA-256 hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _discard(tmp_path):
+    try:
+        os.unlink(tmp_path)
+    except OSError:
+        pass
+
+class ExtractionCache:
+    """
+    On-disk cache of per-file extraction results.
+    
+    Each entry is a small JSON file keyed by extractor kind and absolute path,
+    and records the mtime and size (and optionally the content hash) the
+    results were computed from. Entries are written to a temporary file and
+    moved into place with os.replace, so concurrent runs sharing a workspace
+    never observe a partial entry. Reading an entry bumps its mtime, which is
+    what prune() uses as the LRU order.
+    """
+    
+    def __init__(self, directory=DEFAULT_CACHE_DIR, fingerprint='', use_hash=False, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory (str): Cache directory, shared by all pattern versions
+            fingerprint (str): Pattern fingerprint from patterns_fingerprint()
+            use_hash (bool): Fall back to a content hash when mtime/size differ
+            max_bytes (int): Size cap enforced by prune()
+        """
+        self.directory = directory
+        self.root = os.path.join(directory, f'v{CACHE_FORMAT_VERSION}-{fingerprint}')
+        self.use_hash = use_hash
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+    
+    def _entry_path(self, kind, file_path):
+        key = hashlib.sha1(f'{kind}\0{os.path.abspath(file_path)}'.encode('utf-8')).hexdigest()
+        # Bucket entries so no single directory grows to tens of thousands of files
+        return os.path.join(self.root, key[:2], key[2:] + '.json')
+    
+    def lookup(self, kind, file_path):
+        """
+        Look up cached records for a file.
+        
+        Args:
+            kind (str): Name of the extractor that produced the records
+            file_path (str): Path to the source file
+        
+        Returns:
+            tuple: (records, fingerprint). records is None on a miss, in which
+                   case fingerprint should be passed to store() after extraction.
+        """
+        st = os.stat(file_path)
+        fingerprint = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+        entry_path = self._entry_path(kind, file_path)
+        
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            # Missing or half-written by a crashed run; treat as a miss
+            entry = None
+        
+        if entry is not None and entry.get('size') == st.st_size:
+            if entry.get('mtime_ns') == st.st_mtime_ns:
+                return self._hit(entry_path, entry), fingerprint
+            if self.use_hash:
+                # Fresh checkouts touch every mtime, so compare contents instead
+                fingerprint['sha256'] = hash_file(file_path)
+                if entry.get('sha256') == fingerprint['sha256']:
+                    self.store(kind, file_path, fingerprint, entry['records'])
+                    return self._hit(entry_path, entry), fingerprint
+        
+        if self.use_hash and 'sha256' not in fingerprint:
+            fingerprint['sha256'] = hash_file(file_path)
+        self.misses += 1
+        return None, fingerprint
+    
+    def _hit(self, entry_path, entry):
+        self.hits += 1
+        try:
+            # Touch the entry so prune() sees it as recently used
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return [tuple(record) for record in entry['records']]
+    
+    def store(self, kind, file_path, fingerprint, records):
+        """
+        Atomically write the records extracted from a file.
+        
+        Args:
+            kind (str): Name of the extractor that produced the records
+            file_path (str): Path to the source file
+            fingerprint (dict): The fingerprint returned by lookup()
+            records (list): The extracted records (JSON-serializable tuples)
+        
+        Returns:
+            bool: False if the entry could not be written, e.g. on a full or
+                  read-only disk; the run then carries on without caching it
+        """
+        entry_path = self._entry_path(kind, file_path)
+        entry_dir = os.path.dirname(entry_path)
+        entry = dict(fingerprint, path=os.path.abspath(file_path), records=records)
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=entry_dir, suffix='.tmp')
+        except OSError:
+            return False
+        
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            _discard(tmp_path)
+            return False
+        except BaseException:
+            _discard(tmp_path)
+            raise
+        return True
+    
+    def prune(self):
+        """
+        Remove pattern versions no run has used for STALE_AFTER seconds and
+        evict least recently used entries of this version until it fits
+        within max_bytes.
+        
+        Returns:
+            int: The number of entries evicted
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        
+        try:
+            # Mark this version as in use, for runs of other versions sharing the cache
+            os.utime(self.root)
+        except OSError:
+            pass
+        cutoff = time.time() - STALE_AFTER
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path == self.root or not VERSION_DIR_PATTERN.fullmatch(name):
+                continue
+            try:
+                stale = os.path.isdir(path) and os.stat(path).st_mtime < cutoff
+            except OSError:
+                continue
+            if stale:
+                shutil.rmtree(path, ignore_errors=True)
+        
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.root):
+            for file in files:
+                path = os.path.join(root, file)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    # Evicted by a concurrent run
+                    continue
+                entries.append((st.st_mtime_ns, st.st_size, path))
+                total += st.st_size
+        
+        evicted = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                evicted += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return evicted
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+from array import array
+
+class Interner:
+    """
+    Maps strings to small integer IDs and back, storing each string once.
+    """
+    
+    __slots__ = ('_ids', '_strings')
+    
+    def __init__(self):
+        self._ids = {}
+        self._strings = []
+    
+    def __len__(self):
+        return len(self._strings)
+    
+    def __getitem__(self, string_id):
+        return self._strings[string_id]
+    
+    def intern(self, text):
+        """
+        Args:
+            text (str): String to intern
+        
+        Returns:
+            int: The string's ID, assigned on first use
+        """
+        string_id = self._ids.get(text)
+        if string_id is None:
+            string_id = self._ids[text] = len(self._strings)
+            self._strings.append(text)
+        return string_id
+
+class CallSite:
+    """
+    One frontend API call, as read back from a CallTable.
+    
+    Supports item access (call['path']) as well as attributes, so code
+    written against the dict records of earlier versions keeps working.
+    """
+    
+    __slots__ = ('method', 'path', 'file', 'line', 'column')
+    
+    def __init__(self, method, path, file, line=0, column=0):
+        self.method = method
+        self.path = path
+        self.file = file
+        self.line = line
+        self.column = column
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+    
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+    
+    def __eq__(self, other):
+        if not isinstance(other, CallSite):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+    
+    def __hash__(self):
+        return hash(self.as_tuple())
+    
+    def __repr__(self):
+        return f'CallSite({self.method!r}, {self.path!r}, {self.file!r}, {self.line}, {self.column})'
+    
+    def as_tuple(self):
+        return (self.method, self.path, self.file, self.line, self.column)
+    
+    def as_dict(self):
+        """
+        Returns:
+            dict: The call with 'method', 'path', 'file', 'line' and 'column' keys
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class CallTable:
+    """
+    Append-only, column-oriented table of frontend call sites.
+    
+    Methods, paths and files are interned, and each call is stored as five
+    machine integers in typed arrays: about 20 bytes per call instead of a
+    dict with its own key strings. Iteration creates CallSite objects one at
+    a time, and unique_routes() walks the distinct (method, path) pairs, so
+    work done per route costs memory in proportion to the number of unique
+    routes rather than the number of call sites.
+    """
+    
+    __slots__ = ('methods', 'paths', 'files', '_method_ids', '_path_ids', '_file_ids', '_lines', '_columns')
+    
+    def __init__(self):
+        self.methods = Interner()
+        self.paths = Interner()
+        self.files = Interner()
+        self._method_ids = array('I')
+        self._path_ids = array('I')
+        self._file_ids = array('I')
+        self._lines = array('I')
+        self._columns = array('I')
+    
+    @classmethod
+    def from_calls(cls, calls):
+        """
+        Build a table from call dicts or CallSites.
+        
+        Args:
+            calls (iterable): Calls with 'method', 'path' and 'file', and
+                              optionally 'line' and 'column'
+        
+        Returns:
+            CallTable: The table
+        """
+        table = cls()
+        for call in calls:
+            table.add(call['method'], call['path'], call['file'], call.get('line', 0), call.get('column', 0))
+        return table
+    
+    def __len__(self):
+        return len(self._method_ids)
+    
+    def __getitem__(self, row):
+        return CallSite(
+            self.methods[self._method_ids[row]], self.paths[self._path_ids[row]], self.files[self._file_ids[row]],
+            self._lines[row], self._columns[row]
+        )
+    
+    def __iter__(self):
+        """
+        Yields:
+            CallSite: Every call, in the order it was added
+        """
+        methods, paths, files = self.methods, self.paths, self.files
+        for method_id, path_id, file_id, line, column in zip(
+            self._method_ids, self._path_ids, self._file_ids, self._lines, self._columns
+        ):
+            yield CallSite(methods[method_id], paths[path_id], files[file_id], line, column)
+    
+    def __eq__(self, other):
+        if not isinstance(other, CallTable):
+            return NotImplemented
+        return len(self) == len(other) and all(mine == theirs for mine, theirs in zip(self, other))
+    
+    def add(self, method, path, file, line=0, column=0):
+        """
+        Append a call site.
+        
+        Args:
+            method (str): HTTP method
+            path (str): Call path
+            file (str): File the call is in
+            line (int): 1-based line of the call (0 if unknown)
+            column (int): 1-based column of the call (0 if unknown)
+        """
+        self._method_ids.append(self.methods.intern(method))
+        self._path_ids.append(self.paths.intern(path))
+        self._file_ids.append(self.files.intern(file))
+        self._lines.append(line)
+        self._columns.append(column)
+    
+    def unique_routes(self):
+        """
+        Yields:
+            tuple: (method, path, row) for each distinct method and path,
+                   with the row of its last call site
+        """
+        last_rows = {}
+        for row, key in enumerate(zip(self._method_ids, self._path_ids)):
+            last_rows[key] = row
+        for (method_id, path_id), row in last_rows.items():
+            yield self.methods[method_id], self.paths[path_id], row
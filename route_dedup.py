@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import os
+
+from route_cache import hash_file
+
+# Bytes compared before whole files are hashed. Files of the same size that
+# differ at all usually differ early, so most are told apart with one small
+# read each, and only true copies (and files no longer than this) are left.
+PREFIX_SIZE = 4096
+
+def _prefix(file_path):
+    with open(file_path, 'rb') as f:
+        return f.read(PREFIX_SIZE)
+
+def _split(groups, key):
+    """
+    Split each group of paths by a key, keeping the parts of two or more.
+    """
+    parts = []
+    for group in groups:
+        by_key = {}
+        for file_path in group:
+            try:
+                value = key(file_path)
+            except OSError:
+                # Unreadable files are left to the extraction to report
+                continue
+            by_key.setdefault(value, []).append(file_path)
+        parts.extend(part for part in by_key.values() if len(part) > 1)
+    return parts
+
+def find_duplicates(file_paths):
+    """
+    Find files whose contents are byte-identical to an earlier file.
+    
+    Files are compared in three steps, each only among the files the one
+    before could not tell apart: by size, by their first PREFIX_SIZE bytes,
+    and by a SHA-256 hash of their whole contents. A file whose size no
+    other file has is not read at all.
+    
+    Args:
+        file_paths (list): Files to compare, in order
+    
+    Returns:
+        dict: Maps each duplicate to the first file in file_paths with the
+              same contents; files with unique contents are not in it
+    """
+    sizes = {}
+    
+    def size(file_path):
+        sizes[file_path] = os.path.getsize(file_path)
+        return sizes[file_path]
+    
+    groups = _split(_split([file_paths], size), _prefix)
+    # The prefix is the whole file for small files, so only larger ones need hashing
+    groups = [group for group in groups if sizes[group[0]] <= PREFIX_SIZE] + _split(
+        [group for group in groups if sizes[group[0]] > PREFIX_SIZE], hash_file
+    )
+    
+    # Groups keep the order of file_paths, so each starts with the first copy
+    return {file_path: group[0] for group in groups for file_path in group[1:]}
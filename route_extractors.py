@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+
+import os
+import re
+from collections import namedtuple
+
+# HTTP methods recognized in member calls such as app.get(...) or api.post(...)
+HTTP_METHODS = ('get', 'post', 'put', 'delete', 'patch', 'head', 'options')
+
+# Backend routers also define routes for every method at once, e.g. app.all(...)
+ROUTE_METHODS = HTTP_METHODS + ('all',)
+
+# Other spellings of a method, e.g. koa-router's router.del(...)
+METHOD_ALIASES = {'DEL': 'DELETE'}
+
+# Method of a route that answers every HTTP method (see route_index.ANY_METHODS)
+ANY_METHOD = 'ALL'
+
+# Receiver names (matched as a suffix, case-insensitively) for each framework;
+# the lexer engine recognizes the same names
+EXPRESS_RECEIVERS = ('app', 'router')
+KOA_RECEIVERS = ('router',)
+FASTIFY_RECEIVERS = ('fastify', 'server')
+AXIOS_RECEIVERS = ('axios',)
+
+# Receivers that define routes are never taken for HTTP clients
+SERVER_RECEIVERS = EXPRESS_RECEIVERS + KOA_RECEIVERS + FASTIFY_RECEIVERS
+
+# Whole receiver names for clients that are usually imported under their own name
+KY_NAMES = ('ky',)
+SUPERAGENT_NAMES = ('superagent', 'request')
+
+# One extraction rule. Content extractors have a regex pattern whose groups
+# are named <name>_path... and <name>_method...; the first group of each that
+# took part in a match is used. Path extractors have no pattern and derive a
+# route from the file path alone through route_for_path. first lists the
+# characters every match starts with ('' if it can start with any), so the
+# combined scanner can skip other offsets quickly. expand, if set, turns the
+# (method, path) of one match into the (method, path, receiver) records it
+# stands for, e.g. one per name in an import list.
+Extractor = namedtuple(
+    'Extractor',
+    ['name', 'side', 'pattern', 'first', 'default_method', 'route_for_path', 'expand'],
+    defaults=(None, '', None, None, None),
+)
+
+# Registered extractors by name, in the order their patterns are tried. When
+# two patterns match at the same offset the earlier one wins, so a more
+# specific shape (koa-router's named routes) must come before a general one
+# (Express) that would also match it.
+EXTRACTORS = {}
+
+# Besides routes and calls, extractors record how backend modules are wired
+# together, for route_mounts: which names a file imports from which module,
+# which names it exports, and which routers it mounts under which prefix.
+# These records hold names rather than a method and path (see the extractors
+# below), and are scanned for in backend files only.
+WIRING_SIDES = ('import', 'export', 'mount')
+
+SIDES = ('backend', 'frontend') + WIRING_SIDES
+
+def register_extractor(extractor):
+    """
+    Add an extractor to the registry.
+    
+    route_linter reads the registry when it is imported, so extractors must
+    be registered before that.
+    
+    Args:
+        extractor (Extractor): The extractor to add
+    
+    Raises:
+        ValueError: If the name is taken or not a valid group name, the side
+                    is unknown, or it has both or neither of a pattern and a
+                    route_for_path function
+    """
+    if extractor.name in EXTRACTORS:
+        raise ValueError(f"extractor '{extractor.name}' is already registered")
+    if not extractor.name.isidentifier():
+        raise ValueError(f"extractor name '{extractor.name}' must be a valid identifier")
+    if extractor.side not in SIDES:
+        raise ValueError(f"extractor side must be one of {', '.join(SIDES)}, got '{extractor.side}'")
+    if (extractor.pattern is None) == (extractor.route_for_path is None):
+        raise ValueError(f"extractor '{extractor.name}' needs exactly one of a pattern and route_for_path")
+    EXTRACTORS[extractor.name] = extractor
+
+def side_kinds(side):
+    """
+    Args:
+        side (str): One of SIDES
+    
+    Returns:
+        tuple: Names of the extractors for that side, in registration order
+    """
+    return tuple(name for name, extractor in EXTRACTORS.items() if extractor.side == side)
+
+def next_api_route(file_path):
+    """
+    Derive the route of a Next.js API route file from its path.
+    
+    Files under pages/api (including src/pages/api) map to routes as Next.js
+    serves them: index files to their directory, [param] to :param, and
+    [...slug] or [[...slug]] catch-alls to a trailing wildcard.
+    
+    Args:
+        file_path (str): Path to a source file
+    
+    Returns:
+        str: Route path such as '/api/users/:id', or None if the file is not
+             an API route
+    """
+    parts = file_path.replace(os.sep, '/').split('/')
+    for start in range(len(parts) - 2, -1, -1):
+        if parts[start] == 'pages' and parts[start + 1] == 'api':
+            break
+    else:
+        return None
+    
+    name = parts[-1]
+    if name.endswith('.d.ts'):
+        return None
+    segments = parts[start + 1:-1] + [os.path.splitext(name)[0]]
+    if segments[-1] == 'index':
+        segments.pop()
+    
+    path = []
+    for segment in segments:
+        if segment.startswith('[...') or segment.startswith('[[...'):
+            path.append('*')
+            break
+        if segment.startswith('[') and segment.endswith(']'):
+            path.append(':' + segment[1:-1])
+        else:
+            path.append(segment)
+    return '/' + '/'.join(path)
+
+def imported_names(text):
+    """
+    Split the names bound by an import, a require or a module.exports object.
+    
+    Args:
+        text (str): The bound part, e.g. 'router', '* as api', 'app, { a }',
+                    '{ a, b as c }' or '{ a, b: c }'
+    
+    Returns:
+        list: (local name, imported name) tuples; the imported name is '' for
+              a module's default export or the whole module
+    """
+    names = []
+    default, _, braced = text.partition('{')
+    default = default.strip().rstrip(',').strip()
+    if default:
+        names.append((default.split()[-1], ''))
+    for item in braced.rstrip().rstrip('}').split(','):
+        parts = re.split(r'\s+as\s+|\s*:\s*', item.strip())
+        if parts[0]:
+            names.append((parts[-1], parts[0]))
+    return names
+
+def _expand_names(method, path):
+    return [(local, path, imported) for local, imported in imported_names(method)]
+
+def _names(names):
+    return '|'.join(re.escape(name) for name in names)
+
+_HTTP = _names(HTTP_METHODS)
+_ROUTE = _names(ROUTE_METHODS)
+_ALIASES = _names(name.lower() for name in METHOD_ALIASES)
+
+# Backend route definitions and frontend calls quote paths differently: only
+# frontend calls can use template literals
+_Q = '[\'"]'
+_QT = '[\'"\\`]'
+
+# koa-router named routes and router.del(); listed before Express, which would
+# read a route's name as its path
+# Examples: router.get('user', '/users/:id', ...), router.del('/users/:id', ...)
+register_extractor(Extractor(
+    'koa', 'backend',
+    rf'\w*(?:{_names(KOA_RECEIVERS)})\.(?:(?P<koa_method>{_ROUTE})\s*\(\s*{_Q}(?!/)[^\'"]*{_Q}\s*,'
+    rf'|(?P<koa_method_alias>{_ALIASES})\s*\((?:\s*{_Q}(?!/)[^\'"]*{_Q}\s*,)?)'
+    rf'\s*{_Q}(?P<koa_path>[^\'"]*){_Q}(?:\s*,|\))',
+))
+
+# Express.js route definitions
+# Examples: app.get('/path', ...), router.post('/api/users', ...)
+register_extractor(Extractor(
+    'route', 'backend',
+    rf'\w*(?:{_names(EXPRESS_RECEIVERS)})\.(?P<route_method>{_ROUTE})\s*\(\s*{_Q}(?P<route_path>.*?){_Q}(?:\s*,|\))',
+))
+
+# Fastify shorthand routes
+# Examples: fastify.get('/api/users', ...), server.post('/api/users', { schema }, ...)
+register_extractor(Extractor(
+    'fastify', 'backend',
+    rf'\w*(?:{_names(FASTIFY_RECEIVERS)})\.(?P<fastify_method>{_ROUTE})\s*\(\s*{_Q}(?P<fastify_path>[^\'"]*){_Q}(?:\s*,|\))',
+))
+
+# Fastify full declarations, with method and url in either order
+# Example: fastify.route({ method: 'GET', url: '/api/users', handler })
+register_extractor(Extractor(
+    'fastify_route', 'backend',
+    rf'\w*(?:{_names(FASTIFY_RECEIVERS)})\.route\s*\(\s*\{{'
+    rf'(?:[^}}]*?method\s*:\s*{_Q}(?P<fastify_route_method>\w+){_Q}[^}}]*?url\s*:\s*{_Q}(?P<fastify_route_path>[^\'"]*){_Q}'
+    rf'|[^}}]*?url\s*:\s*{_Q}(?P<fastify_route_path_first>[^\'"]*){_Q}[^}}]*?method\s*:\s*{_Q}(?P<fastify_route_method_last>\w+){_Q})',
+))
+
+# Next.js API routes, from the file path alone; they answer every method
+# Example: pages/api/users/[id].ts -> ALL /api/users/:id
+register_extractor(Extractor('nextjs', 'backend', default_method=ANY_METHOD, route_for_path=next_api_route))
+
+def _module(group):
+    # A relative module path; packages such as 'express' are not part of the backend
+    return rf'{_Q}(?P<{group}>\.[^\'"]*){_Q}'
+
+# CommonJS bindings: the local name(s) are the method, the module the path
+# and the imported name the receiver
+# Examples: const orders = require('./routes/orders'), const { router: users } = require('./users')
+register_extractor(Extractor(
+    'require', 'import',
+    rf'\b(?:const|let|var)\s+(?P<require_method>[\w$]+|\{{[^}}]*\}})\s*=\s*require\s*\(\s*{_module("require_path")}\s*\)',
+    first='clv', expand=_expand_names,
+))
+
+# ES module bindings
+# Examples: import orders from './routes/orders', import { router as users } from './users'
+register_extractor(Extractor(
+    'import', 'import',
+    rf'\bimport\s+(?P<import_method>(?:[\w$]+\s*,\s*)?\{{[^}}]*\}}|\*\s*as\s+[\w$]+|[\w$]+)\s+from\s*{_module("import_path")}',
+    first='i', expand=_expand_names,
+))
+
+# A module's exports: the local name is the method, the exported name the
+# receiver ('' for the default export) and the path is empty
+# Examples: module.exports = router, export default router, module.exports = { app, apiRouter }
+register_extractor(Extractor(
+    'export', 'export',
+    r'\b(?:module\.exports\s*=|export\s+default)\s*(?P<export_method>[\w$]+|\{[^}]*\})[ \t]*(?:;|\r?\n|$)',
+    first='me', expand=_expand_names,
+))
+
+# Routers mounted on an app or another router. The mounted router is the
+# method, either a name or a relative module path, and the prefix the path;
+# the receiver is the router it is mounted on. Middleware before the router
+# is skipped, and for koa-router the router whose .routes() is mounted is taken.
+# Examples: app.use('/api/v2', ordersRouter), app.use('/api', auth, require('./api')),
+#           router.use('/users', users.routes(), users.allowedMethods())
+_ARGUMENT = r'[\w$.]+(?:\s*\([^()]*\))?\s*,\s*'
+register_extractor(Extractor(
+    'use', 'mount',
+    rf'[\w$]+\.use\s*\(\s*(?:{_Q}(?P<use_path>[^\'"]*){_Q}\s*,\s*)?(?:{_ARGUMENT})*'
+    rf'(?:(?P<use_method>[\w$]+)\s*\)|(?P<use_method_routes>[\w$]+)\.routes\s*\(\s*\)\s*[,)]'
+    rf'|require\s*\(\s*{_module("use_method_require")}\s*\)\s*\))',
+))
+
+# Fastify plugins registered with a prefix
+# Examples: fastify.register(usersPlugin, { prefix: '/users' }), fastify.register(require('./users'), { prefix: '/users' })
+register_extractor(Extractor(
+    'register', 'mount',
+    rf'[\w$]+\.register\s*\(\s*(?:(?:require|import)\s*\(\s*{_module("register_method_require")}\s*\)|(?P<register_method>[\w$]+))'
+    rf'\s*(?:,\s*\{{[^}}]*?\bprefix\s*:\s*{_Q}(?P<register_path>[^\'"]*){_Q})?',
+))
+
+# fetch API calls, with an optional options object specifying the method
+# Examples: fetch('/api/users'), fetch(`/api/items/${id}`), fetch('/api/users', { method: 'POST' })
+register_extractor(Extractor(
+    'fetch', 'frontend',
+    rf'fetch\s*\(\s*{_QT}(?P<fetch_path>[^\'"\`]+){_QT}(?:\s*,\s*\{{[^\}}]*method\s*:\s*[\'"](?P<fetch_method>\w+)[\'"])?',
+    first='f', default_method='GET',
+))
+
+# axios method calls
+# Examples: axios.get('/api/users'), axios.post('/api/products')
+register_extractor(Extractor(
+    'axios', 'frontend',
+    rf'(?:{_names(AXIOS_RECEIVERS)})\.(?P<axios_method>{_HTTP})\s*\(\s*{_QT}(?P<axios_path>[^\'"\`]+){_QT}',
+    first='a',
+))
+
+# ky calls, as methods or with an options object like fetch
+# Examples: ky.post('api/users'), ky('api/users', { method: 'put' })
+register_extractor(Extractor(
+    'ky', 'frontend',
+    rf'\b(?:{_names(KY_NAMES)})(?:\.(?P<ky_method>{_HTTP}))?\s*\(\s*{_QT}(?P<ky_path>[^\'"\`]+){_QT}'
+    rf'(?:\s*,\s*\{{[^\}}]*method\s*:\s*[\'"](?P<ky_method_option>\w+)[\'"])?',
+    first='k', default_method='GET',
+))
+
+# superagent calls, as methods or with the method as the first argument
+# Examples: superagent.get('/api/users'), request('DELETE', '/api/users/1')
+register_extractor(Extractor(
+    'superagent', 'frontend',
+    rf'\b(?:{_names(SUPERAGENT_NAMES)})(?:\.(?P<superagent_method>{_HTTP})\s*\('
+    rf'|\s*\(\s*[\'"](?P<superagent_method_argument>{_HTTP})[\'"]\s*,)\s*{_QT}(?P<superagent_path>[^\'"\`]+){_QT}',
+    first='sr',
+))
+
+# Method calls on any other client, such as an axios instance, but not on a
+# router or server; the match starts at the dot, and the receiver is found by
+# walking back from it
+# Examples: api.get('/api/users'), this.http.delete(`/api/users/${id}`)
+register_extractor(Extractor(
+    'client', 'frontend',
+    rf'(?<=[\w$]){"".join(f"(?<!{re.escape(name)})" for name in dict.fromkeys(SERVER_RECEIVERS))}\.(?P<client_method>{_HTTP})\s*\(\s*{_QT}(?P<client_path>[^\'"\`]+){_QT}',
+    first='.',
+))
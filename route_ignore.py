@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+
+import os
+import re
+from collections import Counter
+
+# Project-specific ignore file, same syntax as .gitignore
+PROJECT_IGNORE_FILE = '.routelinterignore'
+
+IGNORE_FILE_NAMES = ('.gitignore', PROJECT_IGNORE_FILE)
+
+# Directories that hold dependencies or build output rather than source
+DEFAULT_PRUNE_DIRS = frozenset((
+    '.git', '.hg', '.svn', 'node_modules', 'bower_components', 'jspm_packages',
+    'dist', 'build', 'out', 'coverage', '.next', '.nuxt', '.svelte-kit', '.turbo',
+    '.cache', '.parcel-cache',
+))
+
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+
+# Bundles and minified vendor files, recognized by name
+MINIFIED_NAME_PATTERN = re.compile(r'[.-](?:min|bundle)\.js$|\.chunk\.js$')
+
+# Larger files are sniffed: if the first block has (almost) no line breaks,
+# the file is minified and is skipped without being read in full
+MINIFIED_SNIFF_MIN_SIZE = 16 * 1024
+MINIFIED_SNIFF_BYTES = 4096
+MINIFIED_LINE_LENGTH = 500
+
+def translate_glob(pattern):
+    """
+    Translate one .gitignore line into a regular expression.
+    
+    Supports comments, '!' negation, trailing '/' for directories, anchoring
+    on a leading or inner '/', '*', '?', character classes and '**'.
+    
+    Args:
+        pattern (str): A line from an ignore file, or a --include/--exclude glob
+    
+    Returns:
+        tuple: (regex source, directory only, negated), or None for blank
+               lines and comments
+    """
+    line = pattern.rstrip('\n').rstrip()
+    if not line or line.startswith('#'):
+        return None
+    negated = line.startswith('!')
+    if negated:
+        line = line[1:]
+    elif line.startswith('\\'):
+        # \! and \# escape a literal first character
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    # A slash anywhere but the end ties the pattern to the ignore file's directory
+    anchored = '/' in line
+    line = line.lstrip('/')
+    
+    out = []
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if line.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif line.startswith('/**', i) and i + 3 == len(line):
+            out.append('/.*')
+            i += 3
+        elif char == '*':
+            out.append('[^/]*')
+            while i < len(line) and line[i] == '*':
+                i += 1
+        elif char == '?':
+            out.append('[^/]')
+            i += 1
+        elif char == '[':
+            close = line.find(']', i + 2 if line[i + 1:i + 2] in ('!', '^', ']') else i + 1)
+            if close < 0:
+                out.append(re.escape(char))
+                i += 1
+                continue
+            body = line[i + 1:close]
+            if body[0] in '!^':
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = close + 1
+        elif char == '\\' and i + 1 < len(line):
+            out.append(re.escape(line[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(char))
+            i += 1
+    
+    body = ''.join(out)
+    if not anchored:
+        body = '(?:.*/)?' + body
+    return body, dir_only, negated
+
+def compile_globs(patterns):
+    """
+    Compile glob lines into one matcher for directories and one for files.
+    
+    Patterns are combined into a single alternation, last pattern first, so
+    one fullmatch finds the pattern that takes effect under .gitignore's
+    "last match wins" rule. Its group name records whether it was negated.
+    
+    Args:
+        patterns (iterable): Ignore file lines or globs
+    
+    Returns:
+        tuple: (directory pattern, file pattern); either is None when no
+               pattern applies to that kind of path
+    """
+    translated = [result for result in map(translate_glob, patterns) if result is not None]
+    dir_parts = []
+    file_parts = []
+    for index in range(len(translated) - 1, -1, -1):
+        body, dir_only, negated = translated[index]
+        part = f"(?P<{'keep' if negated else 'skip'}{index}>{body})"
+        dir_parts.append(part)
+        if not dir_only:
+            file_parts.append(part)
+    dir_pattern = re.compile('|'.join(dir_parts)) if dir_parts else None
+    file_pattern = re.compile('|'.join(file_parts)) if file_parts else None
+    return dir_pattern, file_pattern
+
+def _relative(abs_path, prefix):
+    rel = abs_path[len(prefix):]
+    return rel if os.sep == '/' else rel.replace(os.sep, '/')
+
+class IgnoreLayer:
+    """
+    The compiled patterns of the ignore files in one directory.
+    """
+    
+    __slots__ = ('prefix', 'dir_pattern', 'file_pattern')
+    
+    def __init__(self, directory, patterns):
+        """
+        Args:
+            directory (str): Absolute directory the patterns are relative to
+            patterns (list): Ignore file lines
+        """
+        self.prefix = directory.rstrip(os.sep) + os.sep
+        self.dir_pattern, self.file_pattern = compile_globs(patterns)
+    
+    def verdict(self, abs_path, is_dir):
+        """
+        Returns:
+            bool: True if the path is ignored, False if it is re-included
+                  with '!', None if no pattern matches
+        """
+        pattern = self.dir_pattern if is_dir else self.file_pattern
+        if pattern is None:
+            return None
+        match = pattern.fullmatch(_relative(abs_path, self.prefix))
+        if match is None:
+            return None
+        return match.lastgroup.startswith('skip')
+
+def _read_ignore_file(file_path):
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read().splitlines()
+    except OSError:
+        return []
+
+def load_layer(directory, names):
+    """
+    Load the ignore files present in a directory.
+    
+    A repository root's .git/info/exclude counts as one of its ignore files.
+    
+    Args:
+        directory (str): Absolute directory
+        names (iterable): Names of the directory's entries
+    
+    Returns:
+        IgnoreLayer: The layer, or None if the files hold no patterns
+    """
+    patterns = []
+    for name in IGNORE_FILE_NAMES:
+        if name in names:
+            patterns.extend(_read_ignore_file(os.path.join(directory, name)))
+    if '.git' in names:
+        patterns.extend(_read_ignore_file(os.path.join(directory, '.git', 'info', 'exclude')))
+    layer = IgnoreLayer(directory, patterns)
+    if layer.dir_pattern is None:
+        return None
+    return layer
+
+def is_minified(file_path, size):
+    """
+    Check whether a file looks minified, reading at most one small block.
+    
+    Args:
+        file_path (str): Path to the file
+        size (int): File size in bytes
+    
+    Returns:
+        bool: True for bundle-style names and for large files whose first
+              block has average lines longer than MINIFIED_LINE_LENGTH
+    """
+    if MINIFIED_NAME_PATTERN.search(file_path):
+        return True
+    if size < MINIFIED_SNIFF_MIN_SIZE:
+        return False
+    try:
+        with open(file_path, 'rb') as f:
+            sample = f.read(MINIFIED_SNIFF_BYTES)
+    except OSError:
+        return False
+    return len(sample) / (sample.count(b'\n') + 1) > MINIFIED_LINE_LENGTH
+
+class PathFilter:
+    """
+    Decides during the walk which directories to prune and which files to skip.
+    
+    Combines .gitignore and PROJECT_IGNORE_FILE files (including those in
+    parent directories up to the enclosing git repository), a default list
+    of dependency and build directories, --include/--exclude globs, a file
+    size cap and minified-file detection.
+    """
+    
+    def __init__(self, include=(), exclude=(), use_ignore_files=True, prune_dirs=DEFAULT_PRUNE_DIRS,
+                 max_file_size=DEFAULT_MAX_FILE_SIZE, skip_minified=True):
+        """
+        Args:
+            include (list): Globs; when given, only files matching one are scanned
+            exclude (list): Globs for files and directories to skip
+            use_ignore_files (bool): Honour .gitignore and PROJECT_IGNORE_FILE files
+            prune_dirs (iterable): Directory names that are never entered
+            max_file_size (int): Skip larger files, in bytes (None for no cap)
+            skip_minified (bool): Skip bundles and minified files
+        """
+        self.include = list(include)
+        self.use_ignore_files = use_ignore_files
+        self.prune_dirs = frozenset(prune_dirs)
+        self.max_file_size = max_file_size
+        self.skip_minified = skip_minified
+        self.skipped = Counter()    # reason -> number of paths skipped
+        # Includes are compiled as '!' (keep) patterns ahead of the excludes. The
+        # alternation is tried last pattern first, so one match per path tells
+        # whether it is excluded, included or neither, and excludes win.
+        self._dir_globs, _ = compile_globs(exclude)
+        _, self._file_globs = compile_globs(['!' + glob for glob in self.include] + list(exclude))
+        # Scopes remembered by allows(), which checks paths one at a time
+        self._root_scopes = {}
+        self._dir_scopes = {}
+    
+    def root_scope(self, abs_root):
+        """
+        Build the ignore layers that apply above a walk root.
+        
+        Ignore files in parent directories count as long as they are inside
+        the same git repository, as with git itself.
+        
+        Args:
+            abs_root (str): Absolute root directory
+        
+        Returns:
+            tuple: (root prefix, layers) where layers are deepest first
+        """
+        layers = ()
+        if self.use_ignore_files:
+            # Parent directories up to the repository root, deepest first
+            ancestors = []
+            directory = abs_root
+            while not os.path.isdir(os.path.join(directory, '.git')):
+                parent = os.path.dirname(directory)
+                if parent == directory:
+                    # Not inside a git repository: only the tree's own ignore files count
+                    ancestors = []
+                    break
+                directory = parent
+                ancestors.append(directory)
+            for directory in ancestors:
+                names = [name for name in IGNORE_FILE_NAMES + ('.git',) if os.path.exists(os.path.join(directory, name))]
+                layer = load_layer(directory, names)
+                if layer is not None:
+                    layers += (layer,)
+        return abs_root.rstrip(os.sep) + os.sep, layers
+    
+    def enter_dir(self, abs_dir, names, scope):
+        """
+        Extend a scope with the ignore files of a directory being walked.
+        
+        Args:
+            abs_dir (str): Absolute directory
+            names (iterable): Names of the directory's entries
+            scope (tuple): The parent directory's scope
+        
+        Returns:
+            tuple: The directory's scope
+        """
+        if not self.use_ignore_files:
+            return scope
+        found = [name for name in names if name in IGNORE_FILE_NAMES or name == '.git']
+        if not found:
+            return scope
+        layer = load_layer(abs_dir, found)
+        if layer is None:
+            return scope
+        root, layers = scope
+        return root, (layer,) + layers
+    
+    def _ignored(self, abs_path, is_dir, scope):
+        for layer in scope[1]:
+            verdict = layer.verdict(abs_path, is_dir)
+            if verdict is not None:
+                return verdict
+        return False
+    
+    def skip_dir(self, name, abs_path, scope):
+        """
+        Check whether a directory should be pruned.
+        
+        Returns:
+            bool: True to skip the directory and everything below it
+        """
+        if name in self.prune_dirs:
+            self.skipped['pruned directory'] += 1
+            return True
+        if self._ignored(abs_path, True, scope):
+            self.skipped['ignored directory'] += 1
+            return True
+        if self._dir_globs is not None and self._dir_globs.fullmatch(_relative(abs_path, scope[0])):
+            self.skipped['excluded directory'] += 1
+            return True
+        return False
+    
+    def skip_file(self, abs_path, scope, stat=None):
+        """
+        Check whether a source file should be skipped, without reading it.
+        
+        Args:
+            abs_path (str): Absolute path to the file
+            scope (tuple): Scope of the file's directory
+            stat (callable): Returns the file's os.stat_result, e.g. DirEntry.stat
+        
+        Returns:
+            bool: True to skip the file
+        """
+        if self._ignored(abs_path, False, scope):
+            self.skipped['ignored'] += 1
+            return True
+        if self._file_globs is not None:
+            match = self._file_globs.fullmatch(_relative(abs_path, scope[0]))
+            if match is not None and match.lastgroup.startswith('skip'):
+                self.skipped['excluded'] += 1
+                return True
+            if self.include and match is None:
+                self.skipped['not included'] += 1
+                return True
+        elif self.include:
+            self.skipped['not included'] += 1
+            return True
+        
+        if self.max_file_size is None and not self.skip_minified:
+            return False
+        try:
+            size = (stat or (lambda: os.stat(abs_path)))().st_size
+        except OSError:
+            return False
+        if self.max_file_size is not None and size > self.max_file_size:
+            self.skipped['too large'] += 1
+            return True
+        if self.skip_minified and is_minified(abs_path, size):
+            self.skipped['minified'] += 1
+            return True
+        return False
+    
+    def invalidate(self, paths):
+        """
+        Forget the scopes remembered by allows() that changed ignore files affect.
+        
+        A directory's scope holds the layers of every directory above it, so an
+        ignore file change drops the scopes of its directory and all below it.
+        
+        Args:
+            paths (iterable): Changed paths, e.g. from a watcher
+        
+        Returns:
+            bool: True if any of the paths is an ignore file
+        """
+        changed = []
+        for path in paths:
+            abs_path = os.path.abspath(path)
+            if os.path.basename(abs_path) in IGNORE_FILE_NAMES:
+                changed.append(os.path.dirname(abs_path))
+            elif abs_path.endswith(os.path.join(os.sep, '.git', 'info', 'exclude')):
+                changed.append(os.path.dirname(os.path.dirname(os.path.dirname(abs_path))))
+        if not changed:
+            return False
+        prefixes = tuple(directory.rstrip(os.sep) + os.sep for directory in changed)
+        for cache in (self._dir_scopes, self._root_scopes):
+            for directory in [d for d in cache if d in changed or d.startswith(prefixes)]:
+                del cache[directory]
+        return True
+    
+    def allows(self, file_path, abs_root):
+        """
+        Check a single file outside of a walk, e.g. one reported by a watcher.
+        
+        Args:
+            file_path (str): Path to the file
+            abs_root (str): Absolute walk root that contains the file
+        
+        Returns:
+            bool: True if a walk would scan the file
+        """
+        abs_path = os.path.abspath(file_path)
+        scope = self._root_scopes.get(abs_root)
+        if scope is None:
+            scope = self._root_scopes[abs_root] = self.root_scope(abs_root)
+        
+        directory = abs_root
+        rel_dir = os.path.relpath(os.path.dirname(abs_path), abs_root)
+        parts = [] if rel_dir == '.' else rel_dir.split(os.sep)
+        for part in [None] + parts:
+            if part is not None:
+                directory = os.path.join(directory, part)
+                if self.skip_dir(part, directory, scope):
+                    return False
+            cached = self._dir_scopes.get(directory)
+            if cached is None:
+                try:
+                    names = os.listdir(directory)
+                except OSError:
+                    names = []
+                cached = self._dir_scopes[directory] = self.enter_dir(directory, names, scope)
+            scope = cached
+        return not self.skip_file(abs_path, scope)
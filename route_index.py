@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+import re
+
+from route_paths import canonical_path
+
+# Marks a frontend path segment whose value is only known at runtime, e.g. ${userId}
+DYNAMIC = object()
+
+# Methods whose routes answer every HTTP method
+ANY_METHODS = ('ALL', 'ANY')
+
+class _Node:
+    """
+    One segment position in the route trie.
+    
+    Edges are whole path segments, so a lookup costs one dict probe per
+    segment no matter how many routes share the prefix.
+    """
+    __slots__ = ('static', 'params', 'wildcard', 'route')
+    
+    def __init__(self):
+        self.static = {}      # literal segment -> _Node
+        self.params = {}      # constraint source ('' for none) -> (compiled constraint, _Node)
+        self.wildcard = None  # route string matched by a trailing '*'
+        self.route = None     # route string that ends at this node
+    
+    def child_param(self, constraint):
+        if constraint not in self.params:
+            compiled = None
+            if constraint:
+                try:
+                    compiled = re.compile(constraint)
+                except re.error:
+                    # Constraints we cannot compile are treated as plain params
+                    compiled = None
+            self.params[constraint] = (compiled, _Node())
+        return self.params[constraint][1]
+
+def split_backend_path(path):
+    """
+    Split an Express route path into segments, expanding optional params.
+    
+    Args:
+        path (str): Route path such as '/files/:name?' or '/users/:id(\\d+)'
+    
+    Returns:
+        list: One segment list per expansion of the optional params, where
+              each segment is ('static', text), ('param', constraint) or
+              ('wildcard', None)
+    """
+    expansions = [[]]
+    for segment in path.split('/'):
+        if not segment:
+            continue
+        if '*' in segment:
+            kind = ('wildcard', None)
+        elif segment.startswith(':'):
+            optional = segment.endswith('?')
+            name = segment[1:-1] if optional else segment[1:]
+            constraint = ''
+            if '(' in name and name.endswith(')'):
+                # Route strings are taken from JS source, so '\\d' means '\d'
+                constraint = name[name.index('(') + 1:-1].replace('\\\\', '\\')
+            kind = ('param', constraint)
+            if optional:
+                expansions = [segments + [kind] for segments in expansions] + expansions
+                continue
+        else:
+            kind = ('static', segment)
+        expansions = [segments + [kind] for segments in expansions]
+    return expansions
+
+def split_frontend_path(path):
+    """
+    Split a frontend call path into segments.
+    
+    The path is brought into canonical form first (see
+    route_paths.canonical_path), and any segment holding a template
+    expression or a placeholder becomes DYNAMIC.
+    
+    Args:
+        path (str): Call path such as '/api/users/${id}?full=1'
+    
+    Returns:
+        list: Segment strings, with DYNAMIC for runtime values
+    """
+    return [
+        DYNAMIC if segment.startswith(':') or ':param' in segment else segment
+        for segment in canonical_path(path).split('/') if segment
+    ]
+
+class RouteIndex:
+    """
+    Compiled index of backend routes for matching frontend calls.
+    
+    Routes are stored in one segment trie per HTTP method. Static segments are
+    preferred over params, and params over wildcards, with backtracking when a
+    more specific branch dead-ends. Typical lookups are O(path segments) and
+    independent of how many routes are indexed.
+    """
+    
+    def __init__(self, routes=()):
+        """
+        Args:
+            routes (iterable): Route strings in the format 'METHOD /path'
+        """
+        self._roots = {}
+        self.size = 0
+        for route in routes:
+            self.add(route)
+    
+    def add(self, route):
+        """
+        Add a backend route.
+        
+        Args:
+            route (str): Route string in the format 'METHOD /path'
+        """
+        parts = route.split(' ', 1)
+        if len(parts) != 2:
+            return
+        method, path = parts
+        root = self._roots.setdefault(method.upper(), _Node())
+        
+        for segments in split_backend_path(path):
+            node = root
+            for kind, value in segments:
+                if kind == 'wildcard':
+                    # A wildcard swallows the rest of the path
+                    if node.wildcard is None:
+                        node.wildcard = route
+                    break
+                if kind == 'param':
+                    node = node.child_param(value)
+                else:
+                    node = node.static.setdefault(value, _Node())
+            else:
+                if node.route is None:
+                    node.route = route
+        self.size += 1
+    
+    def match(self, method, path):
+        """
+        Find the backend route a frontend call resolves to.
+        
+        Args:
+            method (str): HTTP method of the call
+            path (str): Call path, possibly containing ${...} expressions
+        
+        Returns:
+            str: The matching backend route string, or None
+        """
+        segments = split_frontend_path(path)
+        for key in (method.upper(),) + ANY_METHODS:
+            root = self._roots.get(key)
+            if root is not None:
+                route = self._match(root, segments, 0)
+                if route is not None:
+                    return route
+        return None
+    
+    def match_request(self, method, path):
+        """
+        Find the backend route a request served to a client resolves to.
+        
+        Unlike a call path, a request path holds no expressions, so it is
+        split as it is, which makes this much cheaper than match() when
+        millions of logged requests are resolved.
+        
+        Args:
+            method (str): HTTP method of the request
+            path (str): Request path without query string, e.g. '/api/users/42'
+        
+        Returns:
+            str: The matching backend route string, or None
+        """
+        segments = [segment for segment in path.split('/') if segment]
+        for key in (method,) + ANY_METHODS:
+            root = self._roots.get(key)
+            if root is not None:
+                route = self._match(root, segments, 0)
+                if route is not None:
+                    return route
+        return None
+    
+    def _match(self, node, segments, position):
+        if position == len(segments):
+            return node.route
+        
+        segment = segments[position]
+        if segment is not DYNAMIC:
+            child = node.static.get(segment)
+            if child is not None:
+                route = self._match(child, segments, position + 1)
+                if route is not None:
+                    return route
+        
+        for constraint, child in node.params.values():
+            # Runtime values cannot be checked against a constraint, so accept them
+            if constraint is not None and segment is not DYNAMIC and not constraint.fullmatch(segment):
+                continue
+            route = self._match(child, segments, position + 1)
+            if route is not None:
+                return route
+        
+        return node.wildcard
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+import mmap
+import os
+import struct
+import tempfile
+
+# Identifies a serialized backend route index
+INDEX_MAGIC = b'RLIX'
+
+# Bump when the file layout changes
+INDEX_FORMAT_VERSION = 1
+
+# magic, format version, reserved, number of entries
+HEADER = struct.Struct('<4sHHI')
+
+# route offset, route length, file offset, file length, line; offsets are
+# relative to the start of the string table that follows the entries
+ENTRY = struct.Struct('<IIIII')
+
+class IndexFileError(Exception):
+    """
+    Raised when a route index file is missing, truncated or of another version.
+    """
+
+def write_index_file(file_path, definitions):
+    """
+    Write backend route definitions to a compact binary index.
+    
+    The file holds a fixed-size header, one fixed-size entry per definition
+    sorted by route, and a table of the UTF-8 route and file strings, each
+    stored once. Readers can binary-search the entries in place without
+    decoding the rest of the file.
+    
+    Args:
+        file_path (str): Destination path
+        definitions (iterable): (route, file, line) tuples, where route is
+            'METHOD /path', file is relative to the backend directory and
+            line is 1-based (0 if unknown)
+    
+    Returns:
+        int: Number of entries written; repeated definitions are stored once
+    """
+    entries = sorted(
+        (route.encode('utf-8'), source.encode('utf-8'), line)
+        for route, source, line in set(definitions)
+    )
+    strings = bytearray()
+    offsets = {}
+    
+    def intern(text):
+        if text not in offsets:
+            offsets[text] = len(strings)
+            strings.extend(text)
+        return offsets[text]
+    
+    packed = bytearray(HEADER.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, 0, len(entries)))
+    for route, source, line in entries:
+        packed += ENTRY.pack(intern(route), len(route), intern(source), len(source), line)
+    packed += strings
+    
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(packed)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return len(entries)
+
+class RouteIndexFile:
+    """
+    Read-only view of an index written by write_index_file.
+    
+    The file is memory-mapped, so opening it costs the same for ten routes
+    or a hundred thousand; entries are decoded only when they are read.
+    """
+    
+    def __init__(self, file_path):
+        """
+        Args:
+            file_path (str): Path to the index file
+        
+        Raises:
+            IndexFileError: If the file cannot be read or is not a valid index
+        """
+        self.file_path = file_path
+        try:
+            with open(file_path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            # mmap raises ValueError for empty files
+            raise IndexFileError(f'could not read route index {file_path}: {e}')
+        
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise IndexFileError(f'{file_path} is not a route index')
+        magic, version, _, count = HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC:
+            self.close()
+            raise IndexFileError(f'{file_path} is not a route index')
+        if version != INDEX_FORMAT_VERSION:
+            self.close()
+            raise IndexFileError(f'{file_path} is a version {version} route index; this linter reads version {INDEX_FORMAT_VERSION}')
+        self._count = count
+        self._strings = HEADER.size + count * ENTRY.size
+        if len(self._map) < self._strings:
+            self.close()
+            raise IndexFileError(f'{file_path} is truncated')
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __len__(self):
+        return self._count
+    
+    def __iter__(self):
+        """
+        Yields:
+            tuple: (route, file, line) for every definition, sorted by route
+        """
+        for position in range(self._count):
+            yield self._entry(position)
+    
+    def close(self):
+        self._map.close()
+    
+    def routes(self):
+        """
+        Returns:
+            set: Every route in the format 'METHOD /path'
+        """
+        return {route for route, _, _ in self}
+    
+    def locations(self, route):
+        """
+        Find where a route is defined, by binary search over the entries.
+        
+        Args:
+            route (str): Route in the format 'METHOD /path'
+        
+        Returns:
+            list: (file, line) tuples, empty if the route is not defined
+        """
+        key = route.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._route_bytes(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        
+        found = []
+        while low < self._count and self._route_bytes(low) == key:
+            _, source, line = self._entry(low)
+            found.append((source, line))
+            low += 1
+        return found
+    
+    def _route_bytes(self, position):
+        route_offset, route_length, _, _, _ = ENTRY.unpack_from(self._map, HEADER.size + position * ENTRY.size)
+        start = self._strings + route_offset
+        return self._map[start:start + route_length]
+    
+    def _entry(self, position):
+        route_offset, route_length, file_offset, file_length, line = ENTRY.unpack_from(
+            self._map, HEADER.size + position * ENTRY.size
+        )
+        route_start = self._strings + route_offset
+        file_start = self._strings + file_offset
+        return (
+            self._map[route_start:route_start + route_length].decode('utf-8'),
+            self._map[file_start:file_start + file_length].decode('utf-8'),
+            line,
+        )
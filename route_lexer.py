@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+
+import re
+import time
+
+from route_extractors import (
+    AXIOS_RECEIVERS, EXPRESS_RECEIVERS, FASTIFY_RECEIVERS, HTTP_METHODS, KOA_RECEIVERS, KY_NAMES, METHOD_ALIASES,
+    ROUTE_METHODS, SERVER_RECEIVERS, SUPERAGENT_NAMES,
+)
+
+# Bump when the lexer's output changes, so cached results are discarded
+LEXER_VERSION = 4
+
+# Methods koa-router also accepts under another name, e.g. router.del(...)
+KOA_METHODS = ROUTE_METHODS + tuple(alias.lower() for alias in METHOD_ALIASES)
+
+# Tokens that may follow a route path: more arguments, or the end of the call
+ARGUMENT_END = (('punct', ','), ('punct', ')'))
+
+# How many tokens are produced or read between time budget checks
+BUDGET_CHECK_INTERVAL = 1024
+
+# Most tokens read between the braces of an imported or exported '{ ... }'
+MAX_BINDING_TOKENS = 4096
+
+# One code token, after optional whitespace. Every alternative starts with a
+# different character class, so a match never backtracks across alternatives.
+CODE_TOKEN = re.compile(r'\s*(?:(?P<id>[A-Za-z_$][\w$]*)|(?P<num>\d[\w.]*)|(?P<other>\S))')
+
+# Bodies of '...' and "..." strings; an unescaped newline ends an unterminated string
+STRING_BODY = {
+    "'": re.compile(r"(?:[^'\\\n]|\\.)*", re.S),
+    '"': re.compile(r'(?:[^"\\\n]|\\.)*', re.S),
+}
+
+# Literal text of a template up to the next backtick or ${
+TEMPLATE_BODY = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*', re.S)
+
+# Body of a regex literal after its opening slash, including a character class
+REGEX_BODY = re.compile(r'(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])*/[A-Za-z]*')
+
+# After these keywords a slash starts a regex literal rather than a division
+REGEX_KEYWORDS = frozenset((
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+))
+
+QUOTES = "'\"`"
+
+# A fetch method value, e.g. the POST in { method: 'POST' }
+METHOD_VALUE = re.compile(r'\w+')
+
+class TimeBudgetExceeded(Exception):
+    """
+    Raised when extracting a single file takes longer than its time budget.
+    """
+
+def _check_deadline(deadline, budget):
+    if deadline is not None and time.perf_counter() > deadline:
+        raise TimeBudgetExceeded(f'extraction exceeded the {budget:g}s time budget')
+
+def tokenize(text, deadline=None, budget=None, positions=None):
+    """
+    Split JavaScript source into tokens in one left-to-right pass.
+    
+    Comments and regex literals are skipped. Strings and template literals
+    become single tokens holding their raw text, with ${} interpolations kept
+    verbatim; code inside an interpolation is lexed only to find where it
+    ends. Unterminated strings end at the line break and unterminated
+    comments at the end of the file, so no offset is ever scanned twice.
+    
+    Args:
+        text (str): Source text
+        deadline (float): time.perf_counter() value after which to give up
+        budget (float): The budget the deadline was derived from, for the error message
+        positions (list): If given, the offset of each returned token is
+                          appended to it
+    
+    Returns:
+        list: (type, value) tuples, where type is 'id', 'num', 'punct', or
+              the quote character for strings and templates
+    
+    Raises:
+        TimeBudgetExceeded: If the deadline passes
+    """
+    tokens = []
+    length = len(text)
+    pos = 0
+    # One entry per open template: [start offset, brace depth of the current ${} or None]
+    templates = []
+    prev_type = prev_value = None
+    regex_blocked_until = -1
+    steps = 0
+    
+    while pos < length:
+        steps += 1
+        if steps % BUDGET_CHECK_INTERVAL == 0:
+            _check_deadline(deadline, budget)
+        
+        if templates and templates[-1][1] is None:
+            # Inside the literal text of a template
+            pos = TEMPLATE_BODY.match(text, pos).end()
+            if pos >= length:
+                break
+            if text[pos] == '`':
+                start = templates.pop()[0]
+                pos += 1
+                if not templates:
+                    tokens.append(('`', text[start + 1:pos - 1]))
+                    if positions is not None:
+                        positions.append(start)
+                prev_type, prev_value = '`', None
+            else:
+                # ${ opens an interpolation
+                templates[-1][1] = 0
+                pos += 2
+                prev_type, prev_value = 'punct', '{'
+            continue
+        
+        match = CODE_TOKEN.match(text, pos)
+        if match is None:
+            break
+        pos = match.end()
+        emit = not templates
+        
+        kind = match.lastgroup
+        if kind != 'other':
+            if emit:
+                tokens.append((kind, match.group(kind)))
+                if positions is not None:
+                    positions.append(match.start(kind))
+            prev_type, prev_value = kind, match.group(kind)
+            continue
+        
+        char = match.group('other')
+        if char in QUOTES:
+            if char == '`':
+                templates.append([pos - 1, None])
+                continue
+            end = STRING_BODY[char].match(text, pos).end()
+            if emit:
+                tokens.append((char, text[pos:end]))
+                if positions is not None:
+                    positions.append(pos - 1)
+            pos = end + 1 if end < length and text[end] == char else end
+            prev_type, prev_value = char, None
+            continue
+        
+        if char == '/' and pos < length:
+            following = text[pos]
+            if following == '/':
+                newline = text.find('\n', pos)
+                pos = length if newline < 0 else newline
+                continue
+            if following == '*':
+                close = text.find('*/', pos + 1)
+                pos = length if close < 0 else close + 2
+                continue
+            regex_allowed = (
+                prev_type is None
+                or (prev_type == 'punct' and prev_value not in ')]}')
+                or (prev_type == 'id' and prev_value in REGEX_KEYWORDS)
+            )
+            if regex_allowed and pos > regex_blocked_until:
+                literal = REGEX_BODY.match(text, pos)
+                if literal is not None:
+                    pos = literal.end()
+                    prev_type, prev_value = 'regex', None
+                    continue
+                # Not a regex after all; do not try again on this line
+                newline = text.find('\n', pos)
+                regex_blocked_until = length if newline < 0 else newline
+        
+        if templates:
+            template = templates[-1]
+            if char == '{':
+                template[1] += 1
+            elif char == '}':
+                if template[1] == 0:
+                    # Back to the template's literal text
+                    template[1] = None
+                    continue
+                template[1] -= 1
+        if emit:
+            tokens.append(('punct', char))
+            if positions is not None:
+                positions.append(pos - 1)
+        prev_type, prev_value = 'punct', char
+    
+    return tokens
+
+def _plain_path(token):
+    # Call paths are non-empty strings without other quote characters, as in the regex engine
+    value = token[1]
+    return bool(value) and not any(quote in value for quote in QUOTES)
+
+def _route_string(token):
+    # Backend route paths are '...' or "..." strings
+    return token[0] in "'\""
+
+def _relative_module(token):
+    # require() and import only link backend files through relative paths, as in route_extractors
+    return token[0] in "'\"" and token[1].startswith('.')
+
+def _bound_names(tokens, start):
+    """
+    Read the names bound by an import or require: a name, '{ ... }',
+    '* as name' or 'name, { ... }'. Returns (text, index after them), with
+    the text spelled as imported_names reads it, or None.
+    """
+    count = len(tokens)
+    parts = []
+    i = start
+    if i < count and tokens[i] == ('punct', '*'):
+        if i + 2 < count and tokens[i + 1][0] == 'id' and tokens[i + 1][1] == 'as' and tokens[i + 2][0] == 'id':
+            return f'* as {tokens[i + 2][1]}', i + 3
+        return None
+    if i < count and tokens[i][0] == 'id':
+        parts.append(tokens[i][1])
+        i += 1
+        if not (i + 1 < count and tokens[i] == ('punct', ',') and tokens[i + 1] == ('punct', '{')):
+            return parts[0], i
+        parts.append(',')
+        i += 1
+    if i >= count or tokens[i] != ('punct', '{'):
+        return None
+    # A ';' or another '{' before the '}' means no flat pattern is bound
+    # here, so stopping there keeps unclosed braces from being rescanned
+    # to the end of the file at every binding
+    close = i + 1
+    limit = min(count, close + MAX_BINDING_TOKENS)
+    while close < limit and tokens[close] not in (('punct', '}'), ('punct', ';'), ('punct', '{')):
+        close += 1
+    if close >= limit or tokens[close] != ('punct', '}'):
+        return None
+    parts.append('{ ' + ' '.join(value for _, value in tokens[i + 1:close]) + ' }')
+    return ' '.join(parts), close + 1
+
+def _statement_ends(text, tokens, positions, index):
+    """
+    Check that the token before index ends its statement: a semicolon, a
+    line break or the end of the text follows it.
+    """
+    previous = tokens[index - 1]
+    end = positions[index - 1] + (1 if previous[0] == 'punct' else len(previous[1]))
+    following = positions[index] if index < len(tokens) else len(text)
+    gap = text[end:following].lstrip(' \t')
+    if gap.startswith(('\n', '\r\n')):
+        return True
+    return gap == '' and (index == len(tokens) or tokens[index] == ('punct', ';'))
+
+def _mounted(tokens, start):
+    """
+    Read the arguments of a use() call from the token after its '('.
+    Returns (mounted router, prefix) as the use extractor finds them, or None.
+    """
+    count = len(tokens)
+    i = start
+    prefix = ''
+    if i + 1 < count and _route_string(tokens[i]) and tokens[i + 1] == ('punct', ','):
+        prefix = tokens[i][1]
+        i += 2
+    
+    # One (names, call arguments or None, module) entry per argument
+    arguments = []
+    while True:
+        if (i + 3 < count and tokens[i] == ('id', 'require') and tokens[i + 1] == ('punct', '(')
+                and _relative_module(tokens[i + 2]) and tokens[i + 3] == ('punct', ')')):
+            arguments.append(([], None, tokens[i + 2][1]))
+            i += 4
+        elif i < count and tokens[i][0] == 'id':
+            names = [tokens[i][1]]
+            i += 1
+            while i + 1 < count and tokens[i] == ('punct', '.') and tokens[i + 1][0] == 'id':
+                names.append(tokens[i + 1][1])
+                i += 2
+            call = None
+            if i < count and tokens[i] == ('punct', '('):
+                close = i + 1
+                while close < count and tokens[close] not in (('punct', '('), ('punct', ')')):
+                    close += 1
+                if close >= count or tokens[close] != ('punct', ')'):
+                    return None
+                call = tokens[i + 1:close]
+                i = close + 1
+            arguments.append((names, call, None))
+        else:
+            return None
+        if i < count and tokens[i] == ('punct', ','):
+            i += 1
+        elif i < count and tokens[i] == ('punct', ')'):
+            break
+        else:
+            return None
+    
+    # The last argument is the router, unless an earlier one mounts a koa-router's routes()
+    names, call, module = arguments[-1]
+    if module is not None:
+        return module, prefix
+    if call is None and len(names) == 1:
+        return names[0], prefix
+    for names, call, _ in reversed(arguments):
+        if call == [] and len(names) == 2 and names[1] == 'routes':
+            return names[0], prefix
+    return None
+
+def lexer_hits(text, kinds, deadline=None, budget=None):
+    """
+    Find route definitions and API calls in the token stream.
+    
+    Recognizes the same shapes as the extractors in route_extractors, e.g.
+    '<...app|...router>.<method>('path', ...)', '<...fetch>('path', { method: 'X' })',
+    'fastify.route({ method: 'X', url: 'path' })' and '<client>.<method>('path')',
+    matching names case-insensitively, and the imports, exports and use() or
+    register() mounts of route_extractors' wiring extractors. Methods, urls
+    and prefixes are looked up among the direct keys of an options object.
+    
+    Args:
+        text (str): Source text
+        kinds (tuple): Call kinds to look for, named as in route_extractors
+        deadline (float): time.perf_counter() value after which to give up
+        budget (float): The budget the deadline was derived from, for the error message
+    
+    Returns:
+        list: [kind, method, path, offset] lists in source order, where offset
+              is where the call's receiver starts; method is None for a call
+              that does not name one. Wiring hits hold the same text as the
+              regex engine's groups, up to whitespace.
+    
+    Raises:
+        TimeBudgetExceeded: If the deadline passes
+    """
+    positions = []
+    tokens = tokenize(text, deadline, budget, positions)
+    want = set(kinds)
+    
+    hits = []
+    options = {}    # token index of a '{' -> the hit whose options it opens
+    braces = []     # one entry per open '{': its hit, or None
+    count = len(tokens)
+    
+    for i, (token_type, value) in enumerate(tokens):
+        if i % BUDGET_CHECK_INTERVAL == 0:
+            _check_deadline(deadline, budget)
+        if token_type == 'punct':
+            if value == '{':
+                braces.append(options.pop(i, None))
+            elif value == '}' and braces:
+                braces.pop()
+            continue
+        if token_type != 'id':
+            continue
+        
+        name = value.lower()
+        if name in ('method', 'url', 'prefix') and braces and braces[-1] is not None:
+            # A key of an options object: fetch('path', { method }), fastify.route({ method, url })
+            # or fastify.register(plugin, { prefix })
+            hit = braces[-1]
+            if i + 2 < count and tokens[i + 1] == ('punct', ':') and tokens[i + 2][0] in "'\"":
+                key_value = tokens[i + 2][1]
+                if name == 'method' and hit[1] is None and METHOD_VALUE.fullmatch(key_value):
+                    hit[1] = key_value.upper()
+                elif name == 'url' and hit[0] == 'fastify_route' and hit[2] is None:
+                    hit[2] = key_value
+                elif name == 'prefix' and hit[0] == 'register' and hit[2] == '':
+                    hit[2] = key_value
+            continue
+        
+        # Bindings: const <names> = require('./module'), import <names> from './module'
+        if 'require' in want and name in ('const', 'let', 'var'):
+            bound = _bound_names(tokens, i + 1)
+            # A single name or a destructuring pattern
+            if bound is not None and (bound[0].startswith('{') or ' ' not in bound[0]):
+                names, j = bound
+                if (j + 4 < count and tokens[j] == ('punct', '=') and tokens[j + 1][0] == 'id'
+                        and tokens[j + 1][1].lower() == 'require' and tokens[j + 2] == ('punct', '(')
+                        and _relative_module(tokens[j + 3]) and tokens[j + 4] == ('punct', ')')):
+                    hits.append(['require', names, tokens[j + 3][1], positions[i]])
+            continue
+        if 'import' in want and name == 'import':
+            bound = _bound_names(tokens, i + 1)
+            if bound is not None:
+                names, j = bound
+                if (j + 1 < count and tokens[j][0] == 'id' and tokens[j][1].lower() == 'from'
+                        and _relative_module(tokens[j + 1])):
+                    hits.append(['import', names, tokens[j + 1][1], positions[i]])
+            continue
+        
+        # Exports: module.exports = <names>, export default <name>
+        if 'export' in want and name in ('module', 'export'):
+            if name == 'module':
+                head = i + 3 < count and tokens[i + 1] == ('punct', '.') and tokens[i + 2][0] == 'id' \
+                    and tokens[i + 2][1].lower() == 'exports' and tokens[i + 3] == ('punct', '=')
+                start = i + 4
+            else:
+                head = i + 1 < count and tokens[i + 1][0] == 'id' and tokens[i + 1][1].lower() == 'default'
+                start = i + 2
+            if head:
+                bound = _bound_names(tokens, start)
+                if bound is not None and (bound[0].startswith('{') or ' ' not in bound[0]):
+                    names, j = bound
+                    if _statement_ends(text, tokens, positions, j):
+                        hits.append(['export', names, '', positions[i]])
+            continue
+        
+        # Plain calls: fetch('path' ...), ky('path' ...), request('METHOD', 'path')
+        if i + 2 < count and tokens[i + 1] == ('punct', '('):
+            argument = tokens[i + 2]
+            kind = None
+            if 'fetch' in want and name.endswith('fetch'):
+                kind = 'fetch'
+            elif 'ky' in want and name in KY_NAMES:
+                kind = 'ky'
+            if kind is not None:
+                if argument[0] in QUOTES and _plain_path(argument):
+                    hit = [kind, None, argument[1], positions[i]]
+                    hits.append(hit)
+                    if i + 4 < count and tokens[i + 3] == ('punct', ',') and tokens[i + 4] == ('punct', '{'):
+                        options[i + 4] = hit
+                continue
+            if 'superagent' in want and name in SUPERAGENT_NAMES:
+                if (i + 4 < count and argument[0] in "'\"" and argument[1].lower() in HTTP_METHODS
+                        and tokens[i + 3] == ('punct', ',') and tokens[i + 4][0] in QUOTES and _plain_path(tokens[i + 4])):
+                    hits.append(['superagent', argument[1].upper(), tokens[i + 4][1], positions[i]])
+                continue
+        
+        # Member calls: <receiver>.<method>('path'
+        if i + 4 >= count or tokens[i + 1] != ('punct', '.') or tokens[i + 3] != ('punct', '('):
+            continue
+        method_token = tokens[i + 2]
+        path_token = tokens[i + 4]
+        if method_token[0] != 'id':
+            continue
+        verb = method_token[1].lower()
+        following = tokens[i + 5] if i + 5 < count else None
+        
+        if 'fastify_route' in want and verb == 'route' and name.endswith(FASTIFY_RECEIVERS) and path_token == ('punct', '{'):
+            hit = ['fastify_route', None, None, positions[i]]
+            hits.append(hit)
+            options[i + 4] = hit
+            continue
+        
+        if 'use' in want and verb == 'use':
+            mounted = _mounted(tokens, i + 4)
+            if mounted is not None:
+                hits.append(['use', mounted[0], mounted[1], positions[i]])
+            continue
+        
+        if 'register' in want and verb == 'register':
+            # A plugin name, or require('./module') / import('./module')
+            if (i + 7 < count and path_token[0] == 'id' and path_token[1].lower() in ('require', 'import')
+                    and tokens[i + 5] == ('punct', '(') and _relative_module(tokens[i + 6])
+                    and tokens[i + 7] == ('punct', ')')):
+                hit = ['register', tokens[i + 6][1], '', positions[i]]
+                end = i + 8
+            elif path_token[0] == 'id':
+                hit = ['register', path_token[1], '', positions[i]]
+                end = i + 5
+            else:
+                continue
+            hits.append(hit)
+            if end + 1 < count and tokens[end] == ('punct', ',') and tokens[end + 1] == ('punct', '{'):
+                options[end + 1] = hit
+            continue
+        
+        if 'koa' in want and name.endswith(KOA_RECEIVERS) and verb in KOA_METHODS and _route_string(path_token):
+            # Named routes put the name before the path: router.get('user', '/users/:id', ...)
+            path_index = None
+            if (not path_token[1].startswith('/') and following == ('punct', ',')
+                    and i + 6 < count and _route_string(tokens[i + 6])):
+                path_index = i + 6
+            elif verb not in ROUTE_METHODS:
+                path_index = i + 4
+            if path_index is not None and path_index + 1 < count and tokens[path_index + 1] in ARGUMENT_END:
+                method = verb.upper()
+                hits.append(['koa', METHOD_ALIASES.get(method, method), tokens[path_index][1], positions[i]])
+                continue
+        
+        if verb in ROUTE_METHODS and _route_string(path_token) and following in ARGUMENT_END:
+            # The path must be a whole argument
+            if 'route' in want and name.endswith(EXPRESS_RECEIVERS):
+                hits.append(['route', verb.upper(), path_token[1], positions[i]])
+                continue
+            if 'fastify' in want and name.endswith(FASTIFY_RECEIVERS):
+                hits.append(['fastify', verb.upper(), path_token[1], positions[i]])
+                continue
+        
+        if verb not in HTTP_METHODS or path_token[0] not in QUOTES or not _plain_path(path_token):
+            continue
+        if 'axios' in want and name.endswith(AXIOS_RECEIVERS):
+            kind = 'axios'
+        elif 'ky' in want and name in KY_NAMES:
+            kind = 'ky'
+        elif 'superagent' in want and name in SUPERAGENT_NAMES:
+            kind = 'superagent'
+        elif 'client' in want and not name.endswith(SERVER_RECEIVERS):
+            # Any other receiver, such as an axios instance
+            kind = 'client'
+        else:
+            continue
+        hits.append([kind, verb.upper(), path_token[1], positions[i]])
+    
+    # A fastify.route() declaration needs both a method and a url
+    return [hit for hit in hits if hit[2] is not None and (hit[0] != 'fastify_route' or hit[1] is not None)]
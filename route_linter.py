@@ -4,304 +4,2462 @@ import argparse
 import sys
 import os
 import re
+import time
+import zlib
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 
-def parse_backend_routes(directory):
+from route_baseline import (
+    BaselineError, changed_files, current_commit, load_baseline, merge_shards, repository_root, save_baseline
+)
+from route_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ExtractionCache, patterns_fingerprint
+from route_calls import CallTable
+from route_dedup import find_duplicates
+from route_extractors import EXTRACTORS, METHOD_ALIASES, WIRING_SIDES, side_kinds
+from route_ignore import DEFAULT_MAX_FILE_SIZE, DEFAULT_PRUNE_DIRS, PROJECT_IGNORE_FILE, PathFilter
+from route_index import RouteIndex
+from route_index_file import IndexFileError, RouteIndexFile, write_index_file
+from route_lexer import LEXER_VERSION, TimeBudgetExceeded, lexer_hits
+from route_mounts import MountGraph, module_wiring
+from route_output import OUTPUT_FORMATS, WRITERS
+from route_paths import canonical_path, is_api_path
+from route_prefilter import Prefilter
+from route_reader import DEFAULT_MMAP_THRESHOLD, DEFAULT_READ_AHEAD, DEFAULT_READ_OPTIONS, ReadOptions, read_source, read_sources
+from route_stats import DEFAULT_TOP_FILES, NULL_STATS, RunStats
+from route_suggest import SuggestionIndex
+from route_traffic import LOG_FORMATS, AccessLogs
+
+# File extensions scanned on each side of the lint
+BACKEND_EXTENSIONS = ('.js', '.ts')
+FRONTEND_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+
+# Patterns for every kind of call the scanner recognizes, one per registered
+# content extractor (see route_extractors). They are combined into a single
+# alternation so each file is scanned in one pass, and each alternative is
+# wrapped in a group named after its kind so hits can be tagged.
+SCAN_PATTERNS = {name: extractor.pattern for name, extractor in EXTRACTORS.items() if extractor.pattern is not None}
+
+# Which call kinds are extracted from files on each side
+BACKEND_KINDS = side_kinds('backend')
+FRONTEND_KINDS = side_kinds('frontend')
+
+# Kinds that record how backend files import, export and mount routers,
+# also extracted from backend files (see route_mounts)
+WIRING_KINDS = tuple(name for name, extractor in EXTRACTORS.items() if extractor.side in WIRING_SIDES)
+
+# Bump when extraction logic changes in a way the patterns do not capture,
+# so cached results from older versions are discarded
+EXTRACTOR_VERSION = 6
+
+# The receiver a backend match starts with, e.g. ordersRouter in ordersRouter.get(...)
+RECEIVER_PATTERN = re.compile(r'[\w$]*')
+
+# Below this many files the cost of starting worker processes outweighs the gain
+MIN_PARALLEL_FILES = 64
+
+EXTRACTION_ENGINES = ('regex', 'lexer')
+
+# Seconds a single file may take to extract before it is skipped
+DEFAULT_FILE_BUDGET = 10.0
+
+# How files are scanned: the extraction engine, the per-file time budget in
+# seconds (None for no limit), the names of the extractors to run (None for
+# every registered one), how files are read (see route_reader.ReadOptions),
+# whether the regex engine skips files and parts of files without any
+# literal its patterns require (see route_prefilter), and whether files with
+# identical contents are extracted only once (see route_dedup)
+ScanOptions = namedtuple(
+    'ScanOptions', ['engine', 'budget', 'extractors', 'read', 'prefilter', 'dedup'], defaults=(None, DEFAULT_READ_OPTIONS, True, True)
+)
+DEFAULT_SCAN_OPTIONS = ScanOptions('regex', DEFAULT_FILE_BUDGET)
+
+def default_jobs():
     """
-    Parse Express.js backend routes from JavaScript files in the given directory.
+    Return the number of CPUs available to this process.
+    
+    Returns:
+        int: The number of usable CPUs (at least 1)
+    """
+    try:
+        # Respects CPU affinity masks set by CI runners and containers
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+@lru_cache(maxsize=None)
+def compile_scanner(kinds):
+    """
+    Compile the combined pattern for a set of call kinds.
     
     Args:
-        directory (str): Path to the backend directory
-        
+        kinds (tuple): Extractor names; path extractors are left out
+    
     Returns:
-        set: A set of unique route strings in the format 'METHOD /path/to/route'
+        re.Pattern: A single case-insensitive alternation over all kinds
     """
-    routes = set()
+    kinds = [kind for kind in kinds if kind in SCAN_PATTERNS]
+    alternation = '|'.join(f'(?P<{kind}>{SCAN_PATTERNS[kind]})' for kind in kinds) or '(?!)'
     
-    # Regex pattern to match Express.js route definitions
-    # This pattern matches common Express route patterns like:
-    # app.get('/path', ...), router.post('/api/users', ...), etc.
-    # Captures the HTTP method and the route path
-    route_pattern = re.compile(
-        r'(?:app|router|\w+Router)\.(get|post|put|delete|patch)\s*\(\s*[\'"](.*?)[\'"](\s*,|\))',
-        re.IGNORECASE
-    )
+    # Case-insensitive matching disables the regex engine's fast prefix search,
+    # so every alternative would be tried at every offset. When each extractor
+    # declares the characters it starts with, a lookahead on those characters
+    # skips most offsets early.
+    leading = [EXTRACTORS[kind].first for kind in kinds]
+    if kinds and all(leading):
+        chars = sorted({c for first in leading for char in first for c in (char.lower(), char.upper())})
+        alternation = f'(?=[{re.escape("".join(chars))}])(?:{alternation})'
     
-    # Walk through all files in the directory recursively
-    for root, _, files in os.walk(directory):
-        for file in files:
-            # Only process JavaScript files
-            if file.endswith('.js'):
-                file_path = os.path.join(root, file)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                        # Find all route definitions in the file
-                        for match in route_pattern.finditer(content):
-                            method = match.group(1).upper()  # HTTP method (GET, POST, etc.)
-                            path = match.group(2)           # Route path (/api/users, etc.)
-                            
-                            # Add the route to the set in the format 'METHOD /path'
-                            routes.add(f'{method} {path}')
-                except Exception as e:
-                    print(f"Error reading file {file_path}: {e}")
+    return re.compile(alternation, re.IGNORECASE)
+
+@lru_cache(maxsize=None)
+def compile_prefilter(kinds):
+    """
+    Build the literal prefilter for a set of call kinds.
     
-    # Filter out any potential duplicates that might have different formatting
-    # This is a safeguard in case the regex captures the same route multiple times
-    unique_routes = set()
-    for route in routes:
-        # Normalize the route by removing extra spaces and standardizing format
-        parts = route.split(' ', 1)
-        if len(parts) == 2:
-            method, path = parts
-            unique_routes.add(f"{method} {path}")
+    Args:
+        kinds (tuple): Extractor names; path extractors are left out
     
-    return unique_routes
+    Returns:
+        Prefilter: Rejects text none of the kinds' patterns can match
+    """
+    return Prefilter(SCAN_PATTERNS[kind] for kind in kinds if kind in SCAN_PATTERNS)
 
-def parse_frontend_calls(directory):
+def _prefilter(kinds, options):
     """
-    Parse API calls from JavaScript/React files in the given directory.
+    The prefilter for the kinds a file is scanned for, or None when it is off.
+    Only the regex engine uses it: the lexer tokenizes a file from its start.
+    """
+    if options.prefilter and options.engine == 'regex':
+        return compile_prefilter(kinds)
+    return None
+
+@lru_cache(maxsize=None)
+def _hit_groups(kinds):
+    """
+    For each kind in the combined scanner, the names of its method and path
+    groups in pattern order.
+    """
+    names = sorted(compile_scanner(kinds).groupindex.items(), key=lambda item: item[1])
+    return {
+        kind: (
+            tuple(name for name, _ in names if name.startswith(f'{kind}_method')),
+            tuple(name for name, _ in names if name.startswith(f'{kind}_path')),
+        )
+        for kind in kinds if kind in SCAN_PATTERNS
+    }
+
+def active_kinds(kinds, options=DEFAULT_SCAN_OPTIONS):
+    """
+    Narrow call kinds to the extractors enabled in options.
     
     Args:
-        directory (str): Path to the frontend directory
-        
+        kinds (tuple): Extractor names
+        options (ScanOptions): Scan options; extractors=None enables all
+    
     Returns:
-        list: A list of dictionaries, each containing the HTTP method, route path, and file path
-              where the API call was found
+        tuple: The enabled kinds, in the order given
     """
-    api_calls = []
-    # Track unique calls to avoid duplicates
-    unique_calls = set()
+    if options.extractors is None:
+        return kinds
+    return tuple(kind for kind in kinds if kind in options.extractors)
+
+def parse_extractors(text):
+    """
+    Parse an --extractors value such as 'route,fetch,axios'.
     
-    # Regex patterns to match different API call patterns
+    Args:
+        text (str): Comma-separated extractor names
     
-    # Pattern for fetch API calls
-    # Examples: fetch('/api/users'), fetch("/api/products"), fetch(`/api/items/${id}`)
-    fetch_pattern = re.compile(
-        r'fetch\s*\(\s*[\'"\`]([^\'"\`]+)[\'"\`]',
-        re.IGNORECASE
-    )
+    Returns:
+        tuple: The names, in registry order
     
-    # Pattern for fetch with method specification
-    # Example: fetch('/api/users', { method: 'POST' })
-    fetch_method_pattern = re.compile(
-        r'fetch\s*\(\s*[\'"\`]([^\'"\`]+)[\'"\`]\s*,\s*\{[^\}]*method\s*:\s*[\'"](\w+)[\'"]',
-        re.IGNORECASE
-    )
+    Raises:
+        argparse.ArgumentTypeError: If a name is not a registered extractor
+    """
+    names = {name.strip() for name in text.split(',') if name.strip()}
+    unknown = sorted(names - set(EXTRACTORS))
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown extractor(s) {', '.join(unknown)}; choose from {', '.join(EXTRACTORS)}"
+        )
+    return tuple(name for name in EXTRACTORS if name in names)
+
+def make_cache(directory=DEFAULT_CACHE_DIR, use_hash=False, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Create an extraction cache tied to the current extraction patterns.
+    
+    Args:
+        directory (str): Cache directory
+        use_hash (bool): Compare content hashes when mtime/size differ
+        max_bytes (int): Size cap for LRU eviction
     
-    # Pattern for axios method calls
-    # Examples: axios.get('/api/users'), axios.post('/api/products')
-    axios_pattern = re.compile(
-        r'axios\.(get|post|put|delete|patch)\s*\(\s*[\'"\`]([^\'"\`]+)[\'"\`]',
-        re.IGNORECASE
+    Returns:
+        ExtractionCache: The cache instance
+    """
+    fingerprint = patterns_fingerprint(
+        [compile_scanner(tuple(SCAN_PATTERNS))],
+        salt=str(EXTRACTOR_VERSION)
     )
+    return ExtractionCache(directory, fingerprint, use_hash=use_hash, max_bytes=max_bytes)
+
+def extractor_fingerprint(options=DEFAULT_SCAN_OPTIONS):
+    """
+    Identify the extraction patterns and engine, so stored results from a
+    different extractor are never mixed with fresh ones.
+    
+    Args:
+        options (ScanOptions): Extraction engine and time budget
+    
+    Returns:
+        str: A hex digest
+    """
+    salt = f'{EXTRACTOR_VERSION}:{options.engine}:{",".join(active_kinds(tuple(EXTRACTORS), options))}'
+    if options.engine == 'lexer':
+        salt += f':{LEXER_VERSION}'
+    return patterns_fingerprint([compile_scanner(tuple(SCAN_PATTERNS))], salt=salt)
+
+def parse_shard(text):
+    """
+    Parse a --shard value such as '2/4'.
+    
+    Args:
+        text (str): 'INDEX/COUNT', with INDEX counted from 1
+    
+    Returns:
+        tuple: (index, count)
+    
+    Raises:
+        argparse.ArgumentTypeError: If the value is malformed or out of range
+    """
+    try:
+        index, count = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT such as 2/4, got '{text}'")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {count}, got '{text}'")
+    return index, count
+
+def in_shard(file_path, shard):
+    """
+    Decide which shard a file belongs to, by a hash of its walked path.
+    
+    The hash is CRC-32 rather than hash(), which is salted per process, so
+    every machine assigns every file to the same shard as long as they are
+    given the same --backend and --frontend paths.
+    
+    Args:
+        file_path (str): Path as produced by walk_sources
+        shard (tuple): (index, count), with index counted from 1
     
-    # Walk through all files in the directory recursively
-    for root, _, files in os.walk(directory):
-        for file in files:
-            # Only process JavaScript/JSX/TypeScript files
-            if file.endswith(('.js', '.jsx', '.ts', '.tsx')):
-                file_path = os.path.join(root, file)
+    Returns:
+        bool: True if the file belongs to the shard
+    """
+    index, count = shard
+    return zlib.crc32(file_path.replace(os.sep, '/').encode('utf-8')) % count == index - 1
+
+def _is_inside(path, directory):
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
+
+def top_level_roots(roots):
+    """
+    Pick the roots that are not nested inside another root.
+    
+    Args:
+        roots (list): (role, directory, extensions) tuples
+    
+    Returns:
+        list: (directory, absolute directory) tuples, in the order given
+    """
+    abs_dirs = {os.path.abspath(directory) for _, directory, _ in roots}
+    top_dirs = []
+    for _, directory, _ in roots:
+        abs_dir = os.path.abspath(directory)
+        if any(_is_inside(abs_dir, other) and abs_dir != other for other in abs_dirs):
+            continue
+        if abs_dir not in [d for _, d in top_dirs]:
+            top_dirs.append((directory, abs_dir))
+    return top_dirs
+
+def walk_sources(roots, path_filter=None):
+    """
+    Walk several source trees in a single pass.
+    
+    Trees that are nested inside (or equal to) another root are not walked
+    separately; their files are picked up during the outer walk and tagged
+    with every role whose root contains them. Directories are visited in the
+    same order as os.walk, so results are stable across runs.
+    
+    Args:
+        roots (list): (role, directory, extensions) tuples
+        path_filter (PathFilter): Optional filter that prunes directories and
+            skips files before they are read
+    
+    Returns:
+        list: (file_path, roles) tuples, where roles lists every role whose
+              directory contains the file and whose extensions match it
+    """
+    roles_by_dir = {}
+    for role, directory, extensions in roots:
+        roles_by_dir.setdefault(os.path.abspath(directory), []).append((role, extensions))
+    
+    sources = []
+    for directory, abs_dir in top_level_roots(roots):
+        scope = path_filter.root_scope(abs_dir) if path_filter is not None else None
+        # Depth-first, pre-order: a directory's files, then each subdirectory in turn
+        stack = [(directory, abs_dir, (), scope)]
+        while stack:
+            path, abs_path, active, scope = stack.pop()
+            active = active + tuple(roles_by_dir.get(abs_path, ()))
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            if path_filter is not None:
+                scope = path_filter.enter_dir(abs_path, [entry.name for entry in entries], scope)
+            abs_prefix = abs_path.rstrip(os.sep) + os.sep
+            
+            subdirs = []
+            for entry in entries:
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        
-                        # Find all fetch API calls with explicit method
-                        for match in fetch_method_pattern.finditer(content):
-                            path = match.group(1)
-                            method = match.group(2).upper()
-                            
-                            # Only include API calls (typically starting with /api)
-                            if is_api_path(path):
-                                # Create a unique key to avoid duplicates
-                                unique_key = f"{method}:{path}:{file_path}"
-                                if unique_key not in unique_calls:
-                                    unique_calls.add(unique_key)
-                                    api_calls.append({
-                                        'method': method,
-                                        'path': path,
-                                        'file': file_path
-                                    })
-                        
-                        # Find all fetch API calls (default method is GET)
-                        for match in fetch_pattern.finditer(content):
-                            path = match.group(1)
-                            
-                            # Only include API calls (typically starting with /api)
-                            if is_api_path(path):
-                                # Create a unique key to avoid duplicates
-                                unique_key = f"GET:{path}:{file_path}"
-                                # Check if this path was already found with an explicit method
-                                if unique_key not in unique_calls:
-                                    unique_calls.add(unique_key)
-                                    api_calls.append({
-                                        'method': 'GET',  # Default method for fetch is GET
-                                        'path': path,
-                                        'file': file_path
-                                    })
-                        
-                        # Find all axios method calls
-                        for match in axios_pattern.finditer(content):
-                            method = match.group(1).upper()
-                            path = match.group(2)
-                            
-                            # Only include API calls (typically starting with /api)
-                            if is_api_path(path):
-                                # Create a unique key to avoid duplicates
-                                unique_key = f"{method}:{path}:{file_path}"
-                                if unique_key not in unique_calls:
-                                    unique_calls.add(unique_key)
-                                    api_calls.append({
-                                        'method': method,
-                                        'path': path,
-                                        'file': file_path
-                                    })
-                except Exception as e:
-                    print(f"Error reading file {file_path}: {e}")
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Like os.walk, symlinked directories are not followed
+                    if entry.is_symlink():
+                        continue
+                    if path_filter is not None and path_filter.skip_dir(entry.name, abs_prefix + entry.name, scope):
+                        continue
+                    subdirs.append(entry)
+                    continue
+                roles = tuple(role for role, extensions in active if entry.name.endswith(extensions))
+                if not roles:
+                    continue
+                if path_filter is not None and path_filter.skip_file(abs_prefix + entry.name, scope, entry.stat):
+                    continue
+                sources.append((entry.path, roles))
+            
+            for entry in reversed(subdirs):
+                stack.append((entry.path, abs_prefix + entry.name, active, scope))
+    return sources
+
+def scan_file(file_path, kinds, options=DEFAULT_SCAN_OPTIONS):
+    """
+    Extract every call of the given kinds from a single file in one pass.
     
-    return api_calls
+    Path extractors run first. A file one of them claims is not read for the
+    other extractors of the same side, so such files are only read when they
+    are also scanned for the other side.
+    
+    Args:
+        file_path (str): Path to the source file
+        kinds (tuple): Extractor names to look for
+        options (ScanOptions): Extraction engine, time budget and extractors
+    
+    Returns:
+        list: (kind, method, path, line, column, receiver) tuples as from
+              scan_text, path extractor routes first and then in the order
+              they appear in the file (line and column are 0 and the receiver
+              '' for routes from the path)
+    """
+    records, kinds = path_records(file_path, active_kinds(kinds, options))
+    if not kinds:
+        return records
+    source = read_source(file_path, options.read)
+    prefilter = _prefilter(kinds, options)
+    if prefilter is not None and not prefilter.search(source.data or source.text()):
+        source.close()
+        return records
+    return records + scan_text(source.text(), kinds, options)
+
+def path_records(file_path, kinds):
+    """
+    Run the path extractors among kinds on a file path.
+    
+    Args:
+        file_path (str): Path to the source file
+        kinds (tuple): Extractor names
+    
+    Returns:
+        tuple: (records, content kinds) where content kinds are the pattern
+               extractors still to run on the file's contents
+    """
+    records = []
+    for kind in kinds:
+        extractor = EXTRACTORS[kind]
+        if extractor.route_for_path is not None:
+            path = extractor.route_for_path(file_path)
+            if path is not None:
+                records.append((kind, extractor.default_method, path, 0, 0, ''))
+    claimed = {EXTRACTORS[record[0]].side for record in records}
+    if 'backend' in claimed:
+        # Routes from the path are not defined on a router, so the file's wiring does not matter
+        claimed.update(WIRING_SIDES)
+    return records, tuple(kind for kind in kinds if kind in SCAN_PATTERNS and EXTRACTORS[kind].side not in claimed)
+
+def _window_matches(scanner, content, windows):
+    """
+    Yield the matches of a scanner that start inside the (start, end) windows
+    of content.
+    
+    A window only bounds where a match starts. Each match found in it is
+    matched again against the whole content, so a long optional tail, e.g. a
+    fetch options object whose method comes kilobytes later, is never cut
+    off at the window's end.
+    """
+    pos = 0
+    for start, end in windows:
+        pos = max(pos, start)
+        while pos < end:
+            found = scanner.search(content, pos, end)
+            if found is None:
+                break
+            match = scanner.match(content, found.start())
+            if match is None:
+                # Only matched because the window cut the text short
+                pos = found.start() + 1
+                continue
+            yield match
+            pos = max(match.end(), match.start() + 1)
+
+def _regex_hits(content, kinds, deadline, budget, windows=None):
+    """
+    Yield (kind, method, path, offset) for each match of the combined pattern,
+    within the (start, end) windows of content if given.
+    
+    The method is None when the call does not name one, and the path is ''
+    for a pattern without path groups. The deadline is
+    checked between matches; a single match attempt cannot be interrupted,
+    which is what the lexer engine is for.
+    """
+    groups = _hit_groups(kinds)
+    scanner = compile_scanner(kinds)
+    matches = scanner.finditer(content) if windows is None else _window_matches(scanner, content, windows)
+    for match in matches:
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeBudgetExceeded(f'extraction exceeded the {budget:g}s time budget')
+        # The outer kind group closes last, so lastgroup names the kind that matched
+        kind = match.lastgroup
+        method_groups, path_groups = groups[kind]
+        method = next((value for value in map(match.group, method_groups) if value is not None), None)
+        path = next((value for value in map(match.group, path_groups) if value is not None), '')
+        offset = match.start()
+        if content[offset] == '.':
+            # Matched from the dot of a member call; report where the receiver starts
+            while offset > 0 and (content[offset - 1].isalnum() or content[offset - 1] in '_$'):
+                offset -= 1
+        yield kind, method, path, offset
 
-def is_api_path(path):
+def scan_text(content, kinds, options=DEFAULT_SCAN_OPTIONS, windows=None):
     """
-    Check if a path is likely an API endpoint.
+    Extract every call of the given kinds from source text in one pass.
+    
+    Frontend hits are filtered with is_api_path and de-duplicated per file on
+    (method, path). Because a fetch with an options object is matched as one
+    hit, it is recorded once with its explicit method rather than also as a
+    default GET.
+    
+    Backend routes record the receiver they are defined on, e.g. 'app' for
+    app.get(...). Wiring records (see WIRING_KINDS) keep the names they
+    match as written, in the method, path and receiver fields described in
+    route_extractors; frontend calls have no receiver.
+    
+    Unless options.prefilter is off, the regex engine only scans the windows
+    of the text around the literals its patterns require (see
+    route_prefilter.Prefilter.windows).
     
     Args:
-        path (str): The path to check
+        content (str): Source text
+        kinds (tuple): Extractor names to look for; path extractors are
+                       skipped, as there is no file path
+        options (ScanOptions): Extraction engine, time budget and extractors
+        windows (list): (start, end) windows already computed for content
+                        by the prefilter of the same kinds
+    
+    Returns:
+        list: (kind, method, path, line, column, receiver) tuples in the
+              order they appear in the text, with 1-based line and column
+    
+    Raises:
+        TimeBudgetExceeded: If the text takes longer than options.budget
+    """
+    kinds = tuple(kind for kind in active_kinds(kinds, options) if kind in SCAN_PATTERNS)
+    deadline = time.perf_counter() + options.budget if options.budget else None
+    if options.engine == 'lexer':
+        hits = lexer_hits(content, kinds, deadline, options.budget)
+    else:
+        prefilter = _prefilter(kinds, options)
+        if windows is None and prefilter is not None:
+            windows = prefilter.windows(content)
+        hits = _regex_hits(content, kinds, deadline, options.budget, windows if prefilter is not None else None)
+    
+    records = []
+    # Track unique calls to avoid duplicates within the file
+    unique_calls = set()
+    # Hits come in source order, so line numbers are counted incrementally
+    line = 1
+    line_start = 0
+    counted = 0
+    
+    for kind, method, path, offset in hits:
+        newlines = content.count('\n', counted, offset)
+        if newlines:
+            line += newlines
+            line_start = content.rfind('\n', counted, offset) + 1
+        counted = offset
+        column = offset - line_start + 1
+        
+        extractor = EXTRACTORS[kind]
+        if extractor.expand is not None:
+            for name, value, receiver in extractor.expand(method, path):
+                records.append((kind, name, value, line, column, receiver))
+            continue
+        if extractor.side in WIRING_SIDES:
+            records.append((kind, method, path, line, column, RECEIVER_PATTERN.match(content, offset).group()))
+            continue
         
+        # Calls without an explicit method use their extractor's default, e.g. GET for fetch
+        method = method or extractor.default_method
+        if method is None:
+            continue
+        method = method.upper()
+        method = METHOD_ALIASES.get(method, method)
+        
+        if extractor.side == 'backend':
+            # Backend routes are collected into a set, so no per-file dedup is needed
+            records.append((kind, method, path, line, column, RECEIVER_PATTERN.match(content, offset).group()))
+            continue
+        
+        # Only include API calls (typically starting with /api)
+        if is_api_path(path) and (method, path) not in unique_calls:
+            unique_calls.add((method, path))
+            records.append((kind, method, path, line, column, ''))
+    
+    return records
+
+def _window_bytes(content, windows):
+    """
+    Count the bytes of a file that its prefilter windows scan.
+    
+    Windows are character offsets, so outside of ASCII their text is
+    encoded again to be counted in the same unit as the file's size.
+    """
+    if content.isascii():
+        return sum(end - start for start, end in windows)
+    return sum(len(content[start:end].encode('utf-8')) for start, end in windows)
+
+def _extract_chunk(targets, timed=False, options=DEFAULT_SCAN_OPTIONS):
+    """
+    Scan a chunk of files, in this process or inside a worker process.
+    
+    The files of the chunk are read ahead with read_sources, so scanning one
+    file overlaps with reading the next. Files whose contents no extractor
+    needs, e.g. Next.js API routes claimed by their path, are not read. With
+    the regex engine, files whose raw bytes hold none of the literals the
+    patterns require are not decoded or scanned, and the others are only
+    scanned around those literals (see route_prefilter).
+    
+    Errors are returned as strings rather than raised so that one unreadable
+    file does not abort the chunk, and so the parent can report them in order.
+    
+    Args:
+        targets (list): (file_path, kinds) tuples to scan
+        timed (bool): Measure each file for --stats
+        options (ScanOptions): Extraction engine, time budget and reading
+    
+    Returns:
+        list: (records, error, timing) tuples, one per target; timing is None
+              unless timed is set, and otherwise (seconds spent waiting for
+              the file's contents, scan seconds, bytes, bytes the prefilter
+              kept from being scanned)
+    """
+    planned = []
+    for file_path, kinds in targets:
+        records, kinds = path_records(file_path, active_kinds(kinds, options))
+        planned.append((records, kinds))
+    sources = read_sources([file_path for (file_path, _), (_, kinds) in zip(targets, planned) if kinds], options.read)
+    
+    results = []
+    for records, kinds in planned:
+        start = time.perf_counter()
+        if not kinds:
+            results.append((records, None, (0.0, time.perf_counter() - start, 0, 0) if timed else None))
+            continue
+        _, source, error = next(sources)
+        read_done = time.perf_counter()
+        if error is not None:
+            results.append((None, error, None))
+            continue
+        prefilter = _prefilter(kinds, options)
+        skipped = 0
+        try:
+            if prefilter is not None and not prefilter.search(source.data or source.text()):
+                skipped = source.size
+            else:
+                content = source.text()
+                windows = prefilter.windows(content) if prefilter is not None else None
+                records += scan_text(content, kinds, options, windows)
+                if windows is not None:
+                    skipped = source.size - _window_bytes(content, windows)
+        except Exception as e:
+            results.append((None, str(e), None))
+            continue
+        finally:
+            # Unmaps a file that failed to decode or was rejected before decoding
+            source.close()
+        timing = (read_done - start, time.perf_counter() - read_done, source.size, skipped)
+        results.append((records, None, timing if timed else None))
+    return results
+
+def duplicate_targets(targets, options=DEFAULT_SCAN_OPTIONS):
+    """
+    Find the targets whose records are those of an earlier target, because
+    their contents are byte-identical and are scanned for the same kinds.
+    
+    Files with records taken from their path, e.g. Next.js API routes, are
+    never treated as copies, as their records differ with the path.
+    
+    Args:
+        targets (list): (file_path, kinds) tuples to scan
+        options (ScanOptions): Extraction engine and extractors
+    
+    Returns:
+        dict: Maps each duplicate path to the first path with the same contents
+    """
+    by_kinds = {}
+    for file_path, kinds in targets:
+        records, content_kinds = path_records(file_path, active_kinds(kinds, options))
+        if not records and content_kinds:
+            by_kinds.setdefault(content_kinds, []).append(file_path)
+    duplicates = {}
+    for file_paths in by_kinds.values():
+        if len(file_paths) > 1:
+            duplicates.update(find_duplicates(file_paths))
+    return duplicates
+
+def _extract_files(targets, jobs, stats=NULL_STATS, options=DEFAULT_SCAN_OPTIONS):
+    """
+    Yield (file_path, records, error) for each target, in order.
+    
+    Unless options.dedup is off, each distinct file content is extracted
+    once: copies of a file get the very records list of the first copy, so
+    they cost neither a scan nor memory of their own.
+    """
+    duplicates = duplicate_targets(targets, options) if options.dedup and len(targets) > 1 else {}
+    if not duplicates:
+        yield from _extract_unique(targets, jobs, stats, options)
+        return
+    
+    originals = set(duplicates.values())
+    shared = {}  # first copy -> (records, error)
+    results = _extract_unique([target for target in targets if target[0] not in duplicates], jobs, stats, options)
+    for file_path, _ in targets:
+        if file_path in duplicates:
+            records, error = shared[duplicates[file_path]]
+            stats.add_duplicate(file_path, records)
+            yield file_path, records, error
+            continue
+        file_path, records, error = next(results)
+        if file_path in originals:
+            shared[file_path] = (records, error)
+        yield file_path, records, error
+
+def _extract_unique(targets, jobs, stats=NULL_STATS, options=DEFAULT_SCAN_OPTIONS):
+    timed = stats.enabled
+    if jobs <= 1 or len(targets) < MIN_PARALLEL_FILES:
+        for (file_path, _), (records, error, timing) in zip(targets, _extract_chunk(targets, timed, options)):
+            stats.add_file(file_path, records, timing)
+            yield file_path, records, error
+        return
+    
+    # Aim for a few chunks per worker so stragglers do not leave cores idle
+    chunk_size = max(1, min(256, len(targets) // (jobs * 4)))
+    chunks = [targets[i:i + chunk_size] for i in range(0, len(targets), chunk_size)]
+    
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # pool.map returns results in submission order, which gives the deterministic merge
+        for chunk, results in zip(chunks, pool.map(_extract_chunk, chunks, repeat(timed), repeat(options))):
+            for (file_path, _), (records, error, timing) in zip(chunk, results):
+                stats.add_file(file_path, records, timing)
+                yield file_path, records, error
+
+def _cache_kind(kinds, options):
+    """
+    Cache key for a file's enabled kinds; the lexer's results are cached separately.
+    """
+    kind = ','.join(active_kinds(kinds, options))
+    if options.engine == 'lexer':
+        kind += f'@lexer{LEXER_VERSION}'
+    return kind
+
+def run_extraction(targets, jobs=1, cache=None, stats=NULL_STATS, options=DEFAULT_SCAN_OPTIONS):
+    """
+    Scan many files, optionally in a process pool.
+    
+    Files are split into chunks so each worker round trip carries enough work
+    to amortize pickling. Results are yielded in the order of targets
+    regardless of which worker finished first, so the output is identical to
+    the serial path.
+    
+    Args:
+        targets (list): (file_path, kinds) tuples to scan
+        jobs (int): Number of worker processes (1 runs in this process)
+        cache (ExtractionCache): Optional cache consulted before extracting
+        stats (RunStats): Optional per-file instrumentation
+        options (ScanOptions): Extraction engine and time budget
+    
+    Yields:
+        tuple: (file_path, records, error) where error is None on success
+    """
+    if cache is None:
+        yield from _extract_files(targets, jobs, stats, options)
+        return
+    
+    results = {}
+    fingerprints = {}
+    misses = []
+    for file_path, kinds in targets:
+        try:
+            records, fingerprint = cache.lookup(_cache_kind(kinds, options), file_path)
+        except OSError as e:
+            results[file_path] = (None, str(e))
+            continue
+        if records is None:
+            fingerprints[file_path] = fingerprint
+            misses.append((file_path, kinds))
+        else:
+            results[file_path] = (records, None)
+            stats.add_file(file_path, records, None)
+    
+    # Only files that changed since the last run are read and scanned
+    kinds_by_file = dict(misses)
+    for file_path, records, error in _extract_files(misses, jobs, stats, options):
+        if error is None:
+            cache.store(_cache_kind(kinds_by_file[file_path], options), file_path, fingerprints[file_path], records)
+        results[file_path] = (records, error)
+    
+    for file_path, _ in targets:
+        records, error = results[file_path]
+        yield file_path, records, error
+
+def source_roots(backend_dir, frontend_dir):
+    """
+    Build the walk_sources roots for a backend and a frontend directory.
+    
+    Args:
+        backend_dir (str): Path to the backend directory (None to skip)
+        frontend_dir (str): Path to the frontend directory (None to skip)
+    
+    Returns:
+        list: (role, directory, extensions) tuples
+    """
+    roots = []
+    if backend_dir is not None:
+        roots.append(('backend', backend_dir, BACKEND_EXTENSIONS))
+    if frontend_dir is not None:
+        roots.append(('frontend', frontend_dir, FRONTEND_EXTENSIONS))
+    return roots
+
+def roles_for_path(file_path, roots):
+    """
+    Work out which roles a single file belongs to, without walking.
+    
+    Args:
+        file_path (str): Path to the file
+        roots (list): (role, directory, extensions) tuples
+    
+    Returns:
+        tuple: Roles whose directory contains the file and whose extensions match it
+    """
+    abs_path = os.path.abspath(file_path)
+    return tuple(
+        role for role, directory, extensions in roots
+        if file_path.endswith(extensions) and _is_inside(abs_path, os.path.abspath(directory))
+    )
+
+def kinds_for_roles(roles):
+    """
+    Map file roles to the call kinds scanned for.
+    
+    Args:
+        roles (tuple): Roles from walk_sources or roles_for_path
+    
     Returns:
-        bool: True if the path is likely an API endpoint, False otherwise
+        tuple: Extractor names
+    """
+    kinds = ()
+    if 'backend' in roles:
+        kinds += BACKEND_KINDS + WIRING_KINDS
+    if 'frontend' in roles:
+        kinds += FRONTEND_KINDS
+    return kinds
+
+def parse_sources(backend_dir, frontend_dir, jobs=1, cache=None, options=DEFAULT_SCAN_OPTIONS, path_filter=None):
     """
-    # Remove template literals (${var}) for the check
-    clean_path = re.sub(r'\${[^}]*}', '', path)
+    Parse backend routes and frontend API calls with a single walk and a
+    single scan of each file. Backend routes are prefixed with the mounts of
+    the routers they are defined on (see route_mounts).
     
-    # Common API path patterns
-    api_patterns = [
-        # Standard API paths
-        r'^/api',
-        r'/api/',
-        # Auth endpoints are often API calls
-        r'^/auth',
-        r'/auth/',
-        # GraphQL endpoints
-        r'^/graphql',
-        # REST-like endpoints
-        r'^/v\d+/',  # Version prefixes like /v1/, /v2/
+    Args:
+        backend_dir (str): Path to the backend directory (None to skip)
+        frontend_dir (str): Path to the frontend directory (None to skip)
+        jobs (int): Number of worker processes used for extraction
+        cache (ExtractionCache): Optional cache of per-file results
+        options (ScanOptions): Extraction engine and time budget
+        path_filter (PathFilter): Optional walk-time filter
+    
+    Returns:
+        tuple: (backend_routes, frontend_calls) as returned by
+               parse_backend_routes and parse_frontend_calls
+    """
+    targets = [
+        (file_path, kinds_for_roles(roles))
+        for file_path, roles in walk_sources(source_roots(backend_dir, frontend_dir), path_filter)
     ]
     
-    # Check if the path matches any of the API patterns
-    for pattern in api_patterns:
-        if re.search(pattern, clean_path):
-            return True
+    route_records = {}  # file path -> [(method, path, line, column, receiver)]
+    wirings = {}
+    api_calls = CallTable()
+    for file_path, records, error in run_extraction(targets, jobs, cache, options=options):
+        if error is not None:
+            print(f"Error reading file {file_path}: {error}")
+            continue
+        for kind, method, path, line, column, receiver in records:
+            if kind in BACKEND_KINDS:
+                route_records.setdefault(file_path, []).append((method, path, line, column, receiver))
+            elif kind in FRONTEND_KINDS:
+                api_calls.add(method, path, file_path, line, column)
+        wiring = module_wiring(records)
+        if wiring is not None:
+            wirings[file_path] = wiring
     
-    # Check if the path looks like a relative API path (no leading slash)
-    if clean_path.startswith('api/') or clean_path.startswith('auth/'):
-        return True
+    mounts = MountGraph(wirings)
+    # Add each route to the set in the format 'METHOD /path'
+    routes = {
+        f'{method} {path}'
+        for file_path, file_routes in route_records.items()
+        for method, path, _, _ in mounts.resolve(file_path, file_routes)
+    }
+    return routes, api_calls
+
+def parse_backend_routes(directory, jobs=1, cache=None):
+    """
+    Parse Express.js backend routes from JavaScript files in the given directory.
+    
+    Args:
+        directory (str): Path to the backend directory
+        jobs (int): Number of worker processes used for extraction
+        cache (ExtractionCache): Optional cache of per-file results
     
-    # Exclude absolute URLs to external services
-    if clean_path.startswith('http://') or clean_path.startswith('https://'):
-        return False
+    Returns:
+        set: A set of unique route strings in the format 'METHOD /path/to/route'
+    """
+    routes, _ = parse_sources(directory, None, jobs, cache)
+    return routes
+
+def parse_frontend_calls(directory, jobs=1, cache=None):
+    """
+    Parse API calls from JavaScript/React files in the given directory.
+    
+    Args:
+        directory (str): Path to the frontend directory
+        jobs (int): Number of worker processes used for extraction
+        cache (ExtractionCache): Optional cache of per-file results
+    
+    Returns:
+        CallTable: The API calls in scan order. Each call reads like a dictionary
+                   with the HTTP method, route path, file path, line and column
+    """
+    _, api_calls = parse_sources(None, directory, jobs, cache)
+    return api_calls
+
+def frontend_route_key(method, path):
+    """
+    Build the display key for a frontend call.
+    
+    Args:
+        method (str): HTTP method of the call
+        path (str): Call path, possibly containing ${...} expressions
+    
+    Returns:
+        str: 'METHOD /path' with the path in canonical form (see
+             route_paths.canonical_path), the same key a backend route
+             with that path has
+    """
+    return f'{method} {canonical_path(path)}'
+
+def resolve_frontend_routes(route_index, frontend_calls):
+    """
+    Resolve each distinct frontend route against the backend route index.
+    
+    Only distinct (method, path) pairs are visited, so the work and the
+    returned dictionaries grow with the number of unique routes, not calls.
+    
+    Args:
+        route_index (RouteIndex): Compiled index of backend routes
+        frontend_calls (CallTable): Frontend API calls; a list of call
+                                    dictionaries is converted first
     
-    return False
+    Returns:
+        tuple: (matches, frontend_route_to_call)
+            - matches: Dictionary mapping each frontend route key to the backend
+              route it resolved to, or None when nothing matched
+            - frontend_route_to_call: Dictionary mapping each frontend route key
+              to the last call that produced it
+    """
+    if not isinstance(frontend_calls, CallTable):
+        frontend_calls = CallTable.from_calls(frontend_calls)
+    matches = {}
+    last_rows = {}
+    for method, path, row in frontend_calls.unique_routes():
+        route_key = frontend_route_key(method, path)
+        if route_key not in matches:
+            matches[route_key] = route_index.match(method, path)
+        last_rows[route_key] = max(row, last_rows.get(route_key, row))
+    frontend_route_to_call = {route_key: frontend_calls[row] for route_key, row in last_rows.items()}
+    return matches, frontend_route_to_call
 
-def find_route_mismatches(backend_routes, frontend_calls):
+def find_route_mismatches(backend_routes, frontend_calls, route_index=None):
     """
     Find mismatches between backend routes and frontend API calls.
     
     Args:
         backend_routes (set): Set of backend routes in the format 'METHOD /path'
-        frontend_calls (list): List of dictionaries with frontend API calls
-        
+        frontend_calls (CallTable): Frontend API calls, or a list of call dictionaries
+        route_index (RouteIndex): Prebuilt index of backend_routes (built if omitted)
+    
     Returns:
         tuple: (unused_routes, undefined_routes, suggestions)
             - unused_routes: Backend routes not used in the frontend
             - undefined_routes: Frontend API calls with no matching backend route
             - suggestions: Dictionary mapping undefined routes to suggested fixes
     """
-    # Extract method and path from frontend calls
-    frontend_routes = set()
-    frontend_route_to_call = {}
-    for call in frontend_calls:
-        # Normalize the path by removing template literals
-        path = re.sub(r'\${[^}]*}', ':param', call['path'])
-        route_key = f"{call['method']} {path}"
-        frontend_routes.add(route_key)
-        frontend_route_to_call[route_key] = call
+    if route_index is None:
+        route_index = RouteIndex(backend_routes)
     
-    # Find routes defined in backend but not used in frontend
-    unused_routes = backend_routes - frontend_routes
+    # Resolve frontend calls against the backend routes, params included
+    matches, frontend_route_to_call = resolve_frontend_routes(route_index, frontend_calls)
+    
+    # Find routes defined in backend but not matched by any frontend call
+    matched_routes = {route for route in matches.values() if route is not None}
+    unused_routes = backend_routes - matched_routes
     
     # Find routes used in frontend but not defined in backend
-    undefined_routes = frontend_routes - backend_routes
+    undefined_routes = {route_key for route_key, route in matches.items() if route is None}
     
     return unused_routes, undefined_routes, frontend_route_to_call
 
-def main():
-    parser = argparse.ArgumentParser(description='Route Linter - Analyze backend and frontend routes')
-    parser.add_argument('--backend', required=True, help='Path to the backend directory')
-    parser.add_argument('--frontend', required=True, help='Path to the frontend directory')
-    parser.add_argument('--suggest', action='store_true', help='Suggest fixes for undefined routes using fuzzy matching')
-    parser.add_argument('--threshold', type=int, default=70, help='Minimum similarity score for suggestions (0-100)')
+def count_traffic(access_logs, routes, stats=NULL_STATS):
+    """
+    Count the requests in access logs per backend route.
+    
+    Args:
+        access_logs (AccessLogs): Logs to read, or None
+        routes (iterable): Backend route strings
+        stats (RunStats): Optional instrumentation
+    
+    Returns:
+        TrafficCounts: The requests counted, or None without access logs
+    """
+    if access_logs is None:
+        return None
+    with stats.stage('traffic'):
+        return access_logs.count(routes)
+
+def _traffic_errors(traffic):
+    # Logs that could not be read, as error events marked with 'access_log'
+    for file_path, message in traffic.errors if traffic is not None else ():
+        yield {'type': 'error', 'file': file_path, 'message': message, 'access_log': True}
+
+def _error_text(event):
+    return f"Error reading {'log' if event.get('access_log') else 'file'} {event['file']}: {event['message']}"
+
+def _unused_event(route, file_path, site, traffic):
+    line, column = site
+    event = {'type': 'unused', 'route': route, 'file': file_path, 'line': line, 'column': column}
+    if traffic is not None:
+        # Requests the route served in the access logs; 0 means truly dead
+        event['requests'] = traffic.hits[route]
+    return event
+
+def _add_traffic(summary, unused_routes, traffic):
+    if traffic is not None:
+        summary['live_routes'] = sum(1 for route in unused_routes if traffic.hits[route])
+        summary['access_log'] = traffic.as_dict()
+    return summary
+
+def _timed(items, stats, stage):
+    """
+    Iterate over items, timing only the work of producing each one.
     
-    args = parser.parse_args()
+    Streaming loops yield to their consumer between items, so a stage
+    around the whole loop would also time the consumer.
     
-    print(f"Backend path: {args.backend}")
-    print(f"Frontend path: {args.frontend}")
+    Args:
+        items (iterable): Items to produce, e.g. run_extraction results
+        stats (RunStats): Instrumentation to record the time in
+        stage (str): Stage the time counts towards
     
-    # Parse backend routes
-    backend_routes = parse_backend_routes(args.backend)
+    Yields:
+        The items, in order
+    """
+    items = iter(items)
+    done = object()
+    while True:
+        with stats.stage(stage):
+            item = next(items, done)
+        if item is done:
+            return
+        yield item
+
+def iter_lint_events(backend_dir, frontend_dir, jobs=1, cache=None, inventory=True, suggestion_threshold=None, stats=NULL_STATS,
+                     options=DEFAULT_SCAN_OPTIONS, path_filter=None, access_logs=None):
+    """
+    Lint as a stream of events, yielding each finding as soon as it is known.
     
-    print(f"\nFound {len(backend_routes)} unique API routes in backend:")
-    for route in sorted(backend_routes):
-        print(f"  {route}")
+    Backend files are scanned first so the route index exists before any
+    frontend file is read; their routes are yielded once all of them have
+    been scanned, as mounts in one file prefix routes in another. Each
+    frontend file's calls are then resolved and
+    its undefined calls yielded right away, without holding the call list in
+    memory. Unused routes are only known once every frontend file has been
+    seen, so they come last, followed by a summary.
     
-    # Parse frontend API calls
-    frontend_calls = parse_frontend_calls(args.frontend)
+    Args:
+        backend_dir (str): Path to the backend directory
+        frontend_dir (str): Path to the frontend directory
+        jobs (int): Number of worker processes used for extraction
+        cache (ExtractionCache): Optional cache of per-file results
+        inventory (bool): Also yield every discovered route and call
+        suggestion_threshold (int): Attach a fuzzy suggestion to undefined
+            calls, flagged as accepted when it meets this score (None to skip)
+        stats (RunStats): Optional instrumentation. Extraction is timed
+            file by file, so the consumer's time between events is left out
+        options (ScanOptions): Extraction engine and time budget
+        path_filter (PathFilter): Optional walk-time filter
+        access_logs (AccessLogs): Access logs to count requests from; each
+            unused route then carries the 'requests' it served
+    
+    Yields:
+        dict: Events with a 'type' of 'route', 'call', 'undefined', 'unused',
+              'error' or 'summary'
+    """
+    with stats.stage('walk'):
+        targets = [
+            (file_path, kinds_for_roles(roles))
+            for file_path, roles in walk_sources(source_roots(backend_dir, frontend_dir), path_filter)
+        ]
+    stats.add_skipped(path_filter.skipped if path_filter is not None else None)
+    backend_targets = [target for target in targets if target[1] != FRONTEND_KINDS]
+    frontend_targets = [target for target in targets if target[1] == FRONTEND_KINDS]
     
-    print(f"\nFound {len(frontend_calls)} API calls in frontend:")
-    for call in frontend_calls:
-        print(f"  {call['method']} {call['path']} (in {os.path.relpath(call['file'], args.frontend)})")
+    # Files in both trees are scanned once, with the backend, and their calls held back
+    held_calls = []
+    route_records = {}  # file path -> [(method, path, line, column, receiver)]
+    wirings = {}
+    for file_path, records, error in _timed(run_extraction(backend_targets, jobs, cache, stats, options), stats, 'extract'):
+        if error is not None:
+            yield {'type': 'error', 'file': file_path, 'message': error}
+            continue
+        if any(record[0] in FRONTEND_KINDS for record in records):
+            held_calls.append((file_path, records))
+        routes = [record[1:] for record in records if record[0] in BACKEND_KINDS]
+        if routes:
+            route_records[file_path] = routes
+        wiring = module_wiring(records)
+        if wiring is not None:
+            wirings[file_path] = wiring
     
-    # Find mismatches between backend routes and frontend API calls
-    unused_routes, undefined_routes, frontend_route_to_call = find_route_mismatches(backend_routes, frontend_calls)
+    with stats.stage('resolve'):
+        mounts = MountGraph(wirings)
+        resolved = [(file_path, mounts.resolve(file_path, routes)) for file_path, routes in route_records.items()]
+    route_files = {}
+    route_sites = {}  # route -> (line, column) of its first definition
+    for file_path, routes in resolved:
+        for method, path, line, column in routes:
+            route = f'{method} {path}'
+            if route not in route_files:
+                route_files[route] = file_path
+                route_sites[route] = (line, column)
+                if inventory:
+                    yield {
+                        'type': 'route', 'route': route, 'method': method, 'path': path, 'file': file_path,
+                        'line': line, 'column': column,
+                    }
+    
+    with stats.stage('resolve'):
+        route_index = RouteIndex(route_files)
+    traffic = count_traffic(access_logs, route_files, stats)
+    yield from _traffic_errors(traffic)
+    suggestion_index = None
+    if suggestion_threshold is not None:
+        with stats.stage('suggest'):
+            suggestion_index = SuggestionIndex(route_files)
+    hits = set()
+    call_count = 0
+    undefined_count = 0
+    
+    def frontend_results():
+        yield from ((file_path, records, None) for file_path, records in held_calls)
+        yield from _timed(run_extraction(frontend_targets, jobs, cache, stats, options), stats, 'extract')
+    
+    for file_path, records, error in frontend_results():
+        if error is not None:
+            yield {'type': 'error', 'file': file_path, 'message': error}
+            continue
+        for kind, method, path, line, column, _ in records:
+            if kind not in FRONTEND_KINDS:
+                continue
+            call_count += 1
+            if inventory:
+                yield {'type': 'call', 'method': method, 'path': path, 'file': file_path, 'line': line, 'column': column}
+            route = route_index.match(method, path)
+            if route is not None:
+                hits.add(route)
+                continue
+            
+            undefined_count += 1
+            event = {
+                'type': 'undefined', 'route': frontend_route_key(method, path), 'method': method, 'path': path,
+                'file': file_path, 'line': line, 'column': column,
+            }
+            if suggestion_index is not None:
+                closest_match, score = suggestion_index.best(event['route'])
+                if closest_match is not None:
+                    event['suggestion'] = {'route': closest_match, 'score': score, 'accepted': score >= suggestion_threshold}
+            yield event
+    
+    unused_routes = sorted(route for route in route_files if route not in hits)
+    for route in unused_routes:
+        yield _unused_event(route, route_files[route], route_sites[route], traffic)
+    
+    yield _add_traffic({
+        'type': 'summary',
+        'backend_routes': len(route_files),
+        'frontend_calls': call_count,
+        'unused_routes': len(unused_routes),
+        'undefined_calls': undefined_count,
+    }, unused_routes, traffic)
+
+def read_manifest(file_path):
+    """
+    Read a list of frontend directories, one per line.
+    
+    Blank lines and lines starting with '#' are skipped. Relative paths are
+    taken relative to the manifest's own directory.
+    
+    Args:
+        file_path (str): Path to the manifest
+    
+    Returns:
+        list: Frontend directory paths
+    """
+    base = os.path.dirname(file_path)
+    directories = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                directories.append(os.path.normpath(os.path.join(base, line)))
+    return directories
+
+def iter_client_events(backend, frontend_dirs, jobs=1, cache=None, inventory=True, suggestion_threshold=None, stats=NULL_STATS,
+                       options=DEFAULT_SCAN_OPTIONS, path_filter=None, access_logs=None):
+    """
+    Lint several frontends against one backend as a stream of events.
+    
+    The backend's route index and suggestion index are built once and shared.
+    The files of every frontend go through one extraction run, so they are
+    scanned concurrently by the worker pool. Calls and undefined calls carry
+    the frontend they belong to as 'client'; a file inside several frontend
+    directories counts for each of them. Unused routes are those no frontend
+    calls at all.
+    
+    Args:
+        backend (RouteLinter): Linter holding the backend routes
+        frontend_dirs (list): Paths to the frontend directories
+        jobs (int): Number of worker processes used for extraction
+        cache (ExtractionCache): Optional cache of per-file results
+        inventory (bool): Also yield every discovered route and call
+        suggestion_threshold (int): Attach a fuzzy suggestion to undefined
+            calls, flagged as accepted when it meets this score (None to skip)
+        stats (RunStats): Optional instrumentation
+        options (ScanOptions): Extraction engine and time budget
+        path_filter (PathFilter): Optional walk-time filter
+        access_logs (AccessLogs): Access logs to count requests from
+    
+    Yields:
+        dict: Events as from iter_lint_events; the summary also holds a
+              'clients' list with the counts for each frontend
+    """
+    route_files = {}
+    route_sites = {}  # route -> (line, column) of its first definition
+    for method, path, file_path, line, column in backend.route_definitions():
+        route = f'{method} {path}'
+        if route not in route_files:
+            route_files[route] = file_path
+            route_sites[route] = (line, column)
+            if inventory:
+                yield {
+                    'type': 'route', 'route': route, 'method': method, 'path': path, 'file': file_path,
+                    'line': line, 'column': column,
+                }
+    route_index = backend.route_index
+    suggestions = {}
+    if suggestion_threshold is not None:
+        with stats.stage('suggest'):
+            suggestion_index = backend.suggestion_index
+    
+    roots = [('frontend', directory, FRONTEND_EXTENSIONS) for directory in frontend_dirs]
+    # The filter's counts already include the backend walk
+    skipped_before = Counter(path_filter.skipped) if path_filter is not None else None
+    with stats.stage('walk'):
+        targets = [(file_path, FRONTEND_KINDS) for file_path, _ in walk_sources(roots, path_filter)]
+    stats.add_skipped(path_filter.skipped - skipped_before if path_filter is not None else None)
+    
+    clients = [
+        {'frontend': directory, 'abs_dir': os.path.abspath(directory), 'calls': 0, 'undefined': 0, 'used': set()}
+        for directory in frontend_dirs
+    ]
+    for file_path, records, error in _timed(run_extraction(targets, jobs, cache, stats, options), stats, 'extract'):
+        if error is not None:
+            yield {'type': 'error', 'file': file_path, 'message': error}
+            continue
+        abs_path = os.path.abspath(file_path)
+        owners = [client for client in clients if _is_inside(abs_path, client['abs_dir'])]
+        for _, method, path, line, column, _ in records:
+            route = route_index.match(method, path)
+            route_key = frontend_route_key(method, path)
+            if route is None and suggestion_threshold is not None and route_key not in suggestions:
+                suggestions[route_key] = suggestion_index.best(route_key)
+            for client in owners:
+                client['calls'] += 1
+                if inventory:
+                    yield {
+                        'type': 'call', 'method': method, 'path': path, 'file': file_path, 'line': line, 'column': column,
+                        'client': client['frontend'],
+                    }
+                if route is not None:
+                    client['used'].add(route)
+                    continue
+                
+                client['undefined'] += 1
+                event = {
+                    'type': 'undefined', 'route': route_key, 'method': method, 'path': path, 'file': file_path,
+                    'line': line, 'column': column, 'client': client['frontend'],
+                }
+                if route_key in suggestions and suggestions[route_key][0] is not None:
+                    closest_match, score = suggestions[route_key]
+                    event['suggestion'] = {'route': closest_match, 'score': score, 'accepted': score >= suggestion_threshold}
+                yield event
+    
+    used = set().union(*(client['used'] for client in clients))
+    unused_routes = sorted(route for route in route_files if route not in used)
+    traffic = count_traffic(access_logs, route_files, stats)
+    yield from _traffic_errors(traffic)
+    for route in unused_routes:
+        yield _unused_event(route, route_files[route], route_sites[route], traffic)
+    
+    yield _add_traffic({
+        'type': 'summary',
+        'backend_routes': len(route_files),
+        'frontend_calls': sum(client['calls'] for client in clients),
+        'unused_routes': len(unused_routes),
+        'undefined_calls': sum(client['undefined'] for client in clients),
+        'clients': [
+            {
+                'frontend': client['frontend'],
+                'frontend_calls': client['calls'],
+                'undefined_calls': client['undefined'],
+                'routes_used': len(client['used']),
+            }
+            for client in clients
+        ],
+    }, unused_routes, traffic)
+
+def _print_unused(unused_routes, requests, access_log, where):
+    """
+    Print the backend routes no frontend calls. With access logs, those that
+    served requests are listed apart from the truly dead ones, which are the
+    only ones warned about.
+    
+    Args:
+        unused_routes (list): The unused routes, sorted
+        requests (dict): Requests served per unused route, or None without access logs
+        access_log (dict): Totals from TrafficCounts.as_dict, or None
+        where (str): Where the routes are not used, e.g. 'in frontend'
+    
+    Returns:
+        list: The truly dead routes (all unused routes without access logs)
+    """
+    dead = unused_routes
+    if requests is not None:
+        print(
+            f"\nAccess logs: {access_log['lines']} lines, {access_log['matched']} requests to backend routes, "
+            f"{access_log['unmatched']} to no route, {access_log['unparsed']} lines not understood"
+        )
+        live = [route for route in unused_routes if requests[route]]
+        dead = [route for route in unused_routes if not requests[route]]
+        if live:
+            print(f"\nFound {len(live)} backend routes not used {where} but live in production:")
+            for route in live:
+                print(f"  {route} ({requests[route]} requests)")
+    if dead:
+        qualifier = ' or in the access logs' if requests is not None else ''
+        print(f"\nWARNING: Found {len(dead)} backend routes not used {where}{qualifier}:")
+        for route in dead:
+            print(f"  {route}")
+    return dead
+
+def print_client_report(events, quiet=False, suggest=False):
+    """
+    Print the events of iter_client_events as a text report with one section
+    per frontend, in the order the frontends were given.
+    
+    Args:
+        events (iterable): Events from iter_client_events
+        quiet (bool): Do not list every route and call
+        suggest (bool): Show the suggestions attached to undefined calls
+    
+    Returns:
+        dict: The summary event
+    """
+    routes = []
+    calls = {}        # frontend -> call lines
+    undefined = {}    # frontend -> route key -> suggestion event or None
+    unused = []
+    summary = None
+    
+    for event in events:
+        kind = event['type']
+        if kind == 'route':
+            routes.append(event['route'])
+        elif kind == 'call':
+            relative = os.path.relpath(event['file'], event['client'])
+            calls.setdefault(event['client'], []).append(f"  {event['method']} {event['path']} (in {relative})")
+        elif kind == 'undefined':
+            undefined.setdefault(event['client'], {})[event['route']] = event.get('suggestion')
+        elif kind == 'unused':
+            unused.append(event)
+        elif kind == 'error':
+            print(_error_text(event))
+        else:
+            summary = event
+    
+    print(f"\nFound {summary['backend_routes']} unique API routes in backend{'.' if quiet else ':'}")
+    if not quiet:
+        for route in sorted(routes):
+            print(f"  {route}")
+    
+    for client in summary['clients']:
+        name = client['frontend']
+        print(
+            f"\nFrontend {name}: {client['frontend_calls']} API calls, "
+            f"uses {client['routes_used']} of {summary['backend_routes']} backend routes{'.' if quiet else ':'}"
+        )
+        for line in calls.get(name, ()):
+            print(line)
+        client_undefined = undefined.get(name, {})
+        if not client_undefined:
+            continue
+        print(f"  WARNING: Found {len(client_undefined)} frontend API calls with no matching backend route:")
+        for route_key in sorted(client_undefined):
+            suggestion = client_undefined[route_key]
+            if not suggest:
+                print(f"    {route_key}")
+            elif suggestion is None:
+                print(f"    {route_key} -> No good match found")
+            elif suggestion['accepted']:
+                print(f"    {route_key} -> {suggestion['route']} (similarity: {suggestion['score']}%)")
+            else:
+                print(f"    {route_key} -> No good match found (best: {suggestion['route']}, similarity: {suggestion['score']}%)")
+    
+    requests = {event['route']: event['requests'] for event in unused} if 'access_log' in summary else None
+    dead = _print_unused([event['route'] for event in unused], requests, summary.get('access_log'), 'by any frontend')
+    if not dead and not summary['undefined_calls']:
+        print("\nSuccess! Every backend route is used by some frontend and all frontend API calls have matching backend routes.")
+    return summary
+
+class RouteLinter:
+    """
+    In-memory route and call index that can be refreshed file by file.
+    
+    Holds the per-file extraction results for a backend and a frontend
+    directory, the compiled route index, and running counters of which backend
+    routes are matched by frontend calls. A changed frontend file costs one
+    re-scan and one re-resolve of its own calls; only backend changes rebuild
+    the route index.
+    
+    Backend routes are prefixed with their routers' mounts through a
+    MountGraph, which is only rebuilt when a file's imports, exports, mounts
+    or route receivers change. Even then only the files whose routers end up
+    under different prefixes have their routes resolved again.
+    """
+    
+    def __init__(self, backend_dir, frontend_dir, jobs=1, cache=None, stats=NULL_STATS, options=DEFAULT_SCAN_OPTIONS,
+                 path_filter=None):
+        """
+        Args:
+            backend_dir (str): Path to the backend directory
+            frontend_dir (str): Path to the frontend directory
+            jobs (int): Number of worker processes used for full scans
+            cache (ExtractionCache): Optional cache used by full scans
+            stats (RunStats): Optional instrumentation of full scans
+            options (ScanOptions): Extraction engine and time budget
+            path_filter (PathFilter): Optional filter for walked and refreshed files
+        """
+        self.backend_dir = backend_dir
+        self.frontend_dir = frontend_dir
+        self.roots = source_roots(backend_dir, frontend_dir)
+        self.jobs = jobs
+        self.cache = cache
+        self.stats = stats
+        self.options = options
+        self.path_filter = path_filter
+        self._routes = {}             # file path -> [(method, path, line, column)], mounts applied
+        self._route_records = {}      # file path -> [(method, path, line, column, receiver)] as written
+        self._wiring = {}             # file path -> (wiring records, Wiring)
+        self._mounts = None           # MountGraph, None when the wiring changed since it was built
+        self._route_prefixes = {}     # file path -> MountGraph.file_prefixes its routes were resolved with
+        self._unmounted = set()       # files whose routes must be resolved again
+        self._calls = {}              # file path -> [(method, path, line, column)]
+        self._route_counts = Counter()  # route string -> number of definitions
+        self._matches = {}            # file path -> [(route key, matched route or None)]
+        self._hits = Counter()        # backend route -> number of matching calls
+        self._undefined = Counter()   # route key -> number of unmatched calls
+        self._callers = {}            # backend route -> Counter of calling files
+        self._index_records = {}      # file path -> records loaded from a backend index file
+        self._route_index = RouteIndex()
+        self._suggestion_index = None
+    
+    @property
+    def backend_routes(self):
+        """set: Backend routes in the format 'METHOD /path'"""
+        return {route for route, count in self._route_counts.items() if count > 0}
+    
+    @property
+    def frontend_calls(self):
+        """CallTable: Frontend API calls, in scan order"""
+        table = CallTable()
+        for file_path, calls in self._calls.items():
+            for method, path, line, column in calls:
+                table.add(method, path, file_path, line, column)
+        return table
+    
+    @property
+    def route_index(self):
+        """RouteIndex: Compiled index of the current backend routes"""
+        return self._route_index
+    
+    @property
+    def suggestion_index(self):
+        """SuggestionIndex: Fuzzy suggestion index, built on first use"""
+        if self._suggestion_index is None:
+            self._suggestion_index = SuggestionIndex(self.backend_routes)
+        return self._suggestion_index
+    
+    def match(self, method, path):
+        """
+        Check whether a call to the given method and path is defined.
+        
+        Args:
+            method (str): HTTP method
+            path (str): Route or call path, e.g. '/api/orders/:id' or '/api/orders/${id}'
+        
+        Returns:
+            str: The backend route it resolves to, or None
+        """
+        return self._route_index.match(method, path)
+    
+    def callers(self, route):
+        """
+        Find the frontend calls that resolve to a backend route.
+        
+        Args:
+            route (str): Backend route in the format 'METHOD /path'
+        
+        Returns:
+            list: Frontend API calls as dictionaries with the method, path,
+                  file, line and column of each call
+        """
+        calls = []
+        for file_path in self._callers.get(route, ()):
+            for (method, path, line, column), (_, matched) in zip(self._calls[file_path], self._matches[file_path]):
+                if matched == route:
+                    calls.append({'method': method, 'path': path, 'file': file_path, 'line': line, 'column': column})
+        return calls
+    
+    def lint_files(self, paths):
+        """
+        Refresh the given files and report the findings that involve them.
+        
+        Args:
+            paths (iterable): Files to lint
+        
+        Returns:
+            dict: Maps each path to a list of (kind, route) findings, where kind
+                  is 'undefined' for calls in the file with no matching route
+                  and 'unused' for routes defined in the file that nothing calls
+        """
+        paths = [self.source_path(path) for path in paths]
+        self.refresh(paths)
+        return {file_path: self._file_findings(file_path) for file_path in paths}
+    
+    def scoped_findings(self, paths, before=frozenset()):
+        """
+        Findings that involve the given files, for linting only a change set.
+        
+        These are the undefined calls made in the files, the unused routes
+        defined in them, and every finding not present in before, which
+        catches effects on other files, e.g. calls elsewhere to a route that
+        one of the files removed.
+        
+        Args:
+            paths (iterable): Files that changed
+            before (set): findings() before the files were refreshed
+        
+        Returns:
+            set: ('unused', route) and ('undefined', route key) tuples
+        """
+        current = self.findings()
+        scoped = current - before
+        for path in paths:
+            scoped.update(self._file_findings(self.source_path(path)))
+        return scoped & current
+    
+    def export_records(self):
+        """
+        Per-file extraction results, in the form load_records accepts.
+        Routes loaded from a backend index file are left out.
+        
+        Returns:
+            dict: Maps each file path to a list of (kind, method, path, line,
+                  column, receiver) records, where kind is 'route', 'call' or
+                  one of WIRING_KINDS; routes are as written, before mounts
+        """
+        records = {
+            file_path: [('route',) + route for route in routes]
+            for file_path, routes in self._route_records.items() if file_path not in self._index_records
+        }
+        for file_path, (wiring_records, _) in self._wiring.items():
+            records.setdefault(file_path, []).extend(wiring_records)
+        for file_path, calls in self._calls.items():
+            records.setdefault(file_path, []).extend(('call',) + call + ('',) for call in calls)
+        return records
+    
+    def load_backend_index(self, definitions):
+        """
+        Use backend routes from a serialized index instead of a backend directory.
+        
+        The routes are kept across scan() and load_records(), which only
+        replace what is extracted from the walked directories.
+        
+        Args:
+            definitions (iterable): (route, file, line) tuples, as read from a
+                                    RouteIndexFile
+        """
+        for file_path in self._index_records:
+            self._set_records(file_path, [])
+        self._index_records = {}
+        for route, file_path, line in definitions:
+            method, path = route.split(' ', 1)
+            # The index stores lines only; 0 marks the column as unknown. Its
+            # routes already have their mounts applied, so they are on no receiver.
+            self._index_records.setdefault(file_path, []).append(('route', method, path, line, 0, ''))
+        with self.stats.stage('resolve'):
+            for file_path, records in self._index_records.items():
+                self._set_records(file_path, records)
+            self._rebuild()
+    
+    def route_definitions(self):
+        """
+        Every backend route definition, for writing a route index.
+        
+        Returns:
+            list: (method, path, file path, line, column) tuples, one per definition
+        """
+        return [
+            (method, path, file_path, line, column)
+            for file_path, routes in self._routes.items()
+            for method, path, line, column in routes
+        ]
+    
+    def load_records(self, records):
+        """
+        Replace all state with previously exported records instead of scanning.
+        
+        Args:
+            records (dict): Maps file paths to (kind, method, path, line,
+                            column, receiver) records
+        """
+        self._clear()
+        with self.stats.stage('resolve'):
+            for file_path, file_records in records.items():
+                self._set_records(self.source_path(file_path), file_records)
+            self._rebuild()
+    
+    def iter_events(self, findings=None, inventory=True, suggestion_threshold=None, access_logs=None):
+        """
+        The current state as the event stream iter_lint_events produces.
+        
+        Args:
+            findings (set): Only report these findings (None for all)
+            inventory (bool): Also yield every route and call
+            suggestion_threshold (int): Attach a fuzzy suggestion to undefined
+                calls, flagged as accepted when it meets this score (None to skip)
+            access_logs (AccessLogs): Access logs to count requests from
+        
+        Yields:
+            dict: Events with a 'type' of 'route', 'call', 'undefined', 'unused'
+                  or 'summary'
+        """
+        route_files = {}
+        route_sites = {}  # route -> (line, column) of its first definition
+        for file_path, routes in self._routes.items():
+            for method, path, line, column in routes:
+                route = f'{method} {path}'
+                if route not in route_files:
+                    route_files[route] = file_path
+                    route_sites[route] = (line, column)
+                    if inventory:
+                        yield {
+                            'type': 'route', 'route': route, 'method': method, 'path': path, 'file': file_path,
+                            'line': line, 'column': column,
+                        }
+        
+        call_count = 0
+        undefined_count = 0
+        for file_path, calls in self._calls.items():
+            for (method, path, line, column), (route_key, route) in zip(calls, self._matches[file_path]):
+                call_count += 1
+                if inventory:
+                    yield {'type': 'call', 'method': method, 'path': path, 'file': file_path, 'line': line, 'column': column}
+                if route is not None or (findings is not None and ('undefined', route_key) not in findings):
+                    continue
+                
+                undefined_count += 1
+                event = {
+                    'type': 'undefined', 'route': route_key, 'method': method, 'path': path, 'file': file_path,
+                    'line': line, 'column': column,
+                }
+                if suggestion_threshold is not None:
+                    closest_match, score = self.suggestion_index.best(route_key)
+                    if closest_match is not None:
+                        event['suggestion'] = {'route': closest_match, 'score': score, 'accepted': score >= suggestion_threshold}
+                yield event
+        
+        unused_routes = sorted(
+            route for route in route_files
+            if not self._hits[route] and (findings is None or ('unused', route) in findings)
+        )
+        traffic = count_traffic(access_logs, route_files, self.stats)
+        yield from _traffic_errors(traffic)
+        for route in unused_routes:
+            yield _unused_event(route, route_files[route], route_sites[route], traffic)
+        
+        yield _add_traffic({
+            'type': 'summary',
+            'backend_routes': len(route_files),
+            'frontend_calls': call_count,
+            'unused_routes': len(unused_routes),
+            'undefined_calls': undefined_count,
+        }, unused_routes, traffic)
+    
+    def scan(self, shard=None):
+        """
+        Run a full scan of both directories, replacing all state.
+        
+        Args:
+            shard (tuple): (index, count) to scan only the files in_shard
+                           assigns to that shard (None for all files)
+        """
+        self._clear()
+        with self.stats.stage('walk'):
+            targets = [
+                (file_path, kinds_for_roles(roles))
+                for file_path, roles in walk_sources(self.roots, self.path_filter)
+            ]
+        self.stats.add_skipped(self.path_filter.skipped if self.path_filter is not None else None)
+        if shard is not None:
+            walked = len(targets)
+            targets = [target for target in targets if in_shard(target[0], shard)]
+            self.stats.add_skipped(Counter({'other shard': walked - len(targets)}))
+        with self.stats.stage('extract'):
+            # Copies of a file share one records list, and so their routes and calls
+            shared = {}
+            for file_path, records, error in run_extraction(targets, self.jobs, self.cache, self.stats, self.options):
+                if error is not None:
+                    print(f"Error reading file {file_path}: {error}")
+                    continue
+                self._set_records(file_path, records, shared)
+        with self.stats.stage('resolve'):
+            self._rebuild()
+    
+    def refresh(self, paths):
+        """
+        Re-extract changed, added or deleted files.
+        
+        Args:
+            paths (iterable): Paths that changed; files that no longer exist
+                              or are not source files are dropped from the index.
+                              A changed ignore file triggers a full scan
+        """
+        paths = {self.source_path(path) for path in paths}
+        if self.path_filter is not None and self.path_filter.invalidate(paths):
+            # An ignore file changed, so any file below it may now be scanned or skipped
+            self.scan()
+            return
+        for file_path in paths:
+            self._unresolve(file_path)
+            kinds = kinds_for_roles(roles_for_path(file_path, self.roots))
+            records = []
+            if kinds and os.path.isfile(file_path) and self._allowed(file_path):
+                try:
+                    records = scan_file(file_path, kinds, self.options)
+                except Exception as e:
+                    print(f"Error reading file {file_path}: {e}")
+            self._set_records(file_path, records)
+        
+        if self._mount_routes():
+            # Any call may resolve differently now, so re-resolve everything
+            self._rebuild()
+        else:
+            for file_path in paths:
+                self._resolve(file_path)
+    
+    def source_path(self, path):
+        """
+        Spell a path the way a full scan would, so files given by editors or
+        watchers as absolute or relative paths map to the same index entry.
+        
+        Args:
+            path (str): Path to a file
+        
+        Returns:
+            str: The path joined onto the walked root that contains it, or the
+                 path unchanged if it is outside every root
+        """
+        abs_path = os.path.abspath(path)
+        for directory, abs_dir in top_level_roots(self.roots):
+            if _is_inside(abs_path, abs_dir):
+                return os.path.join(directory, os.path.relpath(abs_path, abs_dir))
+        return path
+    
+    def _allowed(self, file_path):
+        """
+        Check a refreshed file against the path filter, as a full scan would.
+        """
+        if self.path_filter is None:
+            return True
+        abs_path = os.path.abspath(file_path)
+        for _, abs_dir in top_level_roots(self.roots):
+            if _is_inside(abs_path, abs_dir):
+                return self.path_filter.allows(abs_path, abs_dir)
+        return True
+    
+    def known_files(self):
+        """
+        Files that currently contribute routes, calls or mounts.
+        
+        Returns:
+            set: File paths
+        """
+        return set(self._route_records) | set(self._calls) | set(self._wiring)
+    
+    def find_mismatches(self):
+        """
+        Find mismatches between the indexed backend routes and frontend calls.
+        
+        Returns:
+            tuple: (unused_routes, undefined_routes, frontend_route_to_call)
+                   as returned by find_route_mismatches
+        """
+        unused_routes = {route for route in self.backend_routes if not self._hits[route]}
+        undefined_routes = {route_key for route_key, count in self._undefined.items() if count > 0}
+        calls = self.frontend_calls
+        frontend_route_to_call = {
+            frontend_route_key(method, path): calls[row]
+            for method, path, row in calls.unique_routes()
+        }
+        return unused_routes, undefined_routes, frontend_route_to_call
+    
+    def findings(self):
+        """
+        Current findings, cheap enough to diff after every refresh.
+        
+        Returns:
+            set: ('unused', route) and ('undefined', route key) tuples
+        """
+        findings = {('unused', route) for route in self.backend_routes if not self._hits[route]}
+        findings.update(('undefined', route_key) for route_key, count in self._undefined.items() if count > 0)
+        return findings
+    
+    def _clear(self):
+        self._routes.clear()
+        self._route_records.clear()
+        self._wiring.clear()
+        self._mounts = None
+        self._route_prefixes.clear()
+        self._unmounted.clear()
+        self._calls.clear()
+        self._route_counts.clear()
+        for file_path, records in self._index_records.items():
+            self._set_records(file_path, records)
+    
+    def _file_findings(self, file_path):
+        findings = [('undefined', route_key) for route_key, route in self._matches.get(file_path, ()) if route is None]
+        findings.extend(
+            ('unused', f'{method} {path}') for method, path, _, _ in self._routes.get(file_path, ())
+            if not self._hits[f'{method} {path}']
+        )
+        return findings
+    
+    def _set_records(self, file_path, records, shared=None):
+        """
+        Replace a file's records. Its routes are resolved by the next
+        _mount_routes().
+        
+        Methods, paths and receivers are interned, so a route called from
+        many files is stored once however many records mention it.
+        
+        Args:
+            file_path (str): The file
+            records (list): Its (kind, method, path, line, column, receiver) records
+            shared (dict): Optional memo, kept for one scan, under which files
+                           given the same records object (identical copies,
+                           see duplicate_targets) share their route, call and
+                           wiring lists
+        """
+        split = shared.get(id(records)) if shared is not None else None
+        if split is not None and split[0] is records:
+            _, routes, calls, wiring_records, wiring = split
+        else:
+            routes = []
+            calls = []
+            wiring_records = []
+            for kind, method, path, line, column, receiver in records:
+                if kind in WIRING_KINDS:
+                    wiring_records.append((kind, method, path, line, column, receiver))
+                elif kind in BACKEND_KINDS:
+                    routes.append((sys.intern(method), sys.intern(path), line, column, sys.intern(receiver)))
+                else:
+                    calls.append((sys.intern(method), sys.intern(path), line, column))
+            wiring = module_wiring(records)
+            if shared is not None:
+                # The records are kept with their lists, so their id is not reused during the scan
+                shared[id(records)] = (records, routes, calls, wiring_records, wiring)
+        
+        if routes:
+            self._route_records[file_path] = routes
+        else:
+            self._route_records.pop(file_path, None)
+        self._unmounted.add(file_path)
+        
+        _, old_wiring = self._wiring.pop(file_path, (None, None))
+        if wiring is not None:
+            self._wiring[file_path] = (wiring_records, wiring)
+        if wiring != old_wiring:
+            self._mounts = None
+        
+        if calls:
+            self._calls[file_path] = calls
+        else:
+            self._calls.pop(file_path, None)
+    
+    def _mount_routes(self):
+        """
+        Resolve the routes of files whose records changed, and, when the
+        wiring changed, of every file whose routers now have other prefixes.
+        Returns True if any backend route changed.
+        """
+        file_paths = self._unmounted
+        self._unmounted = set()
+        if self._mounts is None:
+            self._mounts = MountGraph({file_path: wiring for file_path, (_, wiring) in self._wiring.items()})
+            file_paths.update(
+                file_path for file_path, prefixes in self._route_prefixes.items()
+                if prefixes != self._mounts.file_prefixes(
+                    file_path, {route[4] for route in self._route_records.get(file_path, ())}
+                )
+            )
+        
+        changed = False
+        # In scan order, so routes are listed the same way however they were resolved
+        ordered = [file_path for file_path in self._route_records if file_path in file_paths]
+        for file_path in ordered + sorted(file_paths.difference(ordered)):
+            records = self._route_records.get(file_path, ())
+            routes = [
+                (method, sys.intern(path), line, column)
+                for method, path, line, column in self._mounts.resolve(file_path, records)
+            ]
+            old_routes = self._routes.pop(file_path, [])
+            self._route_counts.subtract(f'{method} {path}' for method, path, _, _ in old_routes)
+            self._route_prefixes.pop(file_path, None)
+            if routes:
+                self._routes[file_path] = routes
+                self._route_counts.update(f'{method} {path}' for method, path, _, _ in routes)
+                self._route_prefixes[file_path] = self._mounts.file_prefixes(file_path, {route[4] for route in records})
+            # Moving a route within the file does not change what calls resolve to
+            changed |= [route[:2] for route in routes] != [route[:2] for route in old_routes]
+        return changed
+    
+    def _rebuild(self):
+        self._mount_routes()
+        self._route_counts = +self._route_counts
+        self._route_index = RouteIndex(self.backend_routes)
+        self._suggestion_index = None
+        self._matches.clear()
+        self._hits.clear()
+        self._undefined.clear()
+        self._callers.clear()
+        for file_path in self._calls:
+            self._resolve(file_path)
     
-    if unused_routes:
-        print(f"\nWARNING: Found {len(unused_routes)} backend routes not used in frontend:")
-        for route in sorted(unused_routes):
+    def _resolve(self, file_path):
+        matches = []
+        for method, path, _, _ in self._calls.get(file_path, ()):
+            route = self._route_index.match(method, path)
+            route_key = frontend_route_key(method, path)
+            matches.append((route_key, route))
+            if route is None:
+                self._undefined[route_key] += 1
+            else:
+                self._hits[route] += 1
+                self._callers.setdefault(route, Counter())[file_path] += 1
+        self._matches[file_path] = matches
+    
+    def _unresolve(self, file_path):
+        for route_key, route in self._matches.pop(file_path, ()):
+            if route is None:
+                self._undefined[route_key] -= 1
+            else:
+                self._hits[route] -= 1
+                callers = self._callers[route]
+                callers[file_path] -= 1
+                if callers[file_path] <= 0:
+                    del callers[file_path]
+
+def emit_index(linter, file_path):
+    """
+    Write a scanned linter's backend routes to a route index file.
+    
+    Files are stored relative to the backend directory, so the index reads
+    the same wherever the backend was checked out.
+    
+    Args:
+        linter (RouteLinter): Linter whose scan included a backend directory
+        file_path (str): Destination path
+    
+    Returns:
+        int: Number of route definitions written
+    """
+    definitions = [
+        (f'{method} {path}', os.path.relpath(source, linter.backend_dir).replace(os.sep, '/'), line)
+        for method, path, source, line, _ in linter.route_definitions()
+    ]
+    return write_index_file(file_path, definitions)
+
+def lint_since(linter, baseline, rev):
+    """
+    Bring a linter up to date from a baseline and scope it to a change set.
+    
+    Only files that differ from the baseline are re-extracted: first those
+    that changed between the baseline's commit and the working tree but not
+    since rev, so the starting point matches the merge base; then the
+    change set itself.
+    
+    Args:
+        linter (RouteLinter): Linter to load the baseline into
+        baseline (dict): Baseline as returned by load_baseline
+        rev (str): Revision the change set starts from, e.g. 'origin/main'
+    
+    Returns:
+        tuple: (changed files, scoped findings as returned by scoped_findings)
+    
+    Raises:
+        BaselineError: If git cannot list the changed files
+    """
+    directories = [linter.backend_dir, linter.frontend_dir]
+    changed = changed_files(rev, directories)
+    linter.load_records(baseline['files'])
+    if baseline.get('commit'):
+        drifted = set(changed_files(baseline['commit'], directories, merge_base=False)) - set(changed)
+        if drifted:
+            linter.refresh(drifted)
+    before = linter.findings()
+    linter.refresh(changed)
+    return changed, linter.scoped_findings(changed, before)
+
+def print_report(linter, quiet=False, suggest=False, threshold=70, stats=NULL_STATS, scope=None, access_logs=None):
+    """
+    Print the text report for a scanned or loaded linter.
+    
+    Args:
+        linter (RouteLinter): Linter holding the routes and calls
+        quiet (bool): Do not list every route and call
+        suggest (bool): Suggest fixes for undefined routes
+        threshold (int): Minimum similarity score for suggestions
+        stats (RunStats): Optional instrumentation of the suggest stage
+        scope (set): Only report these findings, as from scoped_findings (None for all)
+        access_logs (AccessLogs): Access logs telling unused routes that
+            serve traffic from truly dead ones
+    """
+    backend_routes = linter.backend_routes
+    frontend_calls = linter.frontend_calls
+    
+    print(f"\nFound {len(backend_routes)} unique API routes in backend{'.' if quiet else ':'}")
+    if not quiet:
+        for route in sorted(backend_routes):
             print(f"  {route}")
     
+    print(f"\nFound {len(frontend_calls)} API calls in frontend{'.' if quiet else ':'}")
+    if not quiet:
+        for call in frontend_calls:
+            print(f"  {call['method']} {call['path']} (in {os.path.relpath(call['file'], linter.frontend_dir)})")
+    
+    # Find mismatches between backend routes and frontend API calls
+    unused_routes, undefined_routes, frontend_route_to_call = linter.find_mismatches()
+    if scope is not None:
+        unused_routes = {route for route in unused_routes if ('unused', route) in scope}
+        undefined_routes = {route_key for route_key in undefined_routes if ('undefined', route_key) in scope}
+    
+    traffic = count_traffic(access_logs, backend_routes, stats)
+    for event in _traffic_errors(traffic):
+        print(_error_text(event))
+    requests = access_log = None
+    if traffic is not None:
+        requests = {route: traffic.hits[route] for route in unused_routes}
+        access_log = traffic.as_dict()
+    # Only truly dead routes are left to warn about
+    unused_routes = _print_unused(sorted(unused_routes), requests, access_log, 'in frontend')
+    
     if undefined_routes:
         print(f"\nWARNING: Found {len(undefined_routes)} frontend API calls with no matching backend route:")
         
         # If suggestion is enabled, use fuzzy matching to find potential fixes
-        if args.suggest:
-            try:
-                from thefuzz import process
+        if suggest:
+            # Build the suggestion index once and score every undefined route against it
+            with stats.stage('suggest'):
+                suggestions = linter.suggestion_index.suggest_many(sorted(undefined_routes), threshold)
+            
+            print("\nSuggested fixes (based on fuzzy matching):")
+            for route in sorted(undefined_routes):
+                # Get the original call information
+                call = frontend_route_to_call[route]
+                file_path = os.path.relpath(call['file'], linter.frontend_dir)
                 
-                print("\nSuggested fixes (based on fuzzy matching):")
-                for route in sorted(undefined_routes):
-                    # Get the original call information
-                    call = frontend_route_to_call[route]
-                    file_path = os.path.relpath(call['file'], args.frontend)
-                    
-                    # Find the closest match from backend routes
-                    closest_match, score = process.extractOne(route, backend_routes)
-                    
-                    # Only suggest if the score is above the threshold
-                    if score >= args.threshold:
-                        print(f"  In {file_path}:")
-                        print(f"    {route} -> {closest_match} (similarity: {score}%)")
-                    else:
-                        print(f"  In {file_path}:")
-                        print(f"    {route} -> No good match found (best: {closest_match}, similarity: {score}%)")
-            except ImportError:
-                print("\nNote: Install 'thefuzz' package for route suggestions: pip install thefuzz python-Levenshtein")
+                print(f"  In {file_path}:")
+                if not suggestions[route]:
+                    print(f"    {route} -> No good match found")
+                    continue
+                
+                # Only routes scoring at least the threshold are suggested
+                closest_match, score, _ = suggestions[route][0]
+                print(f"    {route} -> {closest_match} (similarity: {score}%)")
         else:
             # Just list the undefined routes without suggestions
             for route in sorted(undefined_routes):
                 print(f"  {route}")
     
-    if not unused_routes and not undefined_routes:
-        print("\nSuccess! All backend routes are used in frontend and all frontend API calls have matching backend routes.")
+    if scope is not None and not unused_routes and not undefined_routes:
+        print("\nSuccess! No route mismatches involve the changed files.")
+    elif not unused_routes and not undefined_routes:
+        used = 'used in frontend' if traffic is None else 'used in frontend or live in production'
+        print(f"\nSuccess! All backend routes are {used} and all frontend API calls have matching backend routes.")
+
+def _load_backend_index(linter, file_path):
+    """
+    Load a --backend-index file into a linter.
+    
+    Returns:
+        str: An error message, or None on success
+    """
+    try:
+        with RouteIndexFile(file_path) as index:
+            linter.load_backend_index(list(index))
+    except IndexFileError as e:
+        return str(e)
+    return None
+
+def _report_run(args, stats, profiler):
+    """
+    Write the --profile, --stats and --stats-json output of a finished run.
+    
+    Reports go to stderr so they never mix with machine-readable output.
+    """
+    if profiler is not None:
+        import pstats
+        
+        profiler.disable()
+        if args.profile.endswith('.txt'):
+            with open(args.profile, 'w', encoding='utf-8') as f:
+                pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(50)
+        else:
+            profiler.dump_stats(args.profile)
+        print(f"Profile written to {args.profile}", file=sys.stderr)
+    
+    stats.finish()
+    if args.stats:
+        print('\n' + '\n'.join(stats.format_report()), file=sys.stderr)
+    if args.stats_json:
+        stats.write_json(args.stats_json)
+
+def _access_logs(parser, args):
+    """
+    The --access-log files as AccessLogs, or None if none were given.
+    """
+    if not args.access_log:
+        return None
+    for file_path in args.access_log:
+        if not os.path.isfile(file_path):
+            parser.error(f'cannot read --access-log {file_path}')
+    return AccessLogs(args.access_log, args.access_log_format, args.access_log_jobs if args.access_log_jobs > 0 else default_jobs())
+
+def merge_main(argv):
+    """
+    The merge command: combine the shards of a sharded scan and lint the result.
+    
+    Args:
+        argv (list): Command-line arguments after 'merge'
+    
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(prog='route_linter.py merge', description='Combine the files written by every --shard run and lint the full result')
+    parser.add_argument('shards', nargs='+', metavar='SHARD', help='Files written with --shard I/N --save-baseline FILE, one per shard')
+    parser.add_argument('--suggest', action='store_true', help='Suggest fixes for undefined routes using fuzzy matching')
+    parser.add_argument('--threshold', type=int, default=70, help='Minimum similarity score for suggestions (0-100)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text', help='Output format')
+    parser.add_argument('--quiet', action='store_true', help='Do not list every discovered route and API call')
+    parser.add_argument('--save-baseline', metavar='FILE', help='Also save the merged result as a baseline for --since')
+    parser.add_argument('--access-log', action='append', metavar='FILE', help='Access log telling unused routes that serve traffic from truly dead ones (repeatable)')
+    parser.add_argument('--access-log-format', choices=LOG_FORMATS, default='auto', help='Format of the --access-log files')
+    parser.add_argument('--access-log-jobs', type=int, default=1, help='Worker processes reading --access-log files')
+    args = parser.parse_args(argv)
+    access_logs = _access_logs(parser, args)
+    
+    try:
+        merged = merge_shards(args.shards)
+    except BaselineError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    
+    # Stored paths are relative to the scanned repository's root, and are used as such
+    linter = RouteLinter(merged['backend'], merged['frontend'])
+    linter.load_records({os.path.normpath(path): records for path, records in merged['files'].items()})
+    if args.save_baseline:
+        save_baseline(
+            args.save_baseline, linter.export_records(), merged['fingerprint'], merged['backend'], merged['frontend'],
+            os.getcwd(), merged['commit']
+        )
+        print(f"Baseline written to {args.save_baseline}", file=sys.stderr)
+    
+    if args.format != 'text':
+        events = linter.iter_events(
+            inventory=not args.quiet, suggestion_threshold=args.threshold if args.suggest else None, access_logs=access_logs
+        )
+        WRITERS[args.format](events, sys.stdout)
+        return 0
+    
+    print(f"Merged {len(args.shards)} shards")
+    print(f"Backend path: {merged['backend']}")
+    print(f"Frontend path: {merged['frontend']}")
+    print_report(linter, args.quiet, args.suggest, args.threshold, access_logs=access_logs)
+    return 0
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['merge']:
+        return merge_main(argv[1:])
+    
+    parser = argparse.ArgumentParser(
+        description='Route Linter - Analyze backend and frontend routes',
+        epilog="Run 'route_linter.py merge SHARD...' to combine the results of --shard runs."
+    )
+    backend = parser.add_mutually_exclusive_group(required=True)
+    backend.add_argument('--backend', help='Path to the backend directory')
+    backend.add_argument('--backend-index', metavar='FILE', help='Load the backend routes from an index written with --emit-index instead of scanning a backend directory')
+    parser.add_argument('--frontend', action='append', help='Path to the frontend directory (required unless only writing --emit-index); repeat to lint several frontends against one backend')
+    parser.add_argument('--manifest', metavar='FILE', help='File listing frontend directories, one per line, to lint in addition to any --frontend')
+    parser.add_argument('--emit-index', metavar='FILE', help='Write the backend routes and their source lines to a compact index FILE for --backend-index')
+    parser.add_argument('--suggest', action='store_true', help='Suggest fixes for undefined routes using fuzzy matching')
+    parser.add_argument('--threshold', type=int, default=70, help='Minimum similarity score for suggestions (0-100)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text', help='Output format; jsonl, json and sarif stream findings as they are found')
+    parser.add_argument('--quiet', action='store_true', help='Do not list every discovered route and API call')
+    parser.add_argument('--access-log', action='append', metavar='FILE', help='nginx, Express/morgan or JSON Lines access log (.gz allowed) whose requests tell routes unused in the frontend but live in production from truly dead ones (repeatable)')
+    parser.add_argument('--access-log-format', choices=LOG_FORMATS, default='auto', help='Format of the --access-log files (default: auto, detected per file)')
+    parser.add_argument('--access-log-jobs', type=int, default=1, help='Worker processes reading --access-log files, each taking a byte range of an uncompressed log (default: 1, 0 for all available CPUs)')
+    parser.add_argument('--engine', choices=EXTRACTION_ENGINES, default='regex', help='Extraction engine: regex, or lexer for a linear-time scan that skips comments and strings')
+    parser.add_argument('--extractors', type=parse_extractors, metavar='NAME[,NAME...]', help=f"Framework extractors to run (default: all of {', '.join(EXTRACTORS)})")
+    parser.add_argument('--no-prefilter', action='store_true', help='Run the regex engine over every whole file, without first skipping files and parts of files that hold none of the literals its patterns require')
+    parser.add_argument('--no-dedup', action='store_true', help='Extract every file, without first finding byte-identical copies and extracting their contents once')
+    parser.add_argument('--file-budget', type=float, default=DEFAULT_FILE_BUDGET, help=f'Seconds a single file may take to extract before it is skipped (default: {DEFAULT_FILE_BUDGET:g}, 0 for no limit)')
+    parser.add_argument('--include', action='append', default=[], metavar='GLOB', help='Only scan files matching this glob (repeatable, .gitignore syntax)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB', help='Skip files and directories matching this glob (repeatable, .gitignore syntax)')
+    parser.add_argument('--no-ignore', action='store_true', help=f'Do not honour .gitignore or {PROJECT_IGNORE_FILE} files, and enter node_modules, dist, build and similar directories')
+    parser.add_argument('--max-file-size', type=int, default=DEFAULT_MAX_FILE_SIZE // 1024, help=f'Skip files larger than this many KB (default: {DEFAULT_MAX_FILE_SIZE // 1024}, 0 for no limit)')
+    parser.add_argument('--scan-minified', action='store_true', help='Also scan bundles and minified files, which are skipped by default')
+    parser.add_argument('--jobs', type=int, default=0, help='Number of worker processes for scanning (default: all available CPUs)')
+    parser.add_argument('--read-ahead', type=int, default=DEFAULT_READ_AHEAD, help=f'Files each scanning process keeps reading ahead, on threads; raise it on network filesystems (default: {DEFAULT_READ_AHEAD}, 1 reads each file only when it is scanned)')
+    parser.add_argument('--mmap-threshold', type=int, default=DEFAULT_MMAP_THRESHOLD // 1024, help=f'Memory-map files of at least this many KB instead of reading them (default: {DEFAULT_MMAP_THRESHOLD // 1024}, 0 to never map)')
+    parser.add_argument('--eager-decode', action='store_true', help='Decode files to text on the reading threads instead of when they are scanned')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_DIR, help=f'Cache per-file extraction results on disk (default directory: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-hash', action='store_true', help='Compare content hashes when mtime/size differ (useful after fresh checkouts)')
+    parser.add_argument('--cache-max-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help='Cache size cap in MB; least recently used entries are evicted')
+    parser.add_argument('--save-baseline', metavar='FILE', help='After a full scan, save the per-file routes and calls to FILE as a baseline for --since')
+    parser.add_argument('--baseline', metavar='FILE', help='Baseline saved with --save-baseline, used instead of a full scan with --since')
+    parser.add_argument('--since', metavar='REV', help='Only re-extract files changed since the merge base with git revision REV and report the findings that involve them (requires --baseline)')
+    parser.add_argument('--shard', type=parse_shard, metavar='I/N', help="Scan only shard I of N (counted from 1) and write its per-file results to --save-baseline, to be combined with 'route_linter.py merge'")
+    parser.add_argument('--watch', action='store_true', help='Keep running and re-lint changed files, printing findings that appear or go away')
+    parser.add_argument('--serve', type=int, metavar='PORT', help='Keep running as a local lint server answering JSON queries on this port (0 picks a free port)')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface for --serve (default: 127.0.0.1)')
+    parser.add_argument('--poll', action='store_true', help='Use polling instead of inotify in --watch and --serve modes')
+    parser.add_argument('--stats', action='store_true', help='Report wall and CPU time per stage, throughput, matches per pattern and the slowest files (on stderr)')
+    parser.add_argument('--stats-json', metavar='FILE', help='Write the --stats data as JSON to FILE')
+    parser.add_argument('--top-files', type=int, default=DEFAULT_TOP_FILES, help=f'Number of slowest files to report with --stats (default: {DEFAULT_TOP_FILES})')
+    parser.add_argument('--profile', metavar='FILE', help='Profile the run with cProfile and write the stats to FILE (text if it ends in .txt); combine with --jobs 1 to include extraction')
+    
+    args = parser.parse_args(argv)
+    if (args.since is None) != (args.baseline is None):
+        parser.error('--since and --baseline must be given together')
+    if args.emit_index is not None and args.backend is None:
+        parser.error('--emit-index requires --backend')
+    frontends = args.frontend or []
+    if args.manifest is not None:
+        try:
+            frontends = frontends + read_manifest(args.manifest)
+        except OSError as e:
+            parser.error(f'cannot read --manifest: {e}')
+    if not frontends and args.emit_index is None:
+        parser.error('the following arguments are required: --frontend')
+    if args.shard is not None:
+        if args.save_baseline is None:
+            parser.error('--shard requires --save-baseline FILE to write the shard to')
+        for flag, value in (('--since', args.since), ('--backend-index', args.backend_index), ('--emit-index', args.emit_index),
+                            ('--watch', args.watch), ('--serve', args.serve is not None), ('--access-log', args.access_log)):
+            if value not in (None, False):
+                parser.error(f'{flag} cannot be combined with --shard')
+    if len(frontends) > 1:
+        # --serve is compared to None, since --serve 0 asks for any free port
+        for flag, value in (('--since', args.since), ('--save-baseline', args.save_baseline), ('--watch', args.watch),
+                            ('--serve', args.serve is not None)):
+            if value not in (None, False):
+                parser.error(f'{flag} lints a single frontend')
+    if args.format != 'text':
+        # Compared to None, since --serve 0 asks for any free port
+        for flag, given in (('--watch', args.watch), ('--serve', args.serve is not None)):
+            if given:
+                parser.error(f'{flag} reports in text only and cannot be combined with --format {args.format}')
+    args.frontend = frontends[0] if frontends else None
+    if args.access_log and not frontends:
+        parser.error('--access-log requires --frontend')
+    access_logs = _access_logs(parser, args)
+    jobs = args.jobs if args.jobs > 0 else default_jobs()
+    read_options = ReadOptions(
+        max(1, args.read_ahead), args.mmap_threshold * 1024 if args.mmap_threshold > 0 else None, not args.eager_decode
+    )
+    options = ScanOptions(
+        args.engine, args.file_budget if args.file_budget > 0 else None, args.extractors, read_options, not args.no_prefilter,
+        not args.no_dedup
+    )
+    path_filter = PathFilter(
+        include=args.include,
+        exclude=args.exclude,
+        use_ignore_files=not args.no_ignore,
+        prune_dirs=() if args.no_ignore else DEFAULT_PRUNE_DIRS,
+        max_file_size=args.max_file_size * 1024 if args.max_file_size > 0 else None,
+        skip_minified=not args.scan_minified
+    )
+    cache = None
+    if args.cache:
+        cache = make_cache(args.cache, args.cache_hash, args.cache_max_size * 1024 * 1024)
+    
+    # Instrumentation is a no-op object unless asked for
+    stats = RunStats(args.top_files) if args.stats or args.stats_json else NULL_STATS
+    profiler = None
+    if args.profile:
+        import cProfile
+        
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
+    if args.frontend is None:
+        # Only write the backend route index
+        linter = RouteLinter(args.backend, None, jobs, cache, stats, options, path_filter)
+        linter.scan()
+        count = emit_index(linter, args.emit_index)
+        print(f"Wrote {count} route definitions to {args.emit_index}")
+        if cache is not None:
+            cache.prune()
+        _report_run(args, stats, profiler)
+        return 0
+    
+    if args.shard is not None:
+        # Extract this shard's files only; the merge command lints the combined result
+        linter = RouteLinter(args.backend, args.frontend, jobs, cache, stats, options, path_filter)
+        linter.scan(shard=args.shard)
+        records = linter.export_records()
+        save_baseline(
+            args.save_baseline, records, extractor_fingerprint(options), args.backend, args.frontend,
+            repository_root(args.frontend), current_commit(args.frontend), args.shard
+        )
+        print(f"Wrote shard {args.shard[0]}/{args.shard[1]} ({len(records)} files with routes or calls) to {args.save_baseline}")
+        if cache is not None:
+            cache.prune()
+        _report_run(args, stats, profiler)
+        return 0
+    
+    if len(frontends) > 1:
+        # Parse the backend once and check every frontend against it
+        backend = RouteLinter(args.backend, None, jobs, cache, stats, options, path_filter)
+        if args.backend_index is not None:
+            error = _load_backend_index(backend, args.backend_index)
+            if error is not None:
+                print(f"Error: {error}", file=sys.stderr)
+                return 2
+        else:
+            backend.scan()
+        if args.emit_index:
+            count = emit_index(backend, args.emit_index)
+            print(f"Wrote {count} route definitions to {args.emit_index}", file=sys.stderr)
+        events = iter_client_events(
+            backend, frontends, jobs, cache,
+            inventory=not args.quiet,
+            suggestion_threshold=args.threshold if args.suggest else None,
+            stats=stats,
+            options=options,
+            path_filter=path_filter,
+            access_logs=access_logs
+        )
+        if args.format == 'text':
+            print(f"Backend index: {args.backend_index}" if args.backend_index is not None else f"Backend path: {args.backend}")
+            print(f"Frontend paths: {', '.join(frontends)}")
+            print_client_report(events, args.quiet, args.suggest)
+        else:
+            WRITERS[args.format](events, sys.stdout)
+        if cache is not None:
+            cache.prune()
+        sys.stdout.flush()
+        _report_run(args, stats, profiler)
+        return 0
+    
+    # Without an index or baseline to load or save, machine-readable output is streamed
+    streaming = all(value is None for value in (args.since, args.save_baseline, args.backend_index, args.emit_index))
+    if args.format != 'text' and streaming:
+        events = iter_lint_events(
+            args.backend, args.frontend, jobs, cache,
+            inventory=not args.quiet,
+            suggestion_threshold=args.threshold if args.suggest else None,
+            stats=stats,
+            options=options,
+            path_filter=path_filter,
+            access_logs=access_logs
+        )
+        WRITERS[args.format](events, sys.stdout)
+        if cache is not None:
+            cache.prune()
+        _report_run(args, stats, profiler)
+        return 0
+    
+    text = args.format == 'text'
+    if text:
+        if args.backend_index is not None:
+            print(f"Backend index: {args.backend_index}")
+        else:
+            print(f"Backend path: {args.backend}")
+        print(f"Frontend path: {args.frontend}")
+    
+    linter = RouteLinter(args.backend, args.frontend, jobs, cache, stats, options, path_filter)
+    if args.backend_index is not None:
+        error = _load_backend_index(linter, args.backend_index)
+        if error is not None:
+            print(f"Error: {error}", file=sys.stderr)
+            return 2
+    scope = None
+    if args.since is not None:
+        # Start from the baseline and re-extract only what changed
+        try:
+            baseline = load_baseline(
+                args.baseline, extractor_fingerprint(options), args.backend, args.frontend,
+                repository_root(args.frontend)
+            )
+            changed, scope = lint_since(linter, baseline, args.since)
+        except BaselineError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        if text:
+            print(f"Linting {len(changed)} files changed since {args.since} against baseline {args.baseline}")
+    else:
+        # Parse backend routes and frontend API calls in a single walk
+        linter.scan()
+    
+    if args.save_baseline:
+        save_baseline(
+            args.save_baseline, linter.export_records(), extractor_fingerprint(options), args.backend, args.frontend,
+            repository_root(args.frontend), current_commit(args.frontend)
+        )
+        print(f"Baseline written to {args.save_baseline}", file=sys.stderr)
+    if args.emit_index:
+        count = emit_index(linter, args.emit_index)
+        print(f"Wrote {count} route definitions to {args.emit_index}", file=sys.stderr)
+    
+    if not text:
+        events = linter.iter_events(
+            scope,
+            inventory=not args.quiet,
+            suggestion_threshold=args.threshold if args.suggest else None,
+            access_logs=access_logs
+        )
+        WRITERS[args.format](events, sys.stdout)
+        if cache is not None:
+            cache.prune()
+        _report_run(args, stats, profiler)
+        return 0
+    
+    print_report(linter, args.quiet, args.suggest, args.threshold, stats, scope, access_logs)
+    if cache is not None:
+        cache.prune()
+    
+    sys.stdout.flush()
+    _report_run(args, stats, profiler)
+    
+    if args.serve is not None:
+        from route_server import create_server
+        from route_watch import create_watcher
+        
+        watcher = create_watcher(
+            [directory for directory in (args.backend, args.frontend) if directory is not None], polling=args.poll,
+            path_filter=path_filter
+        )
+        server = create_server(linter, args.host, args.serve, watcher)
+        host, port = server.server_address[:2]
+        print(f"\nServing lint queries on http://{host}:{port} (press Ctrl+C to stop)...")
+        sys.stdout.flush()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            watcher.close()
+    elif args.watch:
+        from route_watch import create_watcher, watch
+        
+        watcher = create_watcher(
+            [directory for directory in (args.backend, args.frontend) if directory is not None], polling=args.poll,
+            path_filter=path_filter
+        )
+        print("\nWatching for changes (press Ctrl+C to stop)...")
+        sys.stdout.flush()
+        try:
+            watch(linter, watcher)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
     
     return 0
 
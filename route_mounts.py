@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+
+import os
+from collections import namedtuple
+
+from route_extractors import EXTRACTORS
+from route_paths import canonical_path
+
+# Extensions tried, in order, when resolving a relative module path to a file
+MODULE_EXTENSIONS = ('.js', '.ts', '.mjs', '.cjs', '.jsx', '.tsx')
+
+# How one backend file takes part in the mount graph, from its extraction
+# records:
+#   bindings:  (local name, module path, imported name) for each import or
+#              require of a relative module; the imported name is '' for the
+#              default export or the whole module
+#   exports:   (local name, exported name) for each exported name, '' for
+#              the default export
+#   mounts:    (receiver, prefix, mounted) for each router mounted on a
+#              receiver; mounted is a name or a relative module path
+#   receivers: names routes are defined on
+Wiring = namedtuple('Wiring', ['bindings', 'exports', 'mounts', 'receivers'])
+
+def module_wiring(records):
+    """
+    Collect the parts of a file's records that the mount graph uses.
+    
+    Args:
+        records (iterable): (kind, method, path, line, column, receiver)
+                            extraction records of one file
+    
+    Returns:
+        Wiring: The file's wiring, or None if it has neither wiring records
+                nor routes defined on a receiver
+    """
+    bindings = []
+    exports = []
+    mounts = []
+    receivers = set()
+    for kind, name, value, _, _, receiver in records:
+        # Records exported by a RouteLinter have the kinds 'route' and 'call'
+        side = EXTRACTORS[kind].side if kind in EXTRACTORS else None
+        if side == 'import':
+            bindings.append((name, value, receiver))
+        elif side == 'export':
+            exports.append((name, receiver))
+        elif side == 'mount':
+            mounts.append((receiver, value, name))
+        elif side == 'backend' and receiver:
+            receivers.add(receiver)
+    if not (bindings or exports or mounts or receivers):
+        return None
+    return Wiring(tuple(bindings), tuple(exports), tuple(mounts), frozenset(receivers))
+
+def join_path(prefix, path):
+    """
+    Join a mount prefix and a route path the way Express does.
+    
+    Args:
+        prefix (str): Mount prefix, e.g. '/api/v2' ('' for none)
+        path (str): Route path relative to the mount, e.g. '/orders'
+    
+    Returns:
+        str: The full path, e.g. '/api/v2/orders'; a route on '/' answers
+             at the prefix itself
+    """
+    if not prefix:
+        return path
+    if path.strip('/') == '':
+        return prefix.rstrip('/') or '/'
+    return prefix.rstrip('/') + '/' + path.lstrip('/')
+
+def _module_key(file_path):
+    """
+    The absolute path a relative import of file_path would name, without
+    its extension.
+    """
+    root, extension = os.path.splitext(os.path.abspath(file_path))
+    return root if extension in MODULE_EXTENSIONS else os.path.abspath(file_path)
+
+class MountGraph:
+    """
+    Which routers are mounted under which prefixes, across backend files.
+    
+    A node is a router: a (file, name) pair. Mounts are edges from the router
+    a mount is made on to the router mounted, labelled with the prefix. Names
+    bound by an import or require stand for the module's router: the export
+    of that name or the default export, or, when the export is not a router
+    (a Fastify plugin function, say), every router in the module that is not
+    mounted inside it.
+    
+    The graph is built once from every file's Wiring, and the prefixes of
+    each router are computed on first use and memoized, so resolving all
+    routes visits each router and mount once. A router that nothing mounts
+    is served at the root, so routes of unmounted routers keep their paths.
+    """
+    
+    def __init__(self, wirings):
+        """
+        Args:
+            wirings (dict): Maps each backend file path to its Wiring
+        """
+        self._wirings = wirings
+        self._modules = {}
+        for file_path in wirings:
+            key = _module_key(file_path)
+            self._modules[key] = file_path
+            if os.path.basename(key) == 'index':
+                # require('./routes') loads routes/index.js
+                self._modules.setdefault(os.path.dirname(key), file_path)
+        self._bindings = {
+            file_path: {local: (module, imported) for local, module, imported in wiring.bindings}
+            for file_path, wiring in wirings.items()
+        }
+        self._roots = {}     # file path -> routers not mounted inside the file
+        self._prefixes = {}  # router -> tuple of prefixes, None while being computed
+        
+        self._parents = {}   # router -> [(router it is mounted on, prefix)]
+        for file_path, wiring in wirings.items():
+            for receiver, prefix, mounted in wiring.mounts:
+                children = self.routers(file_path, mounted)
+                for parent in self.routers(file_path, receiver):
+                    for child in children:
+                        self._parents.setdefault(child, []).append((parent, prefix))
+    
+    def module_file(self, file_path, module):
+        """
+        Resolve a relative module path as require() or import would.
+        
+        Args:
+            file_path (str): File the import is in
+            module (str): Relative module path, e.g. './routes/orders'
+        
+        Returns:
+            str: The backend file it names, or None if it is not one
+        """
+        return self._modules.get(_module_key(os.path.join(os.path.dirname(file_path), module)))
+    
+    def routers(self, file_path, name):
+        """
+        The routers a name in a file stands for.
+        
+        Args:
+            file_path (str): File the name is used in
+            name (str): A local name, or a relative module path
+        
+        Returns:
+            list: (file, name) routers; a name that is neither imported nor
+                  a known module is a router of the file itself
+        """
+        if name.startswith('.'):
+            module, imported = name, ''
+        elif name in self._bindings.get(file_path, ()):
+            module, imported = self._bindings[file_path][name]
+        else:
+            return [(file_path, name)]
+        target = self.module_file(file_path, module)
+        if target is None:
+            return [] if name.startswith('.') else [(file_path, name)]
+        return self._exported(target, imported)
+    
+    def prefixes(self, router):
+        """
+        Every full prefix a router is served under.
+        
+        Args:
+            router (tuple): (file, name) router
+        
+        Returns:
+            tuple: Prefixes, ('',) for a router nothing mounts. A mount that
+                   closes a cycle is ignored.
+        """
+        known = self._prefixes.get(router, False)
+        if known is None:
+            # Mounted inside its own mount chain
+            return ()
+        if known is not False:
+            return known
+        parents = self._parents.get(router)
+        if not parents:
+            self._prefixes[router] = ('',)
+            return ('',)
+        
+        self._prefixes[router] = None
+        prefixes = {}
+        for parent, prefix in parents:
+            for parent_prefix in self.prefixes(parent):
+                prefixes[join_path(parent_prefix, prefix)] = None
+        self._prefixes[router] = tuple(prefixes) or ('',)
+        return self._prefixes[router]
+    
+    def file_prefixes(self, file_path, receivers):
+        """
+        Args:
+            file_path (str): Backend file
+            receivers (iterable): Names routes in the file are defined on
+        
+        Returns:
+            tuple: (receiver, prefixes) pairs, sorted by receiver; equal
+                   results mean the file's routes resolve the same way
+        """
+        return tuple((receiver, self._receiver_prefixes(file_path, receiver)) for receiver in sorted(receivers))
+    
+    def resolve(self, file_path, routes):
+        """
+        Prefix a file's routes with the mounts of the routers they are defined on.
+        
+        Args:
+            file_path (str): Backend file
+            routes (iterable): (method, path, line, column, receiver) routes
+                               as written in the file
+        
+        Returns:
+            list: (method, full path, line, column) routes, with the full
+                  path in canonical form; a route on a router mounted under
+                  several prefixes appears once for each
+        """
+        resolved = []
+        for method, path, line, column, receiver in routes:
+            for prefix in self._receiver_prefixes(file_path, receiver):
+                resolved.append((method, canonical_path(join_path(prefix, path)), line, column))
+        return resolved
+    
+    def _receiver_prefixes(self, file_path, receiver):
+        if not receiver:
+            return ('',)
+        prefixes = {}
+        for router in self.routers(file_path, receiver):
+            prefixes.update(dict.fromkeys(self.prefixes(router)))
+        return tuple(prefixes) or ('',)
+    
+    def _exported(self, file_path, imported):
+        """
+        The routers a module exports under a name ('' for its default export).
+        """
+        wiring = self._wirings[file_path]
+        local = dict((exported, local) for local, exported in wiring.exports).get(imported, imported)
+        if local and local in self._local_routers(file_path):
+            return [(file_path, local)]
+        return [(file_path, name) for name in self._file_roots(file_path)]
+    
+    def _local_routers(self, file_path):
+        wiring = self._wirings[file_path]
+        return wiring.receivers | {receiver for receiver, _, _ in wiring.mounts}
+    
+    def _file_roots(self, file_path):
+        roots = self._roots.get(file_path)
+        if roots is None:
+            wiring = self._wirings[file_path]
+            bindings = self._bindings[file_path]
+            mounted = {name for _, _, name in wiring.mounts if not name.startswith('.') and name not in bindings}
+            roots = self._roots[file_path] = sorted(self._local_routers(file_path) - mounted)
+        return roots
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import json
+import os
+
+OUTPUT_FORMATS = ('text', 'jsonl', 'json', 'sarif')
+
+# Event types that are findings rather than inventory; these are flushed as
+# soon as they are written so downstream tools see them while the scan runs
+FINDING_TYPES = ('undefined', 'unused', 'error', 'summary')
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+SARIF_RULES = [
+    {
+        'id': 'undefined-route',
+        'name': 'UndefinedRoute',
+        'shortDescription': {'text': 'Frontend API call with no matching backend route'},
+    },
+    {
+        'id': 'unused-route',
+        'name': 'UnusedRoute',
+        'shortDescription': {'text': 'Backend route not used in frontend'},
+    },
+]
+
+def _dumps(event):
+    return json.dumps(event, separators=(',', ':'))
+
+def write_jsonl(events, out):
+    """
+    Write events as JSON Lines, one event per line.
+    
+    Args:
+        events (iterable): Events from iter_lint_events
+        out (file): Text stream to write to
+    """
+    for event in events:
+        out.write(_dumps(event) + '\n')
+        if event['type'] in FINDING_TYPES:
+            out.flush()
+
+def write_json(events, out):
+    """
+    Write events as a single JSON document, streamed element by element.
+    
+    The document has the shape {"results": [...], "summary": {...}}.
+    
+    Args:
+        events (iterable): Events from iter_lint_events
+        out (file): Text stream to write to
+    """
+    summary = None
+    separator = '\n  '
+    out.write('{"results": [')
+    for event in events:
+        if event['type'] == 'summary':
+            summary = event
+            continue
+        out.write(separator + _dumps(event))
+        separator = ',\n  '
+        if event['type'] in FINDING_TYPES:
+            out.flush()
+    out.write('\n], "summary": ' + _dumps(summary) + '}\n')
+    out.flush()
+
+def _sarif_uri(file_path):
+    return os.path.relpath(file_path).replace(os.sep, '/')
+
+def _sarif_result(event):
+    if event['type'] == 'undefined':
+        text = f"Frontend API call with no matching backend route: {event['route']}"
+        suggestion = event.get('suggestion')
+        if suggestion and suggestion['accepted']:
+            text += f" (did you mean {suggestion['route']}? similarity: {suggestion['score']}%)"
+        rule_id = 'undefined-route'
+    else:
+        text = f"Backend route not used in frontend: {event['route']}"
+        if event.get('requests'):
+            text += f" (live in production: {event['requests']} requests in the access logs)"
+        rule_id = 'unused-route'
+    location = {'artifactLocation': {'uri': _sarif_uri(event['file'])}}
+    if event.get('line'):
+        # SARIF lines and columns are 1-based; a column of 0 means it is unknown
+        location['region'] = {'startLine': event['line']}
+        if event.get('column'):
+            location['region']['startColumn'] = event['column']
+    return {
+        'ruleId': rule_id,
+        # Routes that serve traffic are only worth a note
+        'level': 'note' if event.get('requests') else 'warning',
+        'message': {'text': text},
+        'locations': [{'physicalLocation': location}],
+    }
+
+def write_sarif(events, out):
+    """
+    Write findings as a SARIF 2.1.0 log, streamed result by result.
+    
+    Inventory events are not part of SARIF and are dropped.
+    
+    Args:
+        events (iterable): Events from iter_lint_events
+        out (file): Text stream to write to
+    """
+    header = {
+        '$schema': SARIF_SCHEMA,
+        'version': '2.1.0',
+    }
+    driver = {'name': 'route-linter', 'rules': SARIF_RULES}
+    # Everything up to the results array is fixed, so write it before scanning starts
+    out.write(json.dumps(header)[:-1] + ', "runs": [{"tool": {"driver": ' + json.dumps(driver) + '}, "results": [')
+    separator = '\n  '
+    for event in events:
+        if event['type'] not in ('undefined', 'unused'):
+            continue
+        out.write(separator + _dumps(_sarif_result(event)))
+        separator = ',\n  '
+        out.flush()
+    out.write('\n]}]}\n')
+    out.flush()
+
+WRITERS = {
+    'jsonl': write_jsonl,
+    'json': write_json,
+    'sarif': write_sarif,
+}
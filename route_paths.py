@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import re
+from functools import lru_cache
+
+# Most distinct paths whose canonical forms are remembered. The same paths
+# recur in many files, so most lookups are hits, while the bound keeps memory
+# flat on very large trees.
+CANONICAL_CACHE_SIZE = 1 << 16
+
+# scheme://host of an absolute URL, e.g. https://api.example.com
+ORIGIN_PATTERN = re.compile(r'^[a-z][a-z0-9+.-]*://[^/?#]*', re.IGNORECASE)
+
+# A template expression standing for a base URL before the path, e.g. the
+# ${API_URL} in `${API_URL}/api/users`
+BASE_URL_PATTERN = re.compile(r'^\$\{[^}]*\}(?=/)')
+
+# Template literal expressions inside frontend paths, e.g. ${userId}
+TEMPLATE_PATTERN = re.compile(r'\$\{[^}]*\}')
+
+# {id} placeholders, as in OpenAPI paths and generated clients
+PLACEHOLDER_PATTERN = re.compile(r'(?<!\$)\{(\w+)\}')
+
+# Paths that are likely API endpoints once template expressions are removed:
+# /api and /auth paths (also without a leading slash), GraphQL endpoints and
+# version prefixes like /v1/
+API_PATH_PATTERN = re.compile(r'^/?(?:api|auth)/|^/(?:api|auth|graphql)|/(?:api|auth)/|^/v\d+/')
+
+def _strip_query(path):
+    """
+    Cut a query string or fragment off a path.
+    
+    A '?' ending a :param segment marks the param optional (Express) and a
+    '?' inside a param's (...) constraint belongs to the regex, so neither
+    starts a query.
+    """
+    path = path.split('#', 1)[0]
+    index = path.find('?')
+    while index >= 0:
+        segment_start = path.rfind('/', 0, index) + 1
+        segment = path[segment_start:index]
+        optional = segment.startswith(':') and path[index + 1:index + 2] in ('', '/')
+        if not optional and segment.count('(') <= segment.count(')'):
+            return path[:index]
+        index = path.find('?', index + 1)
+    return path
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def canonical_path(path):
+    """
+    Bring a backend route path or a frontend call path into the one form
+    route keys are built from, so a route and a call to it have the same key.
+    
+    The origin of an absolute URL and a leading base URL expression are
+    dropped, as are the query string and fragment. Empty segments, and with
+    them trailing and doubled slashes, are removed and a leading slash is
+    added. Template expressions become ':param' and {name} placeholders
+    ':name'. Optional params and param constraints are kept.
+    
+    Args:
+        path (str): Path as written, e.g. '${API_URL}/api/users/${id}/?full=1'
+    
+    Returns:
+        str: The canonical path, e.g. '/api/users/:param'
+    """
+    path = ORIGIN_PATTERN.sub('', path, count=1)
+    path = BASE_URL_PATTERN.sub('', path, count=1)
+    path = _strip_query(path)
+    path = TEMPLATE_PATTERN.sub(':param', path)
+    path = PLACEHOLDER_PATTERN.sub(r':\1', path)
+    return '/' + '/'.join(segment for segment in path.split('/') if segment)
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def is_api_path(path):
+    """
+    Check if a path is likely an API endpoint.
+    
+    Args:
+        path (str): The path to check
+    
+    Returns:
+        bool: True if the path is likely an API endpoint, False otherwise
+    """
+    # Absolute URLs and base URL expressions count by the path that follows
+    # them, with other template literals (${var}) removed for the check
+    path = BASE_URL_PATTERN.sub('', ORIGIN_PATTERN.sub('', path, count=1), count=1)
+    return API_PATH_PATTERN.search(TEMPLATE_PATTERN.sub('', path)) is not None
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+
+import re
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:
+    # Python before 3.11
+    import sre_constants
+    import sre_parse
+
+# Most alternatives a set of literals may grow to while adjacent parts of a
+# pattern are joined, e.g. (app|router) and \.(get|post|...) into app.get,
+# router.get, ... Longer literals reject more files; more of them cost more
+# to search for.
+MAX_LITERALS = 64
+
+# Characters of context kept on each side of an anchor hit when only windows
+# of a file are scanned. Windows bound where matches start; a match found in
+# one runs on past its end, e.g. a fetch options object spanning many lines
+# before its method.
+WINDOW_CONTEXT = 1024
+
+_ZERO_WIDTH = (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+_REPEATS = tuple(
+    getattr(sre_constants, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT') if hasattr(sre_constants, name)
+)
+
+def _best(candidates):
+    """
+    The literal set to require from a sequence: the one whose shortest
+    literal is longest, then the one with the fewest literals.
+    """
+    candidates = [literals for literals in candidates if literals and '' not in literals]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda literals: (min(map(len, literals)), -len(literals)))
+
+def _analyze_sequence(items):
+    """
+    Returns:
+        tuple: (exact, required). exact is the set of strings the sequence
+               matches if it only matches fixed strings, else None; required
+               is a set of literals one of which every match contains, or None
+    """
+    run = {''}
+    exact = True
+    candidates = []
+    for op, av in items:
+        node_exact, node_required = _analyze(op, av)
+        if node_exact is not None and len(run) * len(node_exact) <= MAX_LITERALS:
+            run = {prefix + suffix for prefix in run for suffix in node_exact}
+            continue
+        exact = False
+        candidates.append(run)
+        if node_exact is not None:
+            run = set(node_exact)
+        else:
+            candidates.append(node_required)
+            run = {''}
+    candidates.append(run)
+    return (frozenset(run) if exact else None), _best(candidates)
+
+def _analyze(op, av):
+    if op is sre_constants.LITERAL:
+        return frozenset({chr(av).lower()}), None
+    if op in _ZERO_WIDTH:
+        # Assertions consume nothing, so literals on both sides still join
+        return frozenset({''}), None
+    if op is sre_constants.IN:
+        if all(item_op is sre_constants.LITERAL for item_op, _ in av) and len(av) <= MAX_LITERALS:
+            return frozenset(chr(code).lower() for _, code in av), None
+        return None, None
+    if op is sre_constants.SUBPATTERN:
+        return _analyze_sequence(av[-1])
+    if op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+        return _analyze_sequence(av)
+    if op is sre_constants.BRANCH:
+        branches = [_analyze_sequence(branch) for branch in av[1]]
+        if all(exact is not None for exact, _ in branches):
+            literals = frozenset().union(*(exact for exact, _ in branches))
+            if len(literals) <= MAX_LITERALS:
+                return literals, None
+        required = [exact if exact is not None and '' not in exact else _best([required]) for exact, required in branches]
+        if any(literals is None for literals in required):
+            return None, None
+        return None, frozenset().union(*required)
+    if op in _REPEATS:
+        low, high, items = av
+        exact, required = _analyze_sequence(items)
+        if low == high == 1:
+            return exact, required
+        if low == 0:
+            return None, None
+        return None, _best([exact, required])
+    return None, None
+
+def required_literals(pattern):
+    """
+    Derive literals that every match of a pattern contains, for a fast
+    substring check before the pattern itself is run.
+    
+    The pattern is matched case-insensitively, so the literals are lower case
+    and must be looked for in lower-cased text.
+    
+    Args:
+        pattern (str): Regular expression source
+    
+    Returns:
+        frozenset: Lower-case literals, one of which every match contains,
+                   or None if the pattern guarantees none (any text may match)
+    """
+    exact, required = _analyze_sequence(sre_parse.parse(pattern, re.IGNORECASE))
+    return _best([exact, required])
+
+class Prefilter:
+    """
+    Rejects texts no pattern of a set can match, and narrows the others down
+    to the windows around the places one could.
+    
+    Every match of the patterns contains one of their required literals (the
+    anchors), so a text without an anchor has no match and need not be
+    decoded or scanned. Raw bytes are checked with one search over the
+    lower-cased buffer.
+    """
+    
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns (iterable): Regular expression sources, matched case-insensitively
+        """
+        anchors = set()
+        for pattern in patterns:
+            literals = required_literals(pattern)
+            if literals is None:
+                # Some pattern needs no literal, so no text can be rejected
+                anchors = None
+                break
+            anchors.update(literals)
+        self.anchors = None if anchors is None else frozenset(anchors)
+        if self.anchors is None:
+            self._bytes = self._text = None
+        else:
+            # Longest first, so an anchor that extends another is reported whole
+            alternation = '|'.join(re.escape(anchor) for anchor in sorted(self.anchors, key=lambda anchor: (-len(anchor), anchor)))
+            self._bytes = re.compile(alternation.encode('ascii'))
+            # Case-insensitive search gives up the regex engine's literal
+            # prefix scan, so text is lower-cased and searched case-sensitively
+            self._lowered = re.compile(alternation)
+            self._text = re.compile(alternation, re.IGNORECASE)
+    
+    def search(self, data):
+        """
+        Args:
+            data (bytes): Raw file contents (or a memory map), or text that
+                          has been decoded already
+        
+        Returns:
+            bool: False if no anchor occurs, so no pattern can match
+        """
+        if self._bytes is None:
+            return True
+        if isinstance(data, str):
+            return self._lowered.search(data.lower()) is not None
+        if not isinstance(data, bytes):
+            # A memory map has no lower(); a slice of it is bytes
+            data = data[:]
+        return self._bytes.search(data.lower()) is not None
+    
+    def windows(self, text, context=WINDOW_CONTEXT):
+        """
+        The parts of a text around its anchors, where matches can be.
+        
+        Each window reaches context characters beyond the anchors in it, out
+        to whole lines, and windows that overlap are merged.
+        
+        Args:
+            text (str): Decoded text
+            context (int): Characters kept on each side of an anchor
+        
+        Returns:
+            list: (start, end) offsets in text order; [] if no anchor occurs,
+                  and one window over the whole text if the patterns have no
+                  anchors
+        """
+        if self._text is None:
+            return [(0, len(text))]
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            search = self._lowered.search
+        else:
+            # A few characters lower-case to two, which would shift offsets
+            lowered = text
+            search = self._text.search
+        
+        windows = []
+        match = search(lowered)
+        while match is not None:
+            start = text.rfind('\n', 0, max(0, match.start() - context)) + 1
+            end = _line_end(text, match.end() + context)
+            if windows and start <= windows[-1][1]:
+                windows[-1][1] = end
+            else:
+                windows.append([start, end])
+            if end == len(text):
+                break
+            # Anchors before end - context would not extend the window
+            match = search(lowered, max(match.end(), end - context))
+        return [tuple(window) for window in windows]
+
+def _line_end(text, offset):
+    end = text.find('\n', offset)
+    return len(text) if end < 0 else end + 1
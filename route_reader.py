@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+import mmap
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+# Reads kept in flight at once. On network and overlay filesystems each open
+# and read waits milliseconds on the server, so overlapping many of them hides
+# most of that latency; on a local disk the extra threads cost little.
+DEFAULT_READ_AHEAD = 16
+
+# Files at least this large are memory-mapped instead of read into a copy
+DEFAULT_MMAP_THRESHOLD = 1024 * 1024
+
+# How source files are read: the number of reads kept in flight (1 reads each
+# file only when it is scanned), the size in bytes from which files are
+# memory-mapped (None never maps), whether contents stay bytes until they are
+# scanned rather than being decoded by the reading thread, and the function
+# files are opened with, called like open(file_path, 'rb')
+ReadOptions = namedtuple('ReadOptions', ['read_ahead', 'mmap_threshold', 'lazy_decode', 'opener'],
+                         defaults=(DEFAULT_READ_AHEAD, DEFAULT_MMAP_THRESHOLD, True, open))
+DEFAULT_READ_OPTIONS = ReadOptions()
+
+class Source:
+    """
+    The contents of one source file, as bytes or a read-only memory map,
+    decoded to text the first time it is needed.
+    """
+    
+    __slots__ = ('data', 'size', '_text')
+    
+    def __init__(self, data):
+        self.data = data
+        self.size = len(data)
+        self._text = None
+    
+    def text(self):
+        """
+        Returns:
+            str: The contents decoded as UTF-8, with line endings translated
+                 as open() does in text mode
+        
+        Raises:
+            UnicodeDecodeError: If the contents are not valid UTF-8
+        """
+        if self._text is None:
+            text = str(self.data, 'utf-8')
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            self._text = text
+            # The decoded text is all that is used from here on
+            self.close()
+        return self._text
+    
+    def close(self):
+        """
+        Release a memory map, or drop the bytes.
+        """
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.data = b''
+
+def read_source(file_path, options=DEFAULT_READ_OPTIONS):
+    """
+    Read one file.
+    
+    Args:
+        file_path (str): Path to the file
+        options (ReadOptions): Memory-map threshold, decoding and opener
+    
+    Returns:
+        Source: The file's contents; decoded already unless
+                options.lazy_decode is set
+    
+    Raises:
+        OSError: If the file cannot be read
+        UnicodeDecodeError: If it is decoded here and is not valid UTF-8
+    """
+    with options.opener(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if options.mmap_threshold is not None and size and size >= options.mmap_threshold:
+            source = Source(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        else:
+            source = Source(f.read())
+    if not options.lazy_decode:
+        source.text()
+    return source
+
+def _read(file_path, options):
+    try:
+        return read_source(file_path, options), None
+    except Exception as e:
+        return None, str(e)
+
+def read_sources(file_paths, options=DEFAULT_READ_OPTIONS):
+    """
+    Read files with up to options.read_ahead reads in flight, in order.
+    
+    Reads run on a thread pool and their results wait in a queue bounded by
+    the read-ahead, so while one file is being scanned the next ones are
+    already being fetched, and memory holds at most that many files.
+    
+    Errors are yielded rather than raised, so one unreadable file does not
+    stop the others.
+    
+    Args:
+        file_paths (list): Files to read
+        options (ReadOptions): Read-ahead, memory-map threshold, decoding
+                               and opener
+    
+    Yields:
+        tuple: (file_path, source, error) in the order of file_paths, where
+               source is a Source and error None, or source is None and
+               error the message of the exception raised
+    """
+    if options.read_ahead <= 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            yield (file_path,) + _read(file_path, options)
+        return
+    
+    remaining = iter(file_paths)
+    with ThreadPoolExecutor(max_workers=min(options.read_ahead, len(file_paths))) as pool:
+        pending = deque((file_path, pool.submit(_read, file_path, options))
+                        for file_path in islice(remaining, options.read_ahead))
+        while pending:
+            file_path, future = pending.popleft()
+            # Start the next read before waiting, to keep the pool busy
+            for next_path in islice(remaining, 1):
+                pending.append((next_path, pool.submit(_read, next_path, options)))
+            yield (file_path,) + future.result()
+
+class LatencyOpener:
+    """
+    Opens local files like open(), waiting a fixed time before every open and
+    read, to stand in for a network filesystem in tests and benchmarks.
+    
+    It also counts the files being opened or read at once, from the start of
+    an open to the close of the file, and keeps the peak in peak_in_flight.
+    
+    Instances can be pickled, so they also work in worker processes; each
+    process then counts its own reads.
+    """
+    
+    def __init__(self, latency):
+        """
+        Args:
+            latency (float): Seconds added to each open and read
+        """
+        self.latency = latency
+        self._reset()
+    
+    def _reset(self):
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+    
+    def __getstate__(self):
+        return {'latency': self.latency}
+    
+    def __setstate__(self, state):
+        self.latency = state['latency']
+        self._reset()
+    
+    def _started(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+    
+    def _finished(self):
+        with self._lock:
+            self.in_flight -= 1
+    
+    def __call__(self, file_path, mode='rb'):
+        self._started()
+        try:
+            time.sleep(self.latency)
+            f = open(file_path, mode)
+        except BaseException:
+            self._finished()
+            raise
+        return _LatencyFile(f, self.latency, self._finished)
+
+class _LatencyFile:
+    
+    def __init__(self, f, latency, on_close):
+        self._f = f
+        self._latency = latency
+        self._on_close = on_close
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def fileno(self):
+        return self._f.fileno()
+    
+    def read(self, size=-1):
+        time.sleep(self._latency)
+        return self._f.read(size)
+    
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+            self._on_close()
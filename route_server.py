@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from route_watch import apply_changes, next_changes
+
+DEFAULT_HOST = '127.0.0.1'
+
+class LintRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON query API over a warm RouteLinter.
+    
+    GET  /defined?route=POST /api/orders/:id   Is a route defined, and by which backend route?
+    GET  /callers?route=GET /api/users/:id     Which frontend calls resolve to a backend route?
+    GET  /suggest?route=GET /api/usres&k=3     Closest backend routes for a route
+    GET  /findings                             All current findings
+    POST /lint     {"files": [...]}            Refresh the files and report their findings
+    POST /refresh  {"files": [...]}            Refresh the files (omit files for a full rescan)
+    """
+    
+    # Set by create_server() on a subclass
+    linter = None
+    lock = None
+    
+    def log_message(self, format, *args):
+        # Editor plugins poll frequently; keep the server quiet
+        pass
+    
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _route_param(self, query):
+        route = query.get('route', [''])[0]
+        parts = route.split(' ', 1)
+        if len(parts) != 2:
+            raise ValueError("expected a 'route' parameter in the format 'METHOD /path'")
+        return parts[0].upper(), parts[1]
+    
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        try:
+            with self.lock:
+                if url.path == '/defined':
+                    method, path = self._route_param(query)
+                    route = self.linter.match(method, path)
+                    self._send(200, {'defined': route is not None, 'route': route})
+                elif url.path == '/callers':
+                    method, path = self._route_param(query)
+                    self._send(200, {'route': f'{method} {path}', 'callers': self.linter.callers(f'{method} {path}')})
+                elif url.path == '/suggest':
+                    method, path = self._route_param(query)
+                    k = int(query.get('k', ['1'])[0])
+                    matches = self.linter.suggestion_index.top(f'{method} {path}', k)
+                    self._send(200, {'suggestions': [{'route': route, 'score': score} for route, score in matches]})
+                elif url.path == '/findings':
+                    findings = sorted(self.linter.findings())
+                    self._send(200, {'findings': [{'kind': kind, 'route': route} for kind, route in findings]})
+                else:
+                    self._send(404, {'error': f'unknown endpoint {url.path}'})
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+    
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            body = self._read_json()
+            if not isinstance(body, dict):
+                raise ValueError('expected a JSON object')
+            files = body.get('files')
+            if files is not None and not (isinstance(files, list) and all(isinstance(path, str) for path in files)):
+                raise ValueError("expected 'files' to be a list of paths")
+            with self.lock:
+                if url.path == '/lint':
+                    if not files:
+                        raise ValueError("expected a 'files' list")
+                    report = self.linter.lint_files(files)
+                    self._send(200, {'files': {
+                        file_path: [{'kind': kind, 'route': route} for kind, route in findings]
+                        for file_path, findings in report.items()
+                    }})
+                elif url.path == '/refresh':
+                    if files:
+                        self.linter.refresh(files)
+                    else:
+                        self.linter.scan()
+                    self._send(200, {'refreshed': len(files) if files else 'all'})
+                else:
+                    self._send(404, {'error': f'unknown endpoint {url.path}'})
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+
+def _follow_changes(linter, watcher, lock):
+    """
+    Apply file system changes to the linter for as long as the server runs.
+    
+    A change that fails to apply is reported and the thread keeps following
+    later ones, rather than dying and leaving the server on stale results.
+    """
+    while True:
+        changes = next_changes(watcher)
+        with lock:
+            try:
+                apply_changes(linter, changes)
+            except Exception as e:
+                print(f"Error applying file changes: {e}", file=sys.stderr)
+                sys.stderr.flush()
+
+def create_server(linter, host=DEFAULT_HOST, port=0, watcher=None):
+    """
+    Create an HTTP server answering queries from a scanned linter.
+    
+    Args:
+        linter (RouteLinter): A linter that has already been scanned
+        host (str): Interface to bind, localhost by default
+        port (int): Port to bind (0 picks a free port)
+        watcher (InotifyWatcher or PollingWatcher): Optional watcher whose
+            changes are applied to the linter in a background thread
+    
+    Returns:
+        ThreadingHTTPServer: The server; call serve_forever() to run it
+    """
+    lock = threading.Lock()
+    handler = type('BoundLintRequestHandler', (LintRequestHandler,), {'linter': linter, 'lock': lock})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    
+    if watcher is not None:
+        thread = threading.Thread(target=_follow_changes, args=(linter, watcher, lock), daemon=True)
+        thread.start()
+    return server
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+
+import contextlib
+import heapq
+import json
+import os
+import time
+from collections import Counter
+
+DEFAULT_TOP_FILES = 10
+
+# Stages in the order they run, for the report
+STAGE_ORDER = ('walk', 'extract', 'resolve', 'traffic', 'suggest')
+
+class RunStats:
+    """
+    Per-stage wall and CPU times, file throughput and match counts for one run.
+    
+    Stage times are measured in this process. With --jobs > 1 the per-file
+    read and scan times come from the workers and are summed over files, so
+    they can exceed the wall time of the extract stage.
+    """
+    
+    enabled = True
+    
+    def __init__(self, top_files=DEFAULT_TOP_FILES):
+        """
+        Args:
+            top_files (int): Number of slowest files to keep
+        """
+        self.top_files = top_files
+        self.stages = {}                # stage -> {'wall': seconds, 'cpu': seconds, 'count': n}
+        self.files = 0                  # files read and scanned
+        self.cached_files = 0           # files answered from the extraction cache
+        self.errors = 0
+        self.bytes = 0
+        self.read_seconds = 0.0         # summed over files
+        self.scan_seconds = 0.0         # summed over files
+        self.prefiltered_files = 0      # files read but not scanned, as the prefilter rejected them
+        self.prefiltered_bytes = 0      # bytes of scanned files the prefilter kept from the patterns
+        self.duplicate_files = 0        # files not scanned, as an identical file was
+        self.duplicate_bytes = 0
+        self.pattern_counts = Counter()  # kind -> records extracted
+        self.skipped = Counter()        # reason -> paths skipped during the walk
+        self._slowest = []              # min-heap of (seconds, file path, bytes)
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._total = None
+    
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Time a block as part of a stage. A stage may be entered several times.
+        
+        Args:
+            name (str): Stage name, e.g. 'walk'
+        """
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            stage = self.stages.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'count': 0})
+            stage['wall'] += time.perf_counter() - start_wall
+            stage['cpu'] += time.process_time() - start_cpu
+            stage['count'] += 1
+    
+    def add_file(self, file_path, records, timing):
+        """
+        Record the result of extracting one file.
+        
+        Args:
+            file_path (str): The file
+            records (list): Extracted records, or None if the file failed
+            timing (tuple): (read seconds, scan seconds, bytes, bytes skipped by
+                            the prefilter), or None for a cache hit
+        """
+        if records is None:
+            self.errors += 1
+            return
+        self.pattern_counts.update(record[0] for record in records)
+        if timing is None:
+            self.cached_files += 1
+            return
+        
+        read_seconds, scan_seconds, size, skipped = timing
+        self.files += 1
+        self.bytes += size
+        self.prefiltered_bytes += skipped
+        if size and skipped == size:
+            self.prefiltered_files += 1
+        self.read_seconds += read_seconds
+        self.scan_seconds += scan_seconds
+        entry = (read_seconds + scan_seconds, file_path, size)
+        if len(self._slowest) < self.top_files:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+    
+    def add_duplicate(self, file_path, records):
+        """
+        Record a file that got the records of an identical file instead of
+        being extracted.
+        
+        Args:
+            file_path (str): The file
+            records (list): The shared records, or None if the first copy failed
+        """
+        if records is None:
+            self.errors += 1
+            return
+        self.pattern_counts.update(record[0] for record in records)
+        self.duplicate_files += 1
+        try:
+            self.duplicate_bytes += os.path.getsize(file_path)
+        except OSError:
+            pass
+    
+    def add_skipped(self, skipped):
+        """
+        Record how many paths the walk skipped, by reason.
+        
+        Args:
+            skipped (Counter): PathFilter.skipped, or None without a filter
+        """
+        if skipped:
+            self.skipped.update(skipped)
+    
+    def finish(self):
+        """
+        Stop the run clock. Called once the run's output has been written.
+        """
+        self._total = (time.perf_counter() - self._start_wall, time.process_time() - self._start_cpu)
+    
+    def slowest_files(self):
+        """
+        Returns:
+            list: (seconds, file path, bytes) tuples, slowest first
+        """
+        return sorted(self._slowest, reverse=True)
+    
+    def as_dict(self):
+        """
+        Stats as a JSON-serializable dictionary for dashboards.
+        
+        Returns:
+            dict: Totals, per-stage times, throughput, pattern counts and slowest files
+        """
+        if self._total is None:
+            self.finish()
+        total_wall, total_cpu = self._total
+        extract_wall = self.stages.get('extract', {}).get('wall', 0.0)
+        return {
+            'total': {'wall': total_wall, 'cpu': total_cpu},
+            'stages': {name: dict(stage) for name, stage in self.stages.items()},
+            'files': {
+                'scanned': self.files,
+                'cached': self.cached_files,
+                'errors': self.errors,
+                'bytes': self.bytes,
+                'read_seconds': self.read_seconds,
+                'scan_seconds': self.scan_seconds,
+                'prefiltered': self.prefiltered_files,
+                'prefiltered_bytes': self.prefiltered_bytes,
+                'duplicates': self.duplicate_files,
+                'duplicate_bytes': self.duplicate_bytes,
+                'files_per_second': self.files / extract_wall if extract_wall else 0.0,
+                'bytes_per_second': self.bytes / extract_wall if extract_wall else 0.0,
+            },
+            'patterns': dict(self.pattern_counts),
+            'skipped': dict(self.skipped),
+            'slowest_files': [
+                {'file': file_path, 'seconds': seconds, 'bytes': size}
+                for seconds, file_path, size in self.slowest_files()
+            ],
+        }
+    
+    def format_report(self):
+        """
+        Stats as a human-readable report.
+        
+        Returns:
+            list: Lines of the report
+        """
+        data = self.as_dict()
+        lines = ['Run statistics:']
+        lines.append(f"  {'stage':<10} {'wall ms':>10} {'cpu ms':>10}")
+        names = [name for name in STAGE_ORDER if name in data['stages']]
+        names += sorted(name for name in data['stages'] if name not in STAGE_ORDER)
+        for name in names:
+            stage = data['stages'][name]
+            lines.append(f"  {name:<10} {stage['wall'] * 1000:10.2f} {stage['cpu'] * 1000:10.2f}")
+        lines.append(f"  {'total':<10} {data['total']['wall'] * 1000:10.2f} {data['total']['cpu'] * 1000:10.2f}")
+        
+        files = data['files']
+        lines.append(
+            f"  Files: {files['scanned']} scanned, {files['cached']} from cache, {files['errors']} failed; "
+            f"{files['bytes'] / (1024 * 1024):.2f} MB"
+        )
+        lines.append(
+            f"  Throughput: {files['files_per_second']:,.0f} files/s, "
+            f"{files['bytes_per_second'] / (1024 * 1024):.1f} MB/s"
+        )
+        lines.append(f"  Per-file time: read+decode {files['read_seconds'] * 1000:.2f} ms, pattern scan {files['scan_seconds'] * 1000:.2f} ms")
+        if files['prefiltered_bytes']:
+            lines.append(
+                f"  Prefilter: {files['prefiltered']} files not scanned, "
+                f"{files['prefiltered_bytes'] / (1024 * 1024):.2f} MB skipped in all"
+            )
+        if files['duplicates']:
+            lines.append(
+                f"  Dedup: {files['duplicates']} files identical to a scanned file, "
+                f"{files['duplicate_bytes'] / (1024 * 1024):.2f} MB not scanned"
+            )
+        if data['patterns']:
+            lines.append('  Matches per pattern: ' + ', '.join(f'{kind} {count}' for kind, count in sorted(data['patterns'].items())))
+        if data['skipped']:
+            lines.append('  Skipped during walk: ' + ', '.join(f'{reason} {count}' for reason, count in sorted(data['skipped'].items())))
+        if data['slowest_files']:
+            lines.append(f"  Slowest {len(data['slowest_files'])} files:")
+            for entry in data['slowest_files']:
+                lines.append(f"    {entry['seconds'] * 1000:8.2f} ms  {entry['bytes']:>10} B  {entry['file']}")
+        return lines
+    
+    def write_json(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2)
+            f.write('\n')
+
+class NullStats:
+    """
+    Stand-in used when instrumentation is off. Every hook is a no-op, so the
+    hot paths only pay for an attribute lookup.
+    """
+    
+    enabled = False
+    _context = contextlib.nullcontext()
+    
+    def stage(self, name):
+        return self._context
+    
+    def add_file(self, file_path, records, timing):
+        pass
+    
+    def add_duplicate(self, file_path, records):
+        pass
+    
+    def add_skipped(self, skipped):
+        pass
+    
+    def finish(self):
+        pass
+
+NULL_STATS = NullStats()
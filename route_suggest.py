@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+
+import heapq
+import re
+from collections import Counter
+
+# Use the same scorer as thefuzz.process.extractOne when a fuzzy matching
+# library is installed, so existing --threshold values keep their meaning
+try:
+    from thefuzz.fuzz import WRatio as _external_wratio
+except ImportError:
+    try:
+        from rapidfuzz.fuzz import WRatio as _external_wratio
+    except ImportError:
+        _external_wratio = None
+
+# How many n-gram candidates are rescored with the full scorer per query
+DEFAULT_CANDIDATES = 32
+
+# On large indexes, n-grams shared by more routes than this fraction (and at
+# least MIN_COMMON_POSTINGS routes) carry little signal, think 'api' or 'get',
+# and are skipped when gathering candidates
+COMMON_GRAM_FRACTION = 0.05
+MIN_COMMON_POSTINGS = 5000
+
+NON_ALNUM_PATTERN = re.compile(r'[\W_]')
+
+def process_text(text):
+    """
+    Normalize text the way thefuzz's default processor does.
+    
+    Args:
+        text (str): Text to normalize
+    
+    Returns:
+        str: Lowercased text with each non-alphanumeric character replaced by a space
+    """
+    return NON_ALNUM_PATTERN.sub(' ', text).lower().strip()
+
+def _lcs_length(a, b):
+    """
+    Length of the longest common subsequence, using the bit-parallel
+    algorithm of Hyyro so each character of b costs a few big-int operations.
+    """
+    if not a or not b:
+        return 0
+    masks = {}
+    for i, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    row = full
+    for char in b:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return len(a) - bin(row).count('1')
+
+def ratio(a, b):
+    """
+    Normalized indel similarity, equivalent to fuzz.ratio.
+    
+    Returns:
+        float: Similarity between 0 and 100
+    """
+    total = len(a) + len(b)
+    if not total:
+        return 0.0
+    return 200.0 * _lcs_length(a, b) / total
+
+def _partial_windows(shorter, longer):
+    # Windows hanging off either end of the longer string count too, as in rapidfuzz
+    size = len(shorter)
+    for end in range(1, size):
+        yield longer[:end]
+    for start in range(len(longer) - size + 1):
+        yield longer[start:start + size]
+    for start in range(len(longer) - size + 1, len(longer)):
+        yield longer[start:]
+
+def partial_ratio(a, b):
+    """
+    Best ratio between the shorter string and any window of the longer one,
+    equivalent to fuzz.partial_ratio.
+    
+    Returns:
+        float: Similarity between 0 and 100
+    """
+    shorter, longer = (a, b) if len(a) <= len(b) else (b, a)
+    if not shorter:
+        return 0.0
+    best = 0.0
+    for window in _partial_windows(shorter, longer):
+        best = max(best, ratio(shorter, window))
+        if best == 100.0:
+            return best
+    if len(a) == len(b):
+        # Equal lengths are compared in both directions
+        for window in _partial_windows(longer, shorter):
+            best = max(best, ratio(longer, window))
+    return best
+
+def _token_set_strings(a, b):
+    tokens_a = set(a.split())
+    tokens_b = set(b.split())
+    common = ' '.join(sorted(tokens_a & tokens_b))
+    rest_a = ' '.join(sorted(tokens_a - tokens_b))
+    rest_b = ' '.join(sorted(tokens_b - tokens_a))
+    combined_a = f'{common} {rest_a}'.strip()
+    combined_b = f'{common} {rest_b}'.strip()
+    return common, combined_a, combined_b
+
+def _sorted_tokens(text):
+    return ' '.join(sorted(text.split()))
+
+def wratio(a, b):
+    """
+    Weighted similarity modelled on fuzz.WRatio, the scorer used by
+    thefuzz.process.extractOne.
+    
+    Args:
+        a (str): Text processed with process_text
+        b (str): Text processed with process_text
+    
+    Returns:
+        int: Similarity between 0 and 100
+    """
+    if not a or not b:
+        return 0
+    if _external_wratio is not None:
+        return int(round(_external_wratio(a, b)))
+    
+    length_ratio = max(len(a), len(b)) / min(len(a), len(b))
+    best = ratio(a, b)
+    common, combined_a, combined_b = _token_set_strings(a, b)
+    
+    if length_ratio < 1.5:
+        token_sort = ratio(_sorted_tokens(a), _sorted_tokens(b))
+        token_set = max(ratio(common, combined_a), ratio(common, combined_b), ratio(combined_a, combined_b)) if common else ratio(combined_a, combined_b)
+        return int(round(max(best, token_sort * 0.95, token_set * 0.95)))
+    
+    scale = 0.9 if length_ratio < 8 else 0.6
+    partial = partial_ratio(a, b)
+    partial_sort = partial_ratio(_sorted_tokens(a), _sorted_tokens(b))
+    partial_set = max(partial_ratio(common, combined_a), partial_ratio(common, combined_b), partial_ratio(combined_a, combined_b)) if common else partial_ratio(combined_a, combined_b)
+    return int(round(max(best, partial * scale, partial_sort * 0.95 * scale, partial_set * 0.95 * scale)))
+
+def _score_bound(len_a, len_b):
+    """
+    Upper bound on wratio for texts of these lengths, from the weights
+    WRatio puts on each of its terms at that length ratio.
+    """
+    if not len_a or not len_b:
+        return 0
+    shorter, longer = min(len_a, len_b), max(len_a, len_b)
+    ratio_bound = 200.0 * shorter / (shorter + longer)
+    if longer / shorter < 1.5:
+        cap = 95
+    elif longer / shorter < 8:
+        cap = 90
+    else:
+        cap = 60
+    return int(round(max(ratio_bound, cap)))
+
+def _grams(text):
+    """
+    Segment-aware trigrams: grams never span a token boundary, and each token
+    is padded so short segments like 'id' still produce grams.
+    """
+    grams = set()
+    for token in text.split():
+        padded = f' {token} '
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+class SuggestionIndex:
+    """
+    Fuzzy suggestion engine built once over the backend routes.
+    
+    An inverted index from trigrams to routes narrows each query to the
+    routes with the highest trigram overlap, and only those candidates are
+    scored with the full WRatio-style scorer.
+    """
+    
+    def __init__(self, routes, candidates=DEFAULT_CANDIDATES):
+        """
+        Args:
+            routes (iterable): Backend route strings
+            candidates (int): Number of n-gram candidates rescored per query
+        """
+        self.routes = sorted(routes)
+        self.candidates = candidates
+        self._processed = [process_text(route) for route in self.routes]
+        self._postings = {}
+        self._gram_counts = []
+        for route_id, text in enumerate(self._processed):
+            grams = _grams(text)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(route_id)
+        self._common_limit = max(MIN_COMMON_POSTINGS, int(len(self.routes) * COMMON_GRAM_FRACTION))
+    
+    def _candidate_ids(self, grams):
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not postings or len(self.routes) <= self.candidates:
+            # Small indexes are cheaper to score exhaustively
+            return range(len(self.routes))
+        rare = [ids for ids in postings if len(ids) <= self._common_limit] or postings
+        counts = Counter()
+        for ids in rare:
+            counts.update(ids)
+        
+        # Rank by Dice coefficient so long routes do not win on raw overlap alone
+        total = len(grams)
+        gram_counts = self._gram_counts
+        ranked = heapq.nlargest(
+            self.candidates, counts.items(),
+            key=lambda item: (item[1] / (total + gram_counts[item[0]]), -item[0])
+        )
+        return [route_id for route_id, _ in ranked]
+    
+    def top(self, query, k=1, threshold=0):
+        """
+        Find the k best matching backend routes for a query.
+        
+        Candidates are scored in order of their score bound, and scoring stops
+        once no remaining candidate can reach the threshold or the current
+        k-th best score.
+        
+        Args:
+            query (str): The undefined frontend route
+            k (int): Number of suggestions to return
+            threshold (int): Minimum score for a route to be returned
+        
+        Returns:
+            list: (route, score) tuples, best first
+        """
+        if k < 1:
+            return []
+        text = process_text(query)
+        processed = self._processed
+        bounds = {route_id: _score_bound(len(text), len(processed[route_id])) for route_id in self._candidate_ids(_grams(text))}
+        kept = []
+        for route_id in sorted(bounds, key=bounds.get, reverse=True):
+            bound = bounds[route_id]
+            if bound < threshold or (len(kept) == k and bound < kept[0][0]):
+                break
+            if len(kept) == k and (bound, -route_id) < kept[0]:
+                continue
+            score = wratio(text, processed[route_id])
+            if score < threshold:
+                continue
+            if len(kept) < k:
+                heapq.heappush(kept, (score, -route_id))
+            else:
+                heapq.heappushpop(kept, (score, -route_id))
+        return [(self.routes[-neg_id], score) for score, neg_id in sorted(kept, reverse=True)]
+    
+    def best(self, query):
+        """
+        Find the best matching backend route for a query.
+        
+        Args:
+            query (str): The undefined frontend route
+        
+        Returns:
+            tuple: (route, score), or (None, 0) if there are no routes
+        """
+        matches = self.top(query, 1)
+        return matches[0] if matches else (None, 0)
+    
+    def suggest_many(self, queries, threshold=0, k=1):
+        """
+        Suggest fixes for a batch of undefined routes.
+        
+        Each distinct query is scored once, even if it appears many times.
+        Routes scoring below the threshold are not scored in full, so a query
+        with no accepted suggestion maps to an empty list.
+        
+        Args:
+            queries (iterable): Undefined frontend routes
+            threshold (int): Minimum score for a suggestion to be accepted
+            k (int): Number of suggestions per query
+        
+        Returns:
+            dict: Maps each query to a list of (route, score, accepted) tuples
+        """
+        results = {}
+        for query in queries:
+            if query not in results:
+                results[query] = [(route, score, score >= threshold) for route, score in self.top(query, k, threshold)]
+        return results
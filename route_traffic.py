@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+
+import gzip
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from route_index import RouteIndex, split_backend_path
+from route_paths import ORIGIN_PATTERN
+
+# Bytes of log read per batch. Lines are parsed a whole batch at a time with
+# one regex pass, so larger batches cost fewer Python-level steps per line
+# while memory stays bounded by the batch, not the log.
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Bytes looked at to tell which format a log is in
+SNIFF_SIZE = 64 * 1024
+
+# Most distinct (method, path) pairs whose matching route is remembered. Logs
+# repeat the same few paths millions of times, so most lookups are hits; the
+# memo is dropped when it fills, which bounds memory on paths with ids in them.
+MATCH_CACHE_SIZE = 1 << 16
+
+# A path segment that is a record id: decimal or hex digits and dashes
+# starting with a decimal digit, or a UUID
+ID_SEGMENT_PATTERN = re.compile(rb'/(?:[0-9]|[a-fA-F][0-9a-fA-F]{7}-)[0-9a-fA-F-]*(?=/|$)', re.MULTILINE)
+
+_METHODS = rb'GET|HEAD|POST|PUT|PATCH|DELETE|OPTIONS'
+_JSON_METHOD = rb'"(?:method|verb|request_method)"\s*:\s*"([A-Za-z]+)"'
+_JSON_PATH = rb'"(?:url|path|uri|originalUrl|request_uri)"\s*:\s*"([^"?#\n]*)'
+
+# One pattern per log format, matching at most once per line with the method
+# and the path (without its query string) as groups. Each consumes its line
+# to the end, so the search resumes at the next line.
+LOG_PATTERNS = {
+    # nginx and Apache combined/common, and morgan's 'combined' and 'common':
+    # ... "GET /api/users?page=2 HTTP/1.1" 200 ...
+    'combined': re.compile(rb'^[^"\n]*"([A-Z]+) ([^\s"?#]+)[^\n]*', re.MULTILINE),
+    # morgan 'dev', 'short' and 'tiny', possibly with ANSI colors:
+    # GET /api/users 200 1.234 ms - 12
+    'morgan': re.compile(rb'^[^\n]*?(?<![A-Z])(' + _METHODS + rb') (/[^\s?#]*)[^\n]*', re.MULTILINE),
+    # One JSON object per line with method and url (or path) keys in either
+    # order, as written by pino-http, bunyan, nginx's escape=json and others
+    'jsonl': re.compile(
+        rb'^[^\n]*?' + _JSON_METHOD + rb'[^\n]*?' + _JSON_PATH + rb'[^\n]*'
+        rb'|^[^\n]*?' + _JSON_PATH + rb'[^\n]*?' + _JSON_METHOD + rb'[^\n]*',
+        re.MULTILINE
+    ),
+}
+
+LOG_FORMATS = ('auto',) + tuple(LOG_PATTERNS)
+
+class TrafficCounts:
+    """
+    Requests counted from access logs, per backend route.
+    """
+    
+    __slots__ = ('hits', 'lines', 'matched', 'unmatched', 'unparsed', 'errors')
+    
+    def __init__(self):
+        self.hits = Counter()   # backend route -> number of requests
+        self.lines = 0          # log lines read
+        self.matched = 0        # requests that resolved to a backend route
+        self.unmatched = 0      # requests that resolved to none
+        self.unparsed = 0       # lines that were not a request in the log's format
+        self.errors = []        # (log path, message) for each log that could not be read
+    
+    def merge(self, other):
+        """
+        Add the counts of another log, or of another part of one.
+        
+        Args:
+            other (TrafficCounts): Counts to add
+        """
+        self.hits.update(other.hits)
+        self.lines += other.lines
+        self.matched += other.matched
+        self.unmatched += other.unmatched
+        self.unparsed += other.unparsed
+        self.errors.extend(other.errors)
+    
+    def as_dict(self):
+        """
+        Returns:
+            dict: Line and request totals, without the per-route hits
+        """
+        return {'lines': self.lines, 'matched': self.matched, 'unmatched': self.unmatched, 'unparsed': self.unparsed}
+
+def _open(file_path):
+    if file_path.endswith('.gz'):
+        return gzip.open(file_path, 'rb')
+    return open(file_path, 'rb')
+
+def detect_format(data):
+    """
+    Tell which format a log is in from its first lines.
+    
+    Args:
+        data (bytes): The start of the log
+    
+    Returns:
+        str: The key in LOG_PATTERNS that parses most of its lines;
+             'combined' if none parses any
+    """
+    data = data[:data.rfind(b'\n') + 1] or data
+    counts = {name: len(pattern.findall(data)) for name, pattern in LOG_PATTERNS.items()}
+    # Ties go to the more specific format, in the order of LOG_PATTERNS
+    return max(LOG_PATTERNS, key=lambda name: counts[name])
+
+def ids_are_opaque(routes):
+    """
+    Check if record ids in request paths can be told apart from every
+    static route segment, so that any id matches the same routes as any other.
+    
+    That holds unless a route has a static segment that looks like an id,
+    or a param whose constraint may accept some ids and not others.
+    
+    Args:
+        routes (iterable): Route strings in the format 'METHOD /path'
+    
+    Returns:
+        bool: True if ids may be replaced by one stand-in before matching
+    """
+    for route in routes:
+        for segments in split_backend_path(route.split(' ', 1)[-1]):
+            for kind, value in segments:
+                if (kind == 'param' and value) or (kind == 'static' and ID_SEGMENT_PATTERN.fullmatch(b'/' + value.encode())):
+                    return False
+    return True
+
+class RequestResolver:
+    """
+    Resolves logged requests to backend routes.
+    
+    Most requests differ only in the record ids in their paths, so when
+    ids_are_opaque holds, ids are replaced by one stand-in for a whole batch
+    at once, and only the few distinct request shapes left are matched
+    against the route index, each once.
+    """
+    
+    def __init__(self, routes):
+        """
+        Args:
+            routes (iterable): Route strings in the format 'METHOD /path'
+        """
+        routes = list(routes)
+        self._route_index = RouteIndex(routes)
+        self.collapse_ids = ids_are_opaque(routes)
+        self._routes = {}
+    
+    def shapes(self, paths):
+        """
+        Args:
+            paths (sequence): Request paths as bytes
+        
+        Returns:
+            sequence: The paths with ids replaced, if that is safe
+        """
+        if not self.collapse_ids or not paths:
+            return paths
+        return ID_SEGMENT_PATTERN.sub(b'/0', b'\n'.join(paths)).split(b'\n')
+    
+    def resolve(self, method, path):
+        """
+        Args:
+            method (bytes): Logged method
+            path (bytes): Logged path or path shape, without query string
+        
+        Returns:
+            str: The matching backend route string, or None
+        """
+        key = (method, path)
+        if key in self._routes:
+            return self._routes[key]
+        method = method.decode('ascii').upper()
+        path = path.decode('utf-8', 'replace')
+        if not path.startswith('/'):
+            # Proxies log absolute URLs
+            path = ORIGIN_PATTERN.sub('', path, count=1)
+        route = self._route_index.match_request(method, path)
+        if route is None and method == 'HEAD':
+            # Express answers HEAD with the GET handler
+            route = self._route_index.match_request('GET', path)
+        if len(self._routes) >= MATCH_CACHE_SIZE:
+            self._routes.clear()
+        self._routes[key] = route
+        return route
+
+class _Matcher:
+    """
+    Counts the requests of batches of log lines per backend route.
+    """
+    
+    def __init__(self, resolver, log_format):
+        self._resolver = resolver
+        self._pattern = LOG_PATTERNS[log_format]
+        self._jsonl = log_format == 'jsonl'
+        self.counts = TrafficCounts()
+    
+    def add(self, batch):
+        """
+        Count one batch of whole lines.
+        
+        Every step runs over the whole batch in C (one regex pass, joins
+        and a Counter); Python code only runs per distinct request shape.
+        
+        Args:
+            batch (bytes): Log lines, the last one with or without its newline
+        """
+        if not batch:
+            return
+        counts = self.counts
+        lines = batch.count(b'\n') + (not batch.endswith(b'\n'))
+        counts.lines += lines
+        found = self._pattern.findall(batch)
+        counts.unparsed += lines - len(found)
+        if not found:
+            return
+        
+        columns = list(zip(*found))
+        if self._jsonl:
+            # Either key order fills its own pair of groups, the other is empty
+            methods = list(map(bytes.__add__, columns[0], columns[3]))
+            paths = b'\n'.join(map(bytes.__add__, columns[1], columns[2])).replace(b'\\/', b'/').split(b'\n')
+        else:
+            methods, paths = columns
+        
+        for (method, path), count in Counter(zip(methods, self._resolver.shapes(paths))).items():
+            route = self._resolver.resolve(method, path)
+            if route is None:
+                counts.unmatched += count
+            else:
+                counts.hits[route] += count
+                counts.matched += count
+
+def _count_stream(f, matcher, limit=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    tail = b''
+    while limit is None or limit > 0:
+        chunk = f.read(chunk_size if limit is None else min(chunk_size, limit))
+        if not chunk:
+            break
+        if limit is not None:
+            limit -= len(chunk)
+        data = tail + chunk if tail else chunk
+        cut = data.rfind(b'\n') + 1
+        matcher.add(data[:cut])
+        tail = data[cut:]
+    matcher.add(tail)
+
+def count_log(file_path, resolver, log_format='auto', start=0, end=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Count the requests in an access log, or in a byte range of one, per
+    backend route.
+    
+    The log is read in batches of chunk_size bytes cut at the last line end,
+    so memory does not grow with the size of the log. Files ending in .gz
+    are decompressed as they are read.
+    
+    Args:
+        file_path (str): Path to the log
+        resolver (RequestResolver): Resolver for the backend routes
+        log_format (str): One of LOG_FORMATS
+        start (int): Offset of the first line to read; must start a line
+        end (int): Offset after the last line to read (None for the end)
+        chunk_size (int): Bytes read per batch
+    
+    Returns:
+        TrafficCounts: The requests counted
+    
+    Raises:
+        OSError: If the log cannot be read
+    """
+    with _open(file_path) as f:
+        if log_format == 'auto':
+            log_format = detect_format(f.read(SNIFF_SIZE))
+            f.seek(start)
+        elif start:
+            f.seek(start)
+        matcher = _Matcher(resolver, log_format)
+        _count_stream(f, matcher, None if end is None else end - start, chunk_size)
+    return matcher.counts
+
+def split_ranges(file_path, parts):
+    """
+    Split a log into byte ranges of about equal size that start and end on
+    line boundaries, for counting in parallel.
+    
+    Args:
+        file_path (str): Path to an uncompressed log
+        parts (int): Number of ranges wanted
+    
+    Returns:
+        list: (start, end) offsets; fewer than parts if the log has fewer lines
+    """
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, 'rb') as f:
+        for part in range(1, parts):
+            offset = size * part // parts
+            if offset <= bounds[-1]:
+                continue
+            # The range ends after the line that holds its last byte
+            f.seek(offset - 1)
+            f.readline()
+            if f.tell() > bounds[-1]:
+                bounds.append(min(f.tell(), size))
+    if bounds[-1] < size:
+        bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+# Resolver of a worker process, built once by _init_worker
+_worker_resolver = None
+
+def _init_worker(routes):
+    global _worker_resolver
+    _worker_resolver = RequestResolver(routes)
+
+def _count_part(file_path, log_format, start, end, chunk_size):
+    return count_log(file_path, _worker_resolver, log_format, start, end, chunk_size)
+
+class AccessLogs:
+    """
+    A set of access logs to count requests from, e.g. to tell backend routes
+    that no frontend calls but that serve live traffic from routes that are
+    truly dead.
+    """
+    
+    def __init__(self, file_paths, log_format='auto', jobs=1, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            file_paths (list): Paths to the logs (.gz files are decompressed)
+            log_format (str): One of LOG_FORMATS; 'auto' detects it per log
+            jobs (int): Worker processes. Uncompressed logs are split into
+                        line-aligned byte ranges, one per worker; a compressed
+                        log cannot be entered mid-stream, so it is counted
+                        whole by one worker
+            chunk_size (int): Bytes read per batch
+        """
+        self.file_paths = list(file_paths)
+        self.log_format = log_format
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+    
+    def _tasks(self, file_path):
+        log_format = self.log_format
+        if file_path.endswith('.gz') or self.jobs <= 1:
+            return [(file_path, log_format, 0, None)]
+        if log_format == 'auto':
+            # Decided once, as only the first range holds the start of the log
+            with open(file_path, 'rb') as f:
+                log_format = detect_format(f.read(SNIFF_SIZE))
+        return [(file_path, log_format, start, end) for start, end in split_ranges(file_path, self.jobs)]
+    
+    def count(self, routes):
+        """
+        Count the requests in all logs per backend route.
+        
+        A log that cannot be read, e.g. a missing file or a truncated .gz,
+        is left out whole and listed in the errors of the result; the other
+        logs are still counted.
+        
+        Args:
+            routes (iterable): Backend route strings in the format 'METHOD /path'
+        
+        Returns:
+            TrafficCounts: The requests counted
+        """
+        errors = {}     # log path -> message
+        logs = {}       # log path -> TrafficCounts
+        tasks = []
+        for file_path in self.file_paths:
+            try:
+                tasks.extend(self._tasks(file_path))
+            except OSError as e:
+                errors[file_path] = str(e)
+        
+        def add(file_path, part):
+            try:
+                part = part()
+            except (OSError, EOFError) as e:
+                # gzip.BadGzipFile is an OSError; a log cut short mid-stream raises EOFError
+                errors.setdefault(file_path, str(e))
+                return
+            logs.setdefault(file_path, TrafficCounts()).merge(part)
+        
+        if self.jobs <= 1 or len(tasks) <= 1:
+            resolver = RequestResolver(routes)
+            for file_path, log_format, start, end in tasks:
+                add(file_path, lambda: count_log(file_path, resolver, log_format, start, end, self.chunk_size))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.jobs, len(tasks)), initializer=_init_worker,
+                                     initargs=(tuple(routes),)) as pool:
+                futures = [(task[0], pool.submit(_count_part, *task, self.chunk_size)) for task in tasks]
+                for file_path, future in futures:
+                    add(file_path, future.result)
+        
+        counts = TrafficCounts()
+        # A log given twice was counted twice above, and is merged once here
+        for file_path in dict.fromkeys(self.file_paths):
+            if file_path in errors:
+                counts.errors.append((file_path, errors[file_path]))
+            elif file_path in logs:
+                counts.merge(logs[file_path])
+        return counts
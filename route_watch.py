@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# inotify event flags from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Saves show up as a close-after-write, or as a rename when editors write atomically
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+EVENT_HEADER = struct.Struct('iIII')
+
+# Returned by read_changes() when events were lost and a full rescan is needed
+RESCAN = object()
+
+# How long to keep collecting events after the first one, so a burst of
+# writes (a branch switch, a formatter run) is re-linted once
+DEFAULT_DEBOUNCE = 0.03
+DEFAULT_POLL_INTERVAL = 0.5
+
+def _walk(directory, path_filter=None, scope=None):
+    """
+    Walk a watched tree, pruning what the run's walk would skip.
+    
+    Args:
+        directory (str): Directory to walk
+        path_filter (PathFilter): Filter of the linted walk (None to keep everything)
+        scope (tuple): Ignore scope above the directory, as from
+            PathFilter.root_scope (None to start a new one at the directory)
+    
+    Yields:
+        tuple: (directory, its scope, names of the files kept in it)
+    """
+    if path_filter is not None and scope is None:
+        scope = path_filter.root_scope(os.path.abspath(directory))
+    scopes = {directory: scope}
+    for root, dirs, names in os.walk(directory):
+        scope = scopes.pop(root)
+        if path_filter is not None:
+            abs_root = os.path.abspath(root)
+            scope = path_filter.enter_dir(abs_root, dirs + names, scope)
+            dirs[:] = [name for name in dirs if not path_filter.skip_dir(name, os.path.join(abs_root, name), scope)]
+            names = [name for name in names if not path_filter.skip_file(os.path.join(abs_root, name), scope)]
+        scopes.update((os.path.join(root, name), scope) for name in dirs)
+        yield root, scope, names
+
+class InotifyWatcher:
+    """
+    Recursive directory watcher built on Linux inotify via ctypes.
+    """
+    
+    def __init__(self, directories, path_filter=None):
+        """
+        Args:
+            directories (list): Directories to watch recursively
+            path_filter (PathFilter): Directories it prunes are not watched,
+                and files it skips are not reported when a directory appears
+        
+        Raises:
+            OSError: If inotify is unavailable or the watch limit is reached
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.path_filter = path_filter
+        self._paths = {}
+        self._scopes = {}   # watch descriptor -> ignore scope of its directory
+        for directory in directories:
+            self._watch_tree(directory)
+    
+    def _watch_tree(self, directory, scope=None):
+        """
+        Watch a directory and everything below it that is not pruned.
+        
+        Returns:
+            list: Files found below the directory, so files created together
+                  with a new directory are not missed
+        """
+        files = []
+        for root, root_scope, names in _walk(directory, self.path_filter, scope):
+            wd = self._add_watch(self._fd, os.fsencode(root), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, f'inotify_add_watch failed for {root}: {os.strerror(errno)}')
+            self._paths[wd] = root
+            self._scopes[wd] = root_scope
+            files.extend(os.path.join(root, name) for name in names)
+        return files
+    
+    def read_changes(self, timeout):
+        """
+        Wait for file system events.
+        
+        Args:
+            timeout (float): Seconds to wait, or None to wait indefinitely
+        
+        Returns:
+            set: Paths that changed, empty on timeout, or RESCAN if the
+                 kernel queue overflowed and events were lost
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        
+        changes = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                name = os.fsdecode(buffer[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0'))
+                offset += EVENT_HEADER.size + length
+                
+                if mask & IN_Q_OVERFLOW:
+                    return RESCAN
+                directory = self._paths.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self._paths[wd]
+                    del self._scopes[wd]
+                    continue
+                if not name:
+                    continue
+                
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    scope = self._scopes[wd]
+                    if self.path_filter is not None and self.path_filter.skip_dir(name, os.path.abspath(path), scope):
+                        # Nothing under a pruned directory is linted, e.g. a fresh node_modules
+                        continue
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        changes.update(self._watch_tree(path, scope))
+                    else:
+                        # A removed or renamed-away directory takes its files with it
+                        changes.add(path + os.sep)
+                    continue
+                changes.add(path)
+        return changes
+    
+    def close(self):
+        os.close(self._fd)
+
+class PollingWatcher:
+    """
+    Portable fallback watcher that compares mtime/size snapshots.
+    """
+    
+    def __init__(self, directories, interval=DEFAULT_POLL_INTERVAL, path_filter=None):
+        """
+        Args:
+            directories (list): Directories to watch recursively
+            interval (float): Seconds between snapshots
+            path_filter (PathFilter): Directories it prunes and files it
+                skips are left out of the snapshots
+        """
+        self.directories = directories
+        self.interval = interval
+        self.path_filter = path_filter
+        self._snapshot = self._take_snapshot()
+    
+    def _take_snapshot(self):
+        snapshot = {}
+        for directory in self.directories:
+            for root, _, names in _walk(directory, self.path_filter):
+                for name in names:
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+    
+    def read_changes(self, timeout):
+        """
+        Wait for the next snapshot and report what differs.
+        
+        Args:
+            timeout (float): Seconds to wait, or None to wait one interval
+        
+        Returns:
+            set: Paths that were added, changed or deleted
+        """
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        snapshot = self._take_snapshot()
+        changes = {path for path, stat in snapshot.items() if self._snapshot.get(path) != stat}
+        changes.update(path for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        return changes
+    
+    def close(self):
+        pass
+
+def create_watcher(directories, polling=False, interval=DEFAULT_POLL_INTERVAL, path_filter=None):
+    """
+    Create the best available watcher for the given directories.
+    
+    Args:
+        directories (list): Directories to watch recursively
+        polling (bool): Force the polling watcher
+        interval (float): Polling interval in seconds
+        path_filter (PathFilter): Filter of the linted walk, so pruned
+            directories such as node_modules are not watched
+    
+    Returns:
+        InotifyWatcher or PollingWatcher: The watcher
+    """
+    # Nested directories are covered by their parent's watch. Paths are kept as
+    # given so reported changes line up with the paths the linter indexed.
+    top_dirs = []
+    for directory in directories:
+        abs_dir = os.path.abspath(directory)
+        if any(abs_dir == os.path.abspath(other) or abs_dir.startswith(os.path.abspath(other) + os.sep) for other in top_dirs):
+            continue
+        top_dirs = [other for other in top_dirs if not os.path.abspath(other).startswith(abs_dir + os.sep)]
+        top_dirs.append(directory)
+    
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(top_dirs, path_filter)
+        except (OSError, AttributeError) as e:
+            print(f"Note: inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(top_dirs, interval, path_filter)
+
+def _expand_removed_dirs(linter, changes):
+    """
+    Replace removed-directory markers with the indexed files below them.
+    """
+    expanded = set()
+    known = linter.known_files()
+    for path in changes:
+        if path.endswith(os.sep):
+            prefix = os.path.abspath(path) + os.sep
+            expanded.update(file_path for file_path in known if os.path.abspath(file_path).startswith(prefix))
+        else:
+            expanded.add(path)
+    return expanded
+
+def format_finding(finding):
+    """
+    Format a finding for the watch report.
+    
+    Args:
+        finding (tuple): ('unused', route) or ('undefined', route key)
+    
+    Returns:
+        str: Human-readable description
+    """
+    kind, route = finding
+    if kind == 'unused':
+        return f"backend route not used in frontend: {route}"
+    return f"frontend API call with no matching backend route: {route}"
+
+def next_changes(watcher, debounce=DEFAULT_DEBOUNCE):
+    """
+    Wait for the next burst of changes.
+    
+    Args:
+        watcher (InotifyWatcher or PollingWatcher): Source of change events
+        debounce (float): Seconds to keep collecting events after the first
+    
+    Returns:
+        set: Changed paths, or RESCAN
+    """
+    changes = set()
+    while not changes:
+        changes = watcher.read_changes(None)
+    # Collect the rest of the burst into the same re-lint
+    while changes is not RESCAN:
+        more = watcher.read_changes(debounce)
+        if not more:
+            break
+        changes = RESCAN if more is RESCAN else changes | more
+    return changes
+
+def apply_changes(linter, changes):
+    """
+    Apply a burst of changes to the linter.
+    
+    Args:
+        linter (RouteLinter): The linter to refresh
+        changes (set): Changed paths from next_changes, or RESCAN
+    
+    Returns:
+        str: Description of what was applied
+    """
+    if changes is RESCAN:
+        linter.scan()
+        return "event queue overflowed, rescanned"
+    changes = _expand_removed_dirs(linter, changes)
+    linter.refresh(changes)
+    return f"{len(changes)} file(s) changed"
+
+def watch(linter, watcher, debounce=DEFAULT_DEBOUNCE, max_events=None):
+    """
+    Re-lint changed files and print findings that appear or go away.
+    
+    Args:
+        linter (RouteLinter): A linter that has already been scanned
+        watcher (InotifyWatcher or PollingWatcher): Source of change events
+        debounce (float): Seconds to keep collecting events after the first
+        max_events (int): Stop after this many re-lints (None runs forever)
+    """
+    previous = linter.findings()
+    handled = 0
+    while max_events is None or handled < max_events:
+        changes = next_changes(watcher, debounce)
+        start = time.perf_counter()
+        description = apply_changes(linter, changes)
+        current = linter.findings()
+        elapsed = (time.perf_counter() - start) * 1000
+        handled += 1
+        
+        appeared = sorted(current - previous)
+        resolved = sorted(previous - current)
+        previous = current
+        print(f"\n[{time.strftime('%H:%M:%S')}] {description}, re-linted in {elapsed:.1f} ms")
+        for finding in appeared:
+            print(f"  + WARNING: {format_finding(finding)}")
+        for finding in resolved:
+            print(f"  - Resolved: {format_finding(finding)}")
+        if not appeared and not resolved:
+            print("  No change in findings")
+        sys.stdout.flush()
@@ -1,9 +1,30 @@
 #!/usr/bin/env python3
 
 import unittest
+import argparse
+import gzip
+import json
 import subprocess
 import sys
 import os
+import shutil
+import tempfile
+import time
+
+import parse_frontend_calls
+import route_cache
+import route_calls
+import route_dedup
+import route_ignore
+import route_index_file
+import route_lexer
+import route_linter
+import route_mounts
+import route_paths
+import route_prefilter
+import route_reader
+import route_stats
+import route_traffic
 
 class TestRouteLinter(unittest.TestCase):
     
@@ -46,6 +67,1188 @@ class TestRouteLinter(unittest.TestCase):
         self.assertEqual(result.returncode, 0)
         self.assertIn("Backend path: ./test_backend", result.stdout)
         self.assertIn("Frontend path: ./test_frontend", result.stdout)
+    
+    def test_parallel_matches_serial(self):
+        """Test that --jobs produces the same results as a serial scan"""
+        with tempfile.TemporaryDirectory() as tmp:
+            # Enough copies of the fixtures to cross the parallel threshold
+            for i in range(route_linter.MIN_PARALLEL_FILES // 2):
+                shutil.copytree("test_backend", os.path.join(tmp, "backend", f"pkg{i}"))
+                shutil.copytree("test_frontend", os.path.join(tmp, "frontend", f"pkg{i}"))
+            backend = os.path.join(tmp, "backend")
+            frontend = os.path.join(tmp, "frontend")
+            
+            self.assertEqual(route_linter.parse_backend_routes(backend, jobs=1),
+                             route_linter.parse_backend_routes(backend, jobs=4))
+            self.assertEqual(route_linter.parse_frontend_calls(frontend, jobs=1),
+                             route_linter.parse_frontend_calls(frontend, jobs=4))
+    
+    def test_extraction_cache(self):
+        """Test that unchanged files are served from the cache"""
+        with tempfile.TemporaryDirectory() as tmp:
+            frontend = os.path.join(tmp, "frontend")
+            shutil.copytree("test_frontend", frontend)
+            file_count = len(route_linter.walk_sources([("frontend", frontend, route_linter.FRONTEND_EXTENSIONS)]))
+            cache_dir = os.path.join(tmp, "cache")
+            
+            cache = route_linter.make_cache(cache_dir)
+            expected = route_linter.parse_frontend_calls(frontend, cache=cache)
+            self.assertEqual(cache.misses, file_count)
+            
+            cache = route_linter.make_cache(cache_dir)
+            self.assertEqual(route_linter.parse_frontend_calls(frontend, cache=cache), expected)
+            self.assertEqual(cache.hits, file_count)
+            
+            # A changed file is re-extracted, the rest are still hits
+            with open(os.path.join(frontend, "api_calls.js"), "a") as f:
+                f.write("\nfetch('/api/added');\n")
+            cache = route_linter.make_cache(cache_dir, use_hash=True)
+            calls = route_linter.parse_frontend_calls(frontend, cache=cache)
+            self.assertEqual((cache.hits, cache.misses), (file_count - 1, 1))
+            self.assertIn("/api/added", [call['path'] for call in calls])
+            
+            # Eviction brings the cache under its size cap
+            cache = route_linter.make_cache(cache_dir, max_bytes=0)
+            self.assertEqual(cache.prune(), file_count)
+            
+            # Other pattern versions are kept while in use, and unrelated directories always
+            recent, stale, unrelated = (os.path.join(cache_dir, name) for name in ("v1-0123abcd", "v1-4567ef00", "notes"))
+            for path in (recent, stale, unrelated):
+                os.makedirs(os.path.join(path, "00"))
+            old = time.time() - route_cache.STALE_AFTER - 60
+            os.utime(stale, (old, old))
+            os.utime(unrelated, (old, old))
+            cache.prune()
+            self.assertTrue(os.path.isdir(recent))
+            self.assertFalse(os.path.exists(stale))
+            self.assertTrue(os.path.isdir(unrelated))
+            
+            # An entry that cannot be written is skipped rather than failing the run
+            blocked = os.path.join(tmp, "blocked")
+            with open(blocked, "w") as f:
+                f.write("a file where the cache directory should be")
+            cache = route_linter.make_cache(blocked)
+            self.assertEqual(route_linter.parse_frontend_calls(frontend, cache=cache), calls)
+            self.assertFalse(cache.store("fetch", os.path.join(frontend, "api_calls.js"), {}, []))
+    
+    def test_single_pass_scanner(self):
+        """Test that each call is tagged once and nested roots are walked once"""
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "server.js"), "w") as f:
+                f.write("router.get('/api/orders', handler);\n")
+            os.makedirs(os.path.join(tmp, "client"))
+            with open(os.path.join(tmp, "client", "app.js"), "w") as f:
+                f.write("fetch('/api/orders', { method: 'POST' });\n"
+                        "fetch('/api/orders');\n"
+                        "axios.delete('/api/orders');\n")
+            
+            sources = route_linter.walk_sources([
+                ("backend", tmp, route_linter.BACKEND_EXTENSIONS),
+                ("frontend", os.path.join(tmp, "client"), route_linter.FRONTEND_EXTENSIONS),
+            ])
+            self.assertEqual(sources, [
+                (os.path.join(tmp, "server.js"), ("backend",)),
+                (os.path.join(tmp, "client", "app.js"), ("backend", "frontend")),
+            ])
+            
+            self.assertEqual(
+                route_linter.scan_file(os.path.join(tmp, "client", "app.js"), route_linter.FRONTEND_KINDS),
+                [("fetch", "POST", "/api/orders", 1, 1, ""), ("fetch", "GET", "/api/orders", 2, 1, ""), ("axios", "DELETE", "/api/orders", 3, 1, "")]
+            )
+            
+            routes, calls = route_linter.parse_sources(tmp, os.path.join(tmp, "client"))
+            self.assertEqual(routes, {"GET /api/orders"})
+            self.assertEqual([call['method'] for call in calls], ["POST", "GET", "DELETE"])
+    
+    def test_route_index_matching(self):
+        """Test parametric, optional and wildcard matching in the route index"""
+        from route_index import RouteIndex
+        index = RouteIndex([
+            "GET /api/users/:id",
+            "GET /api/users/me",
+            "GET /users/:userId(\\\\d+)",
+            "GET /files/:filename?",
+            "GET /assets/*",
+        ])
+        self.assertEqual(index.match("GET", "/api/users/${userId}"), "GET /api/users/:id")
+        self.assertEqual(index.match("GET", "/api/users/me"), "GET /api/users/me")
+        self.assertEqual(index.match("GET", "/api/users/${id}?expand=1"), "GET /api/users/:id")
+        self.assertIsNone(index.match("POST", "/api/users/${userId}"))
+        self.assertEqual(index.match("GET", "/users/42"), "GET /users/:userId(\\\\d+)")
+        self.assertIsNone(index.match("GET", "/users/abc"))
+        self.assertEqual(index.match("GET", "/files"), "GET /files/:filename?")
+        self.assertEqual(index.match("GET", "/files/report.pdf"), "GET /files/:filename?")
+        self.assertEqual(index.match("GET", "/assets/img/logo.png"), "GET /assets/*")
+        
+        unused, undefined, _ = route_linter.find_route_mismatches(
+            {"GET /api/users/:id", "DELETE /api/users/:id"},
+            [{'method': 'GET', 'path': '/api/users/${id}', 'file': 'a.js'},
+             {'method': 'GET', 'path': '/api/orders', 'file': 'a.js'}]
+        )
+        self.assertEqual(unused, {"DELETE /api/users/:id"})
+        self.assertEqual(undefined, {"GET /api/orders"})
+    
+    def test_suggestion_index(self):
+        """Test that suggestions score like thefuzz's WRatio without needing it"""
+        import route_suggest
+        
+        # Reference scores computed with thefuzz.fuzz.WRatio
+        for a, b, expected in [
+            ("GET /api/usres", "GET /api/users", 93),
+            ("GET /api/users/:param/profile", "GET /files/:filename?", 57),
+            ("GET /api/products/all", "GET /auth/login", 56),
+            ("DELETE /api/products", "GET /api/products", 86),
+        ]:
+            self.assertEqual(route_suggest.wratio(route_suggest.process_text(a), route_suggest.process_text(b)), expected)
+        
+        backend_routes = route_linter.parse_backend_routes("./test_backend")
+        index = route_suggest.SuggestionIndex(backend_routes, candidates=4)
+        self.assertEqual(index.best("GET /api/usres"), ("GET /api/users", 93))
+        
+        suggestions = index.suggest_many(["GET /api/productz", "GET /api/productz", "GET /nothing/alike"], threshold=90)
+        self.assertEqual(len(suggestions), 2)
+        self.assertEqual(suggestions["GET /api/productz"], [("GET /api/products", 94, True)])
+        self.assertEqual(suggestions["GET /nothing/alike"], [])
+        
+        # Stopping early on the score bound returns what scoring every candidate would
+        wratio = route_suggest.wratio
+        calls = []
+        
+        def counted(a, b):
+            calls.append((a, b))
+            return wratio(a, b)
+        
+        routes = [f"{method} /api/{name}/:id{suffix}" for method in ("GET", "POST", "DELETE") for name in ("users", "orders", "items", "reports") for suffix in ("", "/history", "/export/all/pages")]
+        index = route_suggest.SuggestionIndex(routes + ["GET /"], candidates=8)
+        queries = ["GET /api/usres/:id", "POST /api/orders/:id/histroy", "GET /", "DELETE /items", "PATCH /api/reports/:id/export/all/page", "GET /a"]
+        route_suggest.wratio = counted
+        try:
+            for query in queries:
+                text = route_suggest.process_text(query)
+                scored = sorted(((wratio(text, index._processed[i]), -i) for i in index._candidate_ids(route_suggest._grams(text))), reverse=True)
+                for k in (1, 3):
+                    for threshold in (0, 60, 90):
+                        expected = [(index.routes[-i], score) for score, i in scored if score >= threshold][:k]
+                        del calls[:]
+                        self.assertEqual(index.top(query, k, threshold), expected)
+                        self.assertLessEqual(len(calls), len(scored))
+            del calls[:]
+            self.assertEqual(index.top("GET /", 1), [("GET /", 100)])
+            self.assertLess(len(calls), 8)
+            del calls[:]
+            self.assertEqual(index.top("GET /a", 1, threshold=95), [])
+            self.assertEqual(calls, [])
+        finally:
+            route_suggest.wratio = wratio
+    
+    def test_incremental_refresh(self):
+        """Test that refreshing changed files matches a full rescan"""
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = os.path.join(tmp, "backend")
+            frontend = os.path.join(tmp, "frontend")
+            shutil.copytree("test_backend", backend)
+            shutil.copytree("test_frontend", frontend)
+            linter = route_linter.RouteLinter(backend, frontend)
+            linter.scan()
+            before = linter.findings()
+            
+            added = os.path.join(frontend, "orders.js")
+            with open(added, "w") as f:
+                f.write("fetch('/api/orders/${id}');\n")
+            with open(os.path.join(backend, "routes.js"), "a") as f:
+                f.write("\nrouter.get('/api/orders', handler);\n")
+            os.remove(os.path.join(frontend, "typo_api_calls.js"))
+            
+            linter.refresh([added, os.path.join(backend, "routes.js"), os.path.join(frontend, "typo_api_calls.js")])
+            full = route_linter.RouteLinter(backend, frontend)
+            full.scan()
+            self.assertEqual(linter.findings(), full.findings())
+            self.assertEqual(linter.find_mismatches()[:2], full.find_mismatches()[:2])
+            self.assertIn(("undefined", "GET /api/orders/:param"), linter.findings() - before)
+            self.assertIn(("undefined", "GET /api/usres"), before - linter.findings())
+    
+    def test_polling_watcher(self):
+        """Test that the polling watcher reports added, changed and deleted files"""
+        from route_watch import PollingWatcher
+        with tempfile.TemporaryDirectory() as tmp:
+            kept = os.path.join(tmp, "kept.js")
+            removed = os.path.join(tmp, "removed.js")
+            for path in (kept, removed):
+                with open(path, "w") as f:
+                    f.write("// original\n")
+            watcher = PollingWatcher([tmp], interval=0)
+            
+            added = os.path.join(tmp, "added.js")
+            with open(added, "w") as f:
+                f.write("fetch('/api/new');\n")
+            with open(kept, "a") as f:
+                f.write("// edited\n")
+            os.remove(removed)
+            
+            self.assertEqual(watcher.read_changes(0), {added, kept, removed})
+            self.assertEqual(watcher.read_changes(0), set())
+    
+    def test_lint_server(self):
+        """Test the query API served over a warm linter"""
+        import json
+        import threading
+        import urllib.error
+        import urllib.request
+        from urllib.parse import quote
+        from route_server import create_server
+        
+        linter = route_linter.RouteLinter("./test_backend", "./test_frontend")
+        linter.scan()
+        server = create_server(linter)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = "http://%s:%d" % server.server_address[:2]
+        
+        def request(path, body=None):
+            data = json.dumps(body).encode("utf-8") if body is not None else None
+            with urllib.request.urlopen(base + path, data=data) as response:
+                return json.load(response)
+        
+        try:
+            self.assertEqual(request("/defined?route=" + quote("GET /api/users/:id")),
+                             {"defined": True, "route": "GET /api/users/:id"})
+            self.assertFalse(request("/defined?route=" + quote("POST /api/orders/:id"))["defined"])
+            
+            callers = request("/callers?route=" + quote("GET /api/users/:id"))["callers"]
+            self.assertIn("/api/users/${userId}", [call["path"] for call in callers])
+            
+            # An absolute path refers to the same entry as the scanned relative one
+            typo_file = os.path.abspath("test_frontend/typo_api_calls.js")
+            report = request("/lint", {"files": [typo_file]})["files"]
+            self.assertIn({"kind": "undefined", "route": "GET /api/usres"}, list(report.values())[0])
+            self.assertEqual(len(linter.frontend_calls), len(route_linter.parse_frontend_calls("./test_frontend")))
+            
+            # Bodies that are not an object with a list of files are a client error
+            for body in ([], "x", 1, {"files": "routes.js"}):
+                with self.assertRaises(urllib.error.HTTPError) as raised:
+                    request("/lint", body)
+                self.assertEqual(raised.exception.code, 400)
+                raised.exception.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        # A change that fails to apply does not stop the server from following later ones
+        import route_server
+        
+        class Watcher:
+            def __init__(self, bursts):
+                self.bursts = bursts
+            
+            def read_changes(self, timeout):
+                if timeout is not None:
+                    return set()
+                if not self.bursts:
+                    raise KeyboardInterrupt
+                return self.bursts.pop(0)
+        
+        class Linter:
+            refreshed = []
+            
+            def known_files(self):
+                return []
+            
+            def refresh(self, paths):
+                if "broken.js" in paths:
+                    raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+                self.refreshed.append(paths)
+        
+        import contextlib
+        import io
+        errors = io.StringIO()
+        with self.assertRaises(KeyboardInterrupt), contextlib.redirect_stderr(errors):
+            route_server._follow_changes(Linter(), Watcher([{"broken.js"}, {"fixed.js"}]), threading.Lock())
+        self.assertEqual(Linter.refreshed, [{"fixed.js"}])
+        self.assertIn("Error applying file changes", errors.getvalue())
+    
+    def test_machine_readable_output(self):
+        """Test that jsonl, json and sarif output report the same findings"""
+        args = [sys.executable, "route_linter.py", "--backend", "./test_backend", "--frontend", "./test_frontend"]
+        result = subprocess.run(args + ["--format", "jsonl"], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0)
+        events = [json.loads(line) for line in result.stdout.splitlines()]
+        summary = events[-1]
+        self.assertEqual(summary["type"], "summary")
+        
+        linter = route_linter.RouteLinter("./test_backend", "./test_frontend")
+        linter.scan()
+        unused, undefined, _ = linter.find_mismatches()
+        self.assertEqual(summary["unused_routes"], len(unused))
+        self.assertEqual(summary["undefined_calls"], len(undefined))
+        self.assertEqual({e["route"] for e in events if e["type"] == "unused"}, unused)
+        self.assertEqual({e["route"] for e in events if e["type"] == "undefined"}, set(undefined))
+        self.assertEqual(len([e for e in events if e["type"] == "call"]), len(linter.frontend_calls))
+        
+        # --quiet drops the inventory but keeps the findings
+        result = subprocess.run(args + ["--format", "jsonl", "--quiet"], capture_output=True, text=True)
+        quiet_events = [json.loads(line) for line in result.stdout.splitlines()]
+        self.assertFalse([e for e in quiet_events if e["type"] in ("route", "call")])
+        self.assertEqual(quiet_events[-1], summary)
+        
+        result = subprocess.run(args + ["--format", "json"], capture_output=True, text=True)
+        self.assertEqual(json.loads(result.stdout)["summary"], summary)
+        
+        result = subprocess.run(args + ["--format", "sarif"], capture_output=True, text=True)
+        sarif = json.loads(result.stdout)
+        self.assertEqual(sarif["version"], "2.1.0")
+        results = sarif["runs"][0]["results"]
+        self.assertEqual(len([r for r in results if r["ruleId"] == "unused-route"]), len(unused))
+        self.assertEqual(len([r for r in results if r["ruleId"] == "undefined-route"]), summary["undefined_calls"])
+        
+        # Watch and serve modes report in text, so they are refused rather than exiting after one pass
+        for extra in (["--watch", "--format", "jsonl"], ["--serve", "0", "--format", "json"]):
+            result = subprocess.run(args + extra, capture_output=True, text=True, timeout=30)
+            self.assertEqual(result.returncode, 2)
+            self.assertIn("cannot be combined with --format", result.stderr)
+    
+    def test_benchmark_suite(self):
+        """Test the synthetic repo generator and the regression check"""
+        import bench_route_linter
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            backend_dir, frontend_dir = bench_route_linter.generate_repo(
+                temp_dir, files=20, routes_per_file=4, file_kb=1, param_fraction=0.5,
+                minified_fraction=0.5, depth=3, undefined_fraction=0.0
+            )
+            routes = route_linter.parse_backend_routes(backend_dir)
+            self.assertEqual(len(routes), 40)
+            # Without typos every generated call resolves to a backend route
+            _, undefined, _ = route_linter.find_route_mismatches(routes, route_linter.parse_frontend_calls(frontend_dir))
+            self.assertEqual(undefined, set())
+            
+            stages = bench_route_linter.benchmark_stages(backend_dir, frontend_dir, repeat=1)
+            self.assertEqual(set(stages), set(bench_route_linter.STAGES))
+            self.assertEqual(stages['walk']['units'], 20)
+        finally:
+            shutil.rmtree(temp_dir)
+        
+        def results(throughput):
+            return {'scenarios': {'baseline': {'params': {}, 'stages': {'extract': {'seconds': 1.0, 'units': 1, 'throughput': throughput}}}}}
+        
+        rows = bench_route_linter.compare_results(results(100.0), results(85.0), max_regression=10)
+        self.assertTrue(rows[0][5])
+        rows = bench_route_linter.compare_results(results(100.0), results(95.0), max_regression=10)
+        self.assertFalse(rows[0][5])
+    
+    def test_run_stats(self):
+        """Test per-stage instrumentation and the --stats-json dump"""
+        stats = route_stats.RunStats(top_files=2)
+        linter = route_linter.RouteLinter("./test_backend", "./test_frontend", stats=stats)
+        linter.scan()
+        data = stats.as_dict()
+        self.assertEqual(set(data["stages"]), {"walk", "extract", "resolve"})
+        self.assertEqual(data["files"]["scanned"], len(linter.known_files()))
+        self.assertEqual(data["patterns"]["route"], len(linter.backend_routes))
+        self.assertEqual(data["patterns"]["fetch"] + data["patterns"]["axios"], len(linter.frontend_calls))
+        self.assertEqual(len(data["slowest_files"]), 2)
+        self.assertGreaterEqual(data["slowest_files"][0]["seconds"], data["slowest_files"][1]["seconds"])
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            stats_file = os.path.join(temp_dir, "stats.json")
+            result = subprocess.run(
+                [sys.executable, "route_linter.py", "--backend", "./test_backend", "--frontend", "./test_frontend",
+                 "--format", "jsonl", "--stats", "--stats-json", stats_file],
+                capture_output=True,
+                text=True
+            )
+            self.assertEqual(result.returncode, 0)
+            self.assertIn("Run statistics:", result.stderr)
+            # The report goes to stderr and leaves the JSON Lines intact
+            for line in result.stdout.splitlines():
+                json.loads(line)
+            with open(stats_file) as f:
+                streamed = json.load(f)
+            self.assertEqual(streamed["files"]["scanned"], data["files"]["scanned"])
+            # Streaming runs time extraction too, and only build suggestions when asked
+            self.assertEqual(set(streamed["stages"]), {"walk", "extract", "resolve"})
+            self.assertGreater(streamed["files"]["files_per_second"], 0)
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    def test_lexer_engine(self):
+        """Test that the lexer engine skips comments, strings and regex literals"""
+        source = '\n'.join([
+            "// fetch('/api/line-comment')",
+            "/* axios.get('/api/block-comment') */",
+            "const s = \"fetch('/api/in-string')\";",
+            "const re = /fetch\\('\\/api\\/regex'\\)/;",
+            "fetch(`/api/users/${user.id}/posts`, { headers: { Accept: 'json' }, method: 'post' });",
+            "const label = `${items.map(item => `${item.name}`)}`;",
+            "axios.delete(`/api/items/${id}`);",
+            "router.get('/api/items', list);",
+        ])
+        lexer = route_linter.ScanOptions('lexer', None)
+        self.assertEqual(route_linter.scan_text(source, route_linter.FRONTEND_KINDS, lexer), [
+            ('fetch', 'POST', '/api/users/${user.id}/posts', 5, 1, ''),
+            ('axios', 'DELETE', '/api/items/${id}', 7, 1, ''),
+        ])
+        self.assertEqual(route_linter.scan_text(source, route_linter.BACKEND_KINDS, lexer), [('route', 'GET', '/api/items', 8, 1, 'router')])
+        # The regex engine also matches inside comments
+        regex_paths = [path for _, _, path, _, _, _ in route_linter.scan_text(source, route_linter.FRONTEND_KINDS)]
+        self.assertIn('/api/line-comment', regex_paths)
+        
+        # Both engines agree on the fixtures, positions included
+        self.assertEqual(
+            route_linter.parse_sources("./test_backend", "./test_frontend"),
+            route_linter.parse_sources("./test_backend", "./test_frontend", options=lexer)
+        )
+        
+        # A pathological file is cut off by its time budget
+        with self.assertRaises(route_lexer.TimeBudgetExceeded):
+            route_linter.scan_text("fetch('/api/a', {" * 5000, route_linter.FRONTEND_KINDS, route_linter.ScanOptions('lexer', 1e-6))
+        # A file that fails is still closed, so a memory-mapped one is unmapped right away
+        with tempfile.TemporaryDirectory() as tmp:
+            broken = os.path.join(tmp, "broken.js")
+            with open(broken, "wb") as f:
+                f.write(b"fetch('/api/a');\n\xff\n")
+            read = route_linter.read_sources
+            sources = []
+            
+            def keep_sources(file_paths, options):
+                for file_path, source, error in read(file_paths, options):
+                    sources.append(source)
+                    yield file_path, source, error
+            
+            route_linter.read_sources = keep_sources
+            try:
+                for engine in ("regex", "lexer"):
+                    options = route_linter.ScanOptions(engine, None, read=route_reader.ReadOptions(mmap_threshold=1, lazy_decode=True))
+                    [(records, error, _)] = route_linter._extract_chunk([(broken, route_linter.FRONTEND_KINDS)], options=options)
+                    self.assertIsNone(records)
+                    self.assertIn("utf-8", error)
+            finally:
+                route_linter.read_sources = read
+            self.assertEqual(len(sources), 2)
+            self.assertEqual([source.data for source in sources], [b"", b""])
+        # The budget is also checked while the tokens are matched, not only while they are read
+        with self.assertRaises(route_lexer.TimeBudgetExceeded):
+            route_lexer.lexer_hits("const { a, b " * 200, route_linter.WIRING_KINDS, time.perf_counter() - 1, 1e-6)
+        # Unclosed destructuring is not rescanned to the end of the file at every binding
+        text = "const { a, b " * 20000 + "const { c } = require('./c');\n"
+        start = time.perf_counter()
+        records = route_linter.scan_text(text, route_linter.WIRING_KINDS, lexer)
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual(records, [('require', 'c', './c', 1, len(text) - 29, 'c')])
+    
+    def test_walk_pruning(self):
+        """Test that ignore files, globs, the size cap and minified detection prune the walk"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            files = {
+                "src/app.js": "fetch('/api/kept');",
+                "src/generated/api.js": "fetch('/api/gitignored');",
+                "src/generated/keep.js": "fetch('/api/negated');",
+                "src/legacy/old.js": "fetch('/api/project-ignored');",
+                "src/app.test.js": "fetch('/api/excluded');",
+                "src/vendor.min.js": "fetch('/api/minified');",
+                "src/big.js": "fetch('/api/too-large');" + " " * 4096,
+                "node_modules/lib/index.js": "fetch('/api/node-modules');",
+                "dist/main.js": "fetch('/api/dist');",
+                ".gitignore": "# build output\nsrc/generated/*\n!src/generated/keep.js\n",
+                "src/.routelinterignore": "/legacy/\n",
+            }
+            for name, content in files.items():
+                file_path = os.path.join(temp_dir, name)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "w") as f:
+                    f.write(content)
+            
+            path_filter = route_ignore.PathFilter(exclude=["*.test.js"], max_file_size=4096)
+            _, calls = route_linter.parse_sources(None, temp_dir, path_filter=path_filter)
+            self.assertEqual(sorted(call["path"] for call in calls), ["/api/kept", "/api/negated"])
+            self.assertEqual(path_filter.skipped["pruned directory"], 2)
+            self.assertEqual(path_filter.skipped["minified"], 1)
+            self.assertEqual(path_filter.skipped["too large"], 1)
+            
+            # --include keeps only matching files
+            path_filter = route_ignore.PathFilter(include=["src/app*.js"], exclude=["*.test.js"])
+            _, calls = route_linter.parse_sources(None, temp_dir, path_filter=path_filter)
+            self.assertEqual([call["path"] for call in calls], ["/api/kept"])
+            
+            # Files reported one at a time are filtered the same way
+            path_filter = route_ignore.PathFilter()
+            abs_root = os.path.abspath(temp_dir)
+            self.assertTrue(path_filter.allows(os.path.join(temp_dir, "src/generated/keep.js"), abs_root))
+            self.assertFalse(path_filter.allows(os.path.join(temp_dir, "src/generated/api.js"), abs_root))
+            self.assertFalse(path_filter.allows(os.path.join(temp_dir, "node_modules/lib/index.js"), abs_root))
+            
+            # Watchers leave out what the walk prunes, including directories that appear later
+            from route_watch import InotifyWatcher, PollingWatcher
+            path_filter = route_ignore.PathFilter(exclude=["*.test.js"], max_file_size=4096)
+            polling = PollingWatcher([temp_dir], interval=0, path_filter=path_filter)
+            self.assertEqual(
+                set(polling._snapshot),
+                {os.path.join(temp_dir, name) for name in ("src/app.js", "src/generated/keep.js", ".gitignore", "src/.routelinterignore")}
+            )
+            watchers = [polling]
+            if sys.platform.startswith("linux"):
+                inotify = InotifyWatcher([temp_dir], path_filter)
+                self.assertNotIn(os.path.join(temp_dir, "node_modules"), inotify._paths.values())
+                self.assertNotIn(os.path.join(temp_dir, "src", "legacy"), inotify._paths.values())
+                watchers.append(inotify)
+            try:
+                for name in ("node_modules/new/index.js", "coverage/report.js", "src/legacy/new.js", "src/added.js"):
+                    file_path = os.path.join(temp_dir, name)
+                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                    with open(file_path, "w") as f:
+                        f.write("fetch('/api/new');\n")
+                for watcher in watchers:
+                    self.assertEqual(watcher.read_changes(1), {os.path.join(temp_dir, "src/added.js")})
+            finally:
+                for watcher in watchers:
+                    watcher.close()
+            
+            # An edited ignore file is read again when it shows up in a change set
+            path_filter = route_ignore.PathFilter()
+            linter = route_linter.RouteLinter(None, temp_dir, path_filter=path_filter)
+            linter.scan()
+            generated = os.path.join(temp_dir, "src/generated/api.js")
+            self.assertFalse(path_filter.allows(generated, abs_root))
+            self.assertNotIn("/api/gitignored", {call["path"] for call in linter.frontend_calls})
+            with open(os.path.join(temp_dir, ".gitignore"), "w") as f:
+                f.write("src/legacy/\n")
+            self.assertFalse(path_filter.invalidate([generated]))
+            self.assertFalse(path_filter.allows(generated, abs_root))
+            linter.refresh([os.path.join(temp_dir, ".gitignore")])
+            self.assertTrue(path_filter.allows(generated, abs_root))
+            self.assertFalse(path_filter.allows(os.path.join(temp_dir, "src/legacy/old.js"), abs_root))
+            self.assertIn("/api/gitignored", {call["path"] for call in linter.frontend_calls})
+        finally:
+            shutil.rmtree(temp_dir)
+        
+        dir_pattern, file_pattern = route_ignore.compile_globs(["**/fixtures/**", "docs/*.js", "cache/"])
+        self.assertTrue(file_pattern.fullmatch("a/fixtures/b/c.js"))
+        self.assertTrue(file_pattern.fullmatch("docs/x.js"))
+        self.assertFalse(file_pattern.fullmatch("src/docs/x.js"))
+        self.assertTrue(dir_pattern.fullmatch("src/cache"))
+        self.assertFalse(file_pattern.fullmatch("src/cache"))
+    
+    def test_since_baseline(self):
+        """Test that --since re-lints only changed files against a saved baseline"""
+        temp_dir = tempfile.mkdtemp()
+        repo = os.path.join(temp_dir, "repo")
+        baseline = os.path.join(temp_dir, "baseline.json")
+        script = os.path.abspath("route_linter.py")
+        
+        def write(name, content):
+            file_path = os.path.join(repo, name)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w") as f:
+                f.write(content)
+        
+        def git(*args):
+            subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+        
+        def lint(*args):
+            return subprocess.run(
+                [sys.executable, script, "--backend", "be", "--frontend", "fe", "--jobs", "1", *args],
+                cwd=repo, capture_output=True, text=True
+            )
+        
+        try:
+            os.makedirs(repo)
+            git("init", "-q", "-b", "main")
+            git("config", "user.email", "dev@example.com")
+            git("config", "user.name", "dev")
+            write("be/routes.js", "router.get('/api/users', h);\nrouter.get('/api/orders', h);\n")
+            write("fe/app.js", "fetch('/api/users');\nfetch('/api/orders');\n")
+            git("add", "-A")
+            git("commit", "-q", "-m", "init")
+            git("branch", "feature")
+            
+            # main moves on after the branch point; the baseline is built there
+            write("be/routes.js", "router.get('/api/users', h);\n")
+            git("commit", "-q", "-am", "drop orders")
+            result = lint("--save-baseline", baseline, "--format", "jsonl")
+            self.assertEqual(result.returncode, 0)
+            
+            # The branch still defines /api/orders and adds a broken call
+            git("checkout", "-q", "feature")
+            write("fe/app.js", "fetch('/api/users');\nfetch('/api/orders');\nfetch('/api/missing');\n")
+            result = lint("--baseline", baseline, "--since", "main", "--format", "jsonl", "--quiet")
+            self.assertEqual(result.returncode, 0, result.stderr)
+            events = [json.loads(line) for line in result.stdout.splitlines()]
+            self.assertEqual([event["route"] for event in events if event["type"] == "undefined"], ["GET /api/missing"])
+            self.assertFalse([event for event in events if event["type"] == "unused"])
+            
+            # Removing a route reports the callers it breaks in unchanged files
+            git("checkout", "-q", "--", "fe/app.js")
+            write("be/routes.js", "router.get('/api/orders', h);\n")
+            result = lint("--baseline", baseline, "--since", "main")
+            self.assertIn("GET /api/users", result.stdout)
+            self.assertNotIn("Success", result.stdout)
+            
+            # A baseline from another engine is rejected
+            result = lint("--baseline", baseline, "--since", "main", "--engine", "lexer")
+            self.assertNotEqual(result.returncode, 0)
+            self.assertIn("--save-baseline", result.stderr)
+            
+            result = lint("--since", "main")
+            self.assertNotEqual(result.returncode, 0)
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    def test_backend_index_file(self):
+        """Test that a written backend route index lints like the backend directory"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            index_path = os.path.join(temp_dir, "routes.idx")
+            result = subprocess.run(
+                [sys.executable, "route_linter.py", "--backend", "./test_backend", "--emit-index", index_path],
+                capture_output=True, text=True
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            
+            linter = route_linter.RouteLinter("./test_backend", None)
+            linter.scan()
+            with route_index_file.RouteIndexFile(index_path) as index:
+                self.assertEqual(index.routes(), linter.backend_routes)
+                locations = index.locations("GET /api/users")
+                self.assertEqual(len(locations), 1)
+                file_name, line = locations[0]
+                with open(os.path.join("test_backend", file_name)) as f:
+                    self.assertIn("/api/users'", f.read().splitlines()[line - 1])
+                self.assertEqual(index.locations("GET /api/nothing"), [])
+            
+            args = ["--frontend", "./test_frontend", "--format", "jsonl", "--quiet"]
+            from_directory = subprocess.run(
+                [sys.executable, "route_linter.py", "--backend", "./test_backend"] + args, capture_output=True, text=True
+            )
+            from_index = subprocess.run(
+                [sys.executable, "route_linter.py", "--backend-index", index_path] + args, capture_output=True, text=True
+            )
+            self.assertEqual(from_index.returncode, 0, from_index.stderr)
+            
+            def findings(output):
+                return sorted(
+                    (event["type"], event["route"]) for event in map(json.loads, output.splitlines())
+                    if event["type"] in ("undefined", "unused")
+                )
+            self.assertEqual(findings(from_index.stdout), findings(from_directory.stdout))
+            
+            # Anything else is rejected rather than misread
+            with open(index_path, "r+b") as f:
+                f.write(b"JUNK")
+            with self.assertRaises(route_index_file.IndexFileError):
+                route_index_file.RouteIndexFile(index_path)
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    def test_multiple_frontends(self):
+        """Test that several frontends are linted against one backend in one run"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            files = {
+                "backend/routes.js": "router.get('/api/users', h);\nrouter.get('/api/orders', h);\nrouter.get('/api/products', h);\n",
+                "web/app.js": "fetch('/api/users');\n",
+                "mobile/app.js": "fetch('/api/orders');\nfetch('/api/missing');\n",
+                "clients.txt": "# one frontend per line\nmobile\n",
+            }
+            for name, content in files.items():
+                file_path = os.path.join(temp_dir, name)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "w") as f:
+                    f.write(content)
+            
+            web = os.path.join(temp_dir, "web")
+            mobile = os.path.join(temp_dir, "mobile")
+            self.assertEqual(route_linter.read_manifest(os.path.join(temp_dir, "clients.txt")), [mobile])
+            result = subprocess.run(
+                [sys.executable, "route_linter.py", "--backend", os.path.join(temp_dir, "backend"), "--frontend", web,
+                 "--manifest", os.path.join(temp_dir, "clients.txt"), "--format", "jsonl", "--jobs", "1"],
+                capture_output=True, text=True
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            events = [json.loads(line) for line in result.stdout.splitlines()]
+            
+            # Only a route no frontend calls is unused
+            self.assertEqual([event["route"] for event in events if event["type"] == "unused"], ["GET /api/products"])
+            undefined = [(event["client"], event["route"]) for event in events if event["type"] == "undefined"]
+            self.assertEqual(undefined, [(mobile, "GET /api/missing")])
+            clients = events[-1]["clients"]
+            self.assertEqual([client["frontend"] for client in clients], [web, mobile])
+            self.assertEqual([client["frontend_calls"] for client in clients], [1, 2])
+            self.assertEqual([client["routes_used"] for client in clients], [1, 1])
+            
+            result = subprocess.run(
+                [sys.executable, "route_linter.py", "--backend", os.path.join(temp_dir, "backend"),
+                 "--frontend", web, "--frontend", mobile, "--quiet"],
+                capture_output=True, text=True
+            )
+            self.assertIn("1 backend routes not used by any frontend", result.stdout)
+            
+            # Serving lints one frontend, also when any free port is asked for
+            result = subprocess.run(
+                [sys.executable, "route_linter.py", "--backend", os.path.join(temp_dir, "backend"),
+                 "--frontend", web, "--frontend", mobile, "--serve", "0"],
+                capture_output=True, text=True, timeout=30
+            )
+            self.assertEqual(result.returncode, 2)
+            self.assertIn("--serve lints a single frontend", result.stderr)
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    def test_sharded_scan(self):
+        """Test that shards cover every file once and merge into the full result"""
+        files = [file_path for file_path, _ in route_linter.walk_sources(route_linter.source_roots("./test_backend", "./test_frontend"))]
+        owners = [[index for index in (1, 2, 3) if route_linter.in_shard(file_path, (index, 3))] for file_path in files]
+        self.assertTrue(all(len(owner) == 1 for owner in owners))
+        self.assertEqual(route_linter.parse_shard("2/3"), (2, 3))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            route_linter.parse_shard("4/3")
+        
+        temp_dir = tempfile.mkdtemp()
+        try:
+            base = [sys.executable, "route_linter.py", "--backend", "./test_backend", "--frontend", "./test_frontend", "--jobs", "1"]
+            shards = []
+            for index in (1, 2, 3):
+                shard_path = os.path.join(temp_dir, f"shard-{index}.json")
+                result = subprocess.run(base + ["--shard", f"{index}/3", "--save-baseline", shard_path], capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                shards.append(shard_path)
+            
+            def findings(output):
+                return sorted(
+                    (event["type"], event["route"]) for event in map(json.loads, output.splitlines())
+                    if event["type"] in ("undefined", "unused")
+                )
+            
+            full = subprocess.run(base + ["--format", "jsonl"], capture_output=True, text=True)
+            merged = subprocess.run(
+                [sys.executable, "route_linter.py", "merge", *reversed(shards), "--format", "jsonl"],
+                capture_output=True, text=True
+            )
+            self.assertEqual(merged.returncode, 0, merged.stderr)
+            self.assertEqual(findings(merged.stdout), findings(full.stdout))
+            
+            result = subprocess.run([sys.executable, "route_linter.py", "merge", shards[0], shards[2]], capture_output=True, text=True)
+            self.assertNotEqual(result.returncode, 0)
+            self.assertIn("missing shard", result.stderr)
+            
+            # A shard run only writes its shard, so it cannot serve, not even on any free port
+            result = subprocess.run(
+                base + ["--shard", "1/3", "--save-baseline", os.path.join(temp_dir, "served.json"), "--serve", "0"],
+                capture_output=True, text=True, timeout=30
+            )
+            self.assertEqual(result.returncode, 2)
+            self.assertIn("--serve cannot be combined with --shard", result.stderr)
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    def test_call_table(self):
+        """Test that calls are stored once per string and carry their positions"""
+        table = route_calls.CallTable()
+        table.add("GET", "/api/users", "a.js", 3, 5)
+        table.add("GET", "/api/users", "b.js", 7, 1)
+        table.add("POST", "/api/users", "a.js", 9, 2)
+        self.assertEqual(len(table), 3)
+        self.assertEqual((len(table.methods), len(table.paths), len(table.files)), (2, 1, 2))
+        self.assertEqual(table[1]["file"], "b.js")
+        self.assertEqual(table[1].line, 7)
+        self.assertEqual(table[2].as_dict(), {"method": "POST", "path": "/api/users", "file": "a.js", "line": 9, "column": 2})
+        self.assertEqual([call["file"] for call in table], ["a.js", "b.js", "a.js"])
+        self.assertEqual(sorted(table.unique_routes()), [("GET", "/api/users", 1), ("POST", "/api/users", 2)])
+        self.assertEqual(route_calls.CallTable.from_calls(call.as_dict() for call in table), table)
+        
+        # Lists of call dictionaries still resolve the same way
+        route_index = route_linter.RouteIndex(["GET /api/users"])
+        matches, route_to_call = route_linter.resolve_frontend_routes(route_index, [call.as_dict() for call in table])
+        self.assertEqual(matches, {"GET /api/users": "GET /api/users", "POST /api/users": None})
+        self.assertEqual(route_to_call["GET /api/users"]["file"], "b.js")
+        
+        # Streamed events point at the call
+        events = list(route_linter.iter_lint_events("./test_backend", "./test_frontend", jobs=1))
+        event = next(e for e in events if e["type"] == "undefined" and e["route"] == "GET /api/usres")
+        with open(event["file"]) as f:
+            line = f.read().splitlines()[event["line"] - 1]
+        self.assertEqual(event["line"], 12)
+        self.assertTrue(line[event["column"] - 1:].startswith("fetch('/api/usres')"))
+        
+        # The standalone parser counts lines incrementally across its passes over a file
+        content = "axios.get('/api/a');\n\nfetch('/api/b', { method: 'POST' });  fetch('/api/c');\n  axios.put('/api/d');\nfetch('/api/e');\n"
+        lines = parse_frontend_calls.LineCounter(content)
+        for offset in [content.index("fetch('/api/b'"), content.index("fetch('/api/c'"), content.index("fetch('/api/e'"), 0, content.index("axios.put")]:
+            line_start = content.rfind("\n", 0, offset) + 1
+            self.assertEqual(lines.position(offset), {"line": content.count("\n", 0, offset) + 1, "column": offset - line_start + 1})
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "calls.js"), "w") as f:
+                f.write(content)
+            positions = {call["path"]: (call["line"], call["column"]) for call in parse_frontend_calls.parse_frontend_calls(tmp)}
+        self.assertEqual(positions, {"/api/a": (1, 1), "/api/b": (3, 1), "/api/c": (3, 39), "/api/d": (4, 3), "/api/e": (5, 1)})
+    
+    def test_framework_extractors(self):
+        """Test the framework extractors with both engines and the path-only Next.js extractor"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            files = {
+                "server/app.ts": (
+                    "fastify.get('/api/health', async () => 'ok');\n"
+                    "fastify.route({ url: '/api/items/:id', method: 'DELETE', handler });\n"
+                    "router.get('user', '/api/users/:id', show);\n"
+                    "router.del('/api/users/:id', remove);\n"
+                    "app.all('/api/ping', ping);\n"
+                ),
+                "client/calls.js": (
+                    "const api = axios.create();\n"
+                    "api.post('/api/users/1');\n"
+                    "ky('api/items/2', { method: 'put' });\n"
+                    "request('DELETE', '/api/users/3');\n"
+                    "router.get('/api/not-a-call');\n"
+                ),
+            }
+            for name, content in files.items():
+                file_path = os.path.join(temp_dir, name)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "w") as f:
+                    f.write(content)
+            # Never read: the route comes from the path alone
+            os.makedirs(os.path.join(temp_dir, "server", "pages", "api", "users"))
+            with open(os.path.join(temp_dir, "server", "pages", "api", "users", "[id].js"), "wb") as f:
+                f.write(b"\xff\xfe")
+            
+            server, client = os.path.join(temp_dir, "server"), os.path.join(temp_dir, "client")
+            routes, calls = route_linter.parse_sources(server, client)
+            self.assertEqual(routes, {
+                "GET /api/health", "DELETE /api/items/:id", "GET /api/users/:id", "DELETE /api/users/:id",
+                "ALL /api/ping", "ALL /api/users/:id",
+            })
+            self.assertEqual(
+                [(call.method, call.path, call.line, call.column) for call in calls],
+                [("POST", "/api/users/1", 2, 1), ("PUT", "api/items/2", 3, 1), ("DELETE", "/api/users/3", 4, 1)]
+            )
+            self.assertEqual(route_linter.parse_sources(server, client, options=route_linter.ScanOptions("lexer", None)), (routes, calls))
+            
+            # --extractors narrows the scan
+            options = route_linter.ScanOptions("regex", None, route_linter.parse_extractors("fetch,nextjs,fastify"))
+            routes, calls = route_linter.parse_sources(server, client, options=options)
+            self.assertEqual(routes, {"GET /api/health", "ALL /api/users/:id"})
+            self.assertEqual(len(calls), 0)
+            with self.assertRaises(argparse.ArgumentTypeError):
+                route_linter.parse_extractors("express")
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    def test_router_mounts(self):
+        """Test that mount prefixes are resolved across files, incrementally too"""
+        with tempfile.TemporaryDirectory() as tmp:
+            files = {
+                "server/app.js": (
+                    "const orders = require('./routes/orders');\n"
+                    "const v2 = express.Router();\n"
+                    "v2.use('/orders', auth, orders);\n"
+                    "app.use('/api/v2', v2);\n"
+                    "app.use('/api/admin', require('./routes/admin'));\n"
+                ),
+                "server/routes/orders.js": "router.get('/', list);\nrouter.get('/:id', show);\nmodule.exports = router;\n",
+                "server/routes/admin.ts": "import { Router } from 'express';\nexport const router = Router();\nrouter.delete('/cache', clear);\n",
+                "client/api.js": "fetch('/api/v2/orders');\naxios.delete('/api/admin/cache');\n",
+            }
+            for name, content in files.items():
+                file_path = os.path.join(tmp, name)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "w") as f:
+                    f.write(content)
+            
+            server, client = os.path.join(tmp, "server"), os.path.join(tmp, "client")
+            routes, _ = route_linter.parse_sources(server, client)
+            self.assertEqual(routes, {"GET /api/v2/orders", "GET /api/v2/orders/:id", "DELETE /api/admin/cache"})
+            self.assertEqual(route_linter.parse_sources(server, client, options=route_linter.ScanOptions("lexer", None))[0], routes)
+            
+            linter = route_linter.RouteLinter(server, client)
+            linter.scan()
+            self.assertEqual(linter.backend_routes, routes)
+            self.assertEqual(linter.findings(), {("unused", "GET /api/v2/orders/:id")})
+            
+            # Remounting v2 moves the routes of another file
+            app = os.path.join(server, "app.js")
+            with open(app, "w") as f:
+                f.write(files["server/app.js"].replace("/api/v2", "/api/v3"))
+            linter.refresh([app])
+            self.assertIn("GET /api/v3/orders/:id", linter.backend_routes)
+            self.assertIn(("undefined", "GET /api/v2/orders"), linter.findings())
+            full = route_linter.RouteLinter(server, client)
+            full.scan()
+            self.assertEqual(linter.findings(), full.findings())
+            
+            # Exported records keep routes as written, so they resolve the same way when loaded
+            loaded = route_linter.RouteLinter(server, client)
+            loaded.load_records(linter.export_records())
+            self.assertEqual(loaded.backend_routes, linter.backend_routes)
+            
+            graph = route_mounts.MountGraph({})
+            self.assertEqual(route_mounts.join_path("/api/", "/"), "/api")
+            self.assertEqual(graph.prefixes(("a.js", "app")), ("",))
+    
+    def test_canonical_paths(self):
+        """Test that routes and calls written differently get the same key"""
+        canonical_path = route_paths.canonical_path
+        self.assertEqual(canonical_path("/api/users/${id}/?expand=1#top"), "/api/users/:param")
+        self.assertEqual(canonical_path("https://api.example.com//api/users/"), "/api/users")
+        self.assertEqual(canonical_path("${API_URL}/api/users/{userId}"), "/api/users/:userId")
+        self.assertEqual(canonical_path("/files/:name?"), "/files/:name?")
+        self.assertEqual(canonical_path("/users/:id(\\d+?)"), "/users/:id(\\d+?)")
+        self.assertEqual(canonical_path("api/users"), "/api/users")
+        self.assertTrue(route_paths.is_api_path("https://example.com/api/users"))
+        self.assertTrue(route_paths.is_api_path("api/users"))
+        self.assertFalse(route_paths.is_api_path("https://external-api.com/data"))
+        self.assertFalse(route_paths.is_api_path("/static/app.css"))
+        
+        unused, undefined, _ = route_linter.find_route_mismatches(
+            {"GET /api/users/:id"},
+            [{'method': 'GET', 'path': '/api/users/${id}/', 'file': 'a.js'},
+             {'method': 'GET', 'path': '/api/orders/?page=${page}', 'file': 'a.js'},
+             {'method': 'GET', 'path': '${BASE}/api/orders?page=2', 'file': 'b.js'}]
+        )
+        self.assertEqual(unused, set())
+        self.assertEqual(undefined, {"GET /api/orders"})
+        self.assertEqual(route_linter.frontend_route_key("GET", "/api/users/${id}/"), "GET /api/users/:param")
+    
+    def test_read_ahead(self):
+        """Test that files read ahead on threads, mapped or decoded lazily, read the same"""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for i in range(24):
+                paths.append(os.path.join(tmp, f"api{i}.js"))
+                with open(paths[-1], "wb") as f:
+                    f.write(f"fetch('/api/items/{i}');\r\nconst s = '\u00e9';\r\n".encode("utf-8"))
+            missing = os.path.join(tmp, "missing.js")
+            
+            def read_all(options):
+                return [(path, source and source.text(), error and "error")
+                        for path, source, error in route_reader.read_sources(paths + [missing], options)]
+            
+            opener = route_reader.LatencyOpener(0.02)
+            slow = route_reader.ReadOptions(read_ahead=1, opener=opener)
+            expected = read_all(slow)
+            self.assertEqual(expected[0][1], "fetch('/api/items/0');\nconst s = '\u00e9';\n")
+            self.assertEqual(expected[-1], (missing, None, "error"))
+            self.assertEqual(opener.peak_in_flight, 1)
+            
+            # Reads overlap, but never more of them than the read-ahead allows
+            opener = route_reader.LatencyOpener(0.02)
+            self.assertEqual(read_all(slow._replace(read_ahead=16, opener=opener)), expected)
+            self.assertGreater(opener.peak_in_flight, 1)
+            self.assertLessEqual(opener.peak_in_flight, 16)
+            self.assertEqual(opener.in_flight, 0)
+            self.assertEqual(read_all(route_reader.ReadOptions(mmap_threshold=1, lazy_decode=False)), expected)
+            
+            options = route_linter.ScanOptions("regex", None, read=slow._replace(read_ahead=8))
+            self.assertEqual(route_linter.parse_sources(None, tmp, options=options)[1], route_linter.parse_sources(None, tmp)[1])
+    
+    def test_literal_prefilter(self):
+        """Test that files and parts of files without required literals are skipped, with the same results"""
+        self.assertEqual(route_prefilter.required_literals(route_linter.SCAN_PATTERNS["fetch"]), {"fetch"})
+        self.assertIn("router.get", route_prefilter.required_literals(route_linter.SCAN_PATTERNS["route"]))
+        self.assertEqual(route_prefilter.required_literals(r"\w+\(\s*'[^']*'"), {"("})
+        self.assertIsNone(route_prefilter.required_literals(r"[a-z]+\d*"))
+        self.assertIsNone(route_prefilter.Prefilter(["fetch", r"\w+"]).anchors)
+        
+        prefilter = route_prefilter.Prefilter([route_linter.SCAN_PATTERNS["fetch"]])
+        filler = "const x = 1;\n" * 400
+        text = "FETCH('/api/a');\n" + filler + "fetch('/api/b');\n"
+        self.assertTrue(prefilter.search(text.encode("utf-8")))
+        self.assertFalse(prefilter.search(filler.encode("utf-8")))
+        windows = prefilter.windows(text)
+        self.assertEqual(len(windows), 2)
+        self.assertEqual(windows[0][0], 0)
+        self.assertEqual(windows[-1][1], len(text))
+        self.assertEqual(prefilter.windows(filler), [])
+        
+        # A window bounds where a match starts, never where it ends
+        import bench_route_linter
+        regex, whole = route_linter.ScanOptions("regex", None), route_linter.ScanOptions("regex", None, prefilter=False)
+        long_options = "fetch('/api/orders', {\n  body: JSON.stringify(order)," + " " * 2 * route_prefilter.WINDOW_CONTEXT + "\n  method: 'POST'\n});\n"
+        self.assertEqual(route_linter.scan_text(long_options, route_linter.FRONTEND_KINDS, regex), [("fetch", "POST", "/api/orders", 1, 1, "")])
+        cases = [(kinds, build(200)) for kinds, build in bench_route_linter.WORST_CASES.values()]
+        for kinds, case in cases + [(route_linter.FRONTEND_KINDS, filler + long_options + filler + long_options)]:
+            self.assertEqual(route_linter.scan_text(case, kinds, regex), route_linter.scan_text(case, kinds, whole))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            files = {
+                "server/routes.js": "router.get('/api/a', list);\n" + filler + "router.post('/api/b', create);\n",
+                "server/util.js": filler,
+                "client/api.js": filler + "await fetch(`/api/b`, {\n  method: 'POST'\n});\n" + filler,
+                "client/view.jsx": filler,
+            }
+            for name, content in files.items():
+                file_path = os.path.join(tmp, name)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "w") as f:
+                    f.write(content)
+            
+            server, client = os.path.join(tmp, "server"), os.path.join(tmp, "client")
+            stats = route_stats.RunStats()
+            linter = route_linter.RouteLinter(server, client, stats=stats)
+            linter.scan()
+            whole = route_linter.RouteLinter(server, client, options=route_linter.ScanOptions("regex", None, prefilter=False))
+            whole.scan()
+            self.assertEqual(linter.export_records(), whole.export_records())
+            self.assertEqual(linter.backend_routes, {"GET /api/a", "POST /api/b"})
+            self.assertEqual(stats.prefiltered_files, 2)
+            self.assertGreater(stats.prefiltered_bytes, 2 * len(filler))
+            
+            # Skipped text is counted in bytes, like the file's size, also outside of ASCII
+            accented = "// données réservées ✓\n" * 400
+            text = accented + "fetch('/api/café');\n" + accented
+            file_path = os.path.join(client, "accented.js")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            [(records, _, timing)] = route_linter._extract_chunk([(file_path, route_linter.FRONTEND_KINDS)], timed=True)
+            self.assertEqual([record[2] for record in records], ["/api/café"])
+            windows = route_linter.compile_prefilter(route_linter.FRONTEND_KINDS).windows(text)
+            scanned = "".join(text[start:end] for start, end in windows)
+            self.assertEqual(timing[2], len(text.encode("utf-8")))
+            self.assertEqual(timing[3], timing[2] - len(scanned.encode("utf-8")))
+    
+    def test_access_log(self):
+        """Test that access logs are counted per route and split unused routes into live and dead ones"""
+        routes = ["GET /api/users/:id", "GET /api/users/me", "POST /api/orders", "GET /api/health", "DELETE /api/users/:id"]
+        nginx = "".join(
+            f'10.0.0.{i % 9} - - [10/Oct/2026:13:55:36 +0000] "{method} {path} HTTP/1.1" 200 12 "-" "Mozilla/5.0 (X11)"\n'
+            for i, (method, path) in enumerate([("GET", f"/api/users/{n}?full=1") for n in range(50)]
+                                               + [("GET", "/api/users/me"), ("HEAD", "/api/health"), ("GET", "/static/app.js")] * 10)
+        ) + "not a request\n"
+        morgan = "\x1b[0mPOST /api/orders \x1b[32m201\x1b[0m 4.2 ms - 2\nGET /api/health 200 1 - 0.3 ms\n"
+        jsonl = '{"req":{"method":"POST","url":"/api/orders"}}\n{"url":"\\/api\\/users\\/7","method":"GET","status":200}\n'
+        self.assertEqual(route_traffic.detect_format(nginx.encode()), "combined")
+        self.assertEqual(route_traffic.detect_format(morgan.encode()), "morgan")
+        self.assertEqual(route_traffic.detect_format(jsonl.encode()), "jsonl")
+        self.assertTrue(route_traffic.ids_are_opaque(routes))
+        self.assertFalse(route_traffic.ids_are_opaque(routes + ["GET /api/items/:id(\\d+)"]))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            logs = {"access.log": nginx, "app.log": morgan, "app.jsonl": jsonl}
+            for name, content in logs.items():
+                with open(os.path.join(tmp, name), "w") as f:
+                    f.write(content)
+            with gzip.open(os.path.join(tmp, "access.log.gz"), "wt") as f:
+                f.write(nginx)
+            nginx_path = os.path.join(tmp, "access.log")
+            
+            counts = route_traffic.AccessLogs([nginx_path]).count(routes)
+            self.assertEqual(counts.hits, {"GET /api/users/:id": 50, "GET /api/users/me": 10, "GET /api/health": 10})
+            self.assertEqual((counts.lines, counts.matched, counts.unmatched, counts.unparsed), (81, 70, 10, 1))
+            
+            # Small batches, byte ranges, gzip and exact matching all give the same counts
+            ranges = route_traffic.split_ranges(nginx_path, 4)
+            self.assertEqual(len(ranges), 4)
+            self.assertEqual(ranges[0][0], 0)
+            self.assertEqual(ranges[-1][1], len(nginx))
+            for start, end in ranges:
+                self.assertTrue(start == 0 or nginx[start - 1] == "\n")
+            constrained = route_traffic.AccessLogs([nginx_path]).count(routes + ["GET /api/items/:id(\\d+)"])
+            for other in (route_traffic.AccessLogs([nginx_path], chunk_size=100).count(routes),
+                          route_traffic.AccessLogs([nginx_path], jobs=3).count(routes),
+                          route_traffic.AccessLogs([nginx_path + ".gz"], jobs=3).count(routes),
+                          constrained):
+                self.assertEqual(other.hits, counts.hits)
+                self.assertEqual(other.as_dict(), counts.as_dict())
+            
+            # A missing or truncated log is reported and the others still counted
+            with open(nginx_path + ".gz", "rb") as f:
+                compressed = f.read()
+            truncated = os.path.join(tmp, "cut.log.gz")
+            with open(truncated, "wb") as f:
+                f.write(compressed[:len(compressed) // 2])
+            missing = os.path.join(tmp, "missing.log")
+            for jobs in (1, 3):
+                partial = route_traffic.AccessLogs([truncated, nginx_path, missing], jobs=jobs).count(routes)
+                self.assertEqual(partial.hits, counts.hits)
+                self.assertEqual(partial.as_dict(), counts.as_dict())
+                self.assertEqual([file_path for file_path, _ in partial.errors], [truncated, missing])
+            result = subprocess.run(
+                [sys.executable, "route_linter.py", "--backend", "./test_backend", "--frontend", "./test_frontend",
+                 "--quiet", "--access-log", truncated],
+                capture_output=True,
+                text=True
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertIn(f"Error reading log {truncated}: ", result.stdout)
+            
+            counts = route_traffic.AccessLogs([os.path.join(tmp, "app.log"), os.path.join(tmp, "app.jsonl")]).count(routes)
+            self.assertEqual(counts.hits, {"POST /api/orders": 2, "GET /api/health": 1, "GET /api/users/:id": 1})
+            
+            with open(os.path.join(tmp, "fixture.log"), "w") as f:
+                f.write("GET /simple/route 200 - 1.0 ms\nGET /nothing 404 - 0.2 ms\n")
+            result = subprocess.run(
+                [sys.executable, "route_linter.py", "--backend", "./test_backend", "--frontend", "./test_frontend",
+                 "--jobs", "1", "--quiet", "--format", "jsonl", "--access-log", os.path.join(tmp, "fixture.log")],
+                capture_output=True,
+                text=True
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        events = [json.loads(line) for line in result.stdout.splitlines()]
+        unused = {event["route"]: event["requests"] for event in events if event["type"] == "unused"}
+        self.assertEqual(unused["GET /simple/route"], 1)
+        self.assertEqual(unused["POST /spaced/route"], 0)
+        self.assertEqual(events[-1]["access_log"], {"lines": 2, "matched": 1, "unmatched": 1, "unparsed": 0})
+        self.assertEqual(events[-1]["live_routes"], 1)
+    
+    def test_content_dedup(self):
+        """Test that byte-identical files are extracted once and still reported under every path"""
+        client = "".join(f"export const get{i} = (id) => fetch(`/api/items/{i}/${{id}}`);\n" for i in range(200))
+        self.assertGreater(len(client), route_dedup.PREFIX_SIZE)
+        files = {
+            "server/routes.js": "router.get('/api/items/:id', show);\n",
+            "server/copy/routes.js": "router.get('/api/items/:id', show);\n",
+            "client/a/client.ts": client,
+            "client/b/client.ts": client,
+            "client/c/client.ts": client[:-3] + "x);\n",
+            "client/d/client.js": client,
+            "client/same_size.js": "router.get('/api/items/:no', show);\n",
+            "client/routes.js": "router.get('/api/items/:id', show);\n",
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, content in files.items():
+                file_path = os.path.join(tmp, name)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "w") as f:
+                    f.write(content)
+            paths = {name: os.path.join(tmp, name) for name in files}
+            
+            duplicates = route_dedup.find_duplicates([paths[name] for name in files] + [os.path.join(tmp, "missing.js")])
+            self.assertEqual(duplicates, {
+                paths["server/copy/routes.js"]: paths["server/routes.js"],
+                paths["client/b/client.ts"]: paths["client/a/client.ts"],
+                paths["client/d/client.js"]: paths["client/a/client.ts"],
+                paths["client/routes.js"]: paths["server/routes.js"],
+            })
+            
+            # Copies scanned for other kinds, here a backend file and a frontend file, are extracted apart
+            server, client_dir = os.path.join(tmp, "server"), os.path.join(tmp, "client")
+            targets = [
+                (file_path, route_linter.kinds_for_roles(roles))
+                for file_path, roles in route_linter.walk_sources(route_linter.source_roots(server, client_dir))
+            ]
+            duplicates = route_linter.duplicate_targets(targets)
+            self.assertEqual(len(duplicates), 3)
+            self.assertEqual(set(duplicates) | set(duplicates.values()), {
+                paths[name] for name in ("server/routes.js", "server/copy/routes.js", "client/a/client.ts", "client/b/client.ts", "client/d/client.js")
+            })
+            results = {file_path: records for file_path, records, _ in route_linter.run_extraction(targets)}
+            self.assertIs(results[paths["client/b/client.ts"]], results[paths["client/a/client.ts"]])
+            self.assertIsNot(results[paths["client/c/client.ts"]], results[paths["client/a/client.ts"]])
+            
+            stats = route_stats.RunStats()
+            linter = route_linter.RouteLinter(server, client_dir, stats=stats)
+            linter.scan()
+            whole = route_linter.RouteLinter(server, client_dir, options=route_linter.ScanOptions("regex", None, dedup=False))
+            whole.scan()
+            self.assertEqual(linter.export_records(), whole.export_records())
+            self.assertEqual(stats.duplicate_files, 3)
+            self.assertEqual(stats.files, 5)
+            # Every copy's calls are still listed under its own path
+            self.assertEqual(
+                {call["file"] for call in linter.frontend_calls},
+                {paths[name] for name in ("client/a/client.ts", "client/b/client.ts", "client/c/client.ts", "client/d/client.js")}
+            )
+            self.assertEqual(len(linter.frontend_calls), len(whole.frontend_calls))
 
 if __name__ == "__main__":
     # Create test directories if they don't exist